@@ -0,0 +1,104 @@
+"""
+Benchmark urutan frontier crawler pada graf web sintetis, tanpa browser maupun MySQL.
+
+Crawling disimulasikan: "mengambil" halaman berarti membaca link keluarnya dari graf.
+Untuk setiap strategi frontier dan batas halaman, diukur berapa bagian dari total PageRank
+graf lengkap yang sudah tercakup oleh halaman yang diambil.
+
+Contoh:
+    python benchmarks/crawl_frontier_benchmark.py --sizes 20000 --budgets 0.01 0.05 0.2
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'crawler')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from pagerank_benchmark import GENERATORS, reference_pagerank
+from frontier import CrawlFrontier, STRATEGIES
+from config import PAGERANK_DAMPING_FACTOR
+
+def simulate_crawl(outlinks, seed_node, budget, strategy, previous_pagerank=None):
+    """
+    Menjalankan frontier seperti crawl_website: ambil URL berprioritas tertinggi,
+    lalu catat link keluarnya. Mengembalikan list node yang diambil, berurutan.
+    """
+    frontier = CrawlFrontier(strategy, previous_pagerank)
+    frontier.add_seed(seed_node)
+    crawled = []
+    while len(frontier) and len(crawled) < budget:
+        node = frontier.pop()
+        crawled.append(node)
+        frontier.record_links(node, outlinks[node])
+    return crawled
+
+def run_case(generator, n, budgets, seed, stale_fraction):
+    """
+    Mengukur cakupan PageRank setiap strategi. Strategi 'pagerank' memakai PageRank dari
+    "crawl sebelumnya", yaitu graf yang sama dengan stale_fraction edge dibuang.
+    """
+    edges = GENERATORS[generator](n, seed=seed)
+    outlinks = [[] for _ in range(n)]
+    for source, target in edges:
+        outlinks[int(source)].append(int(target))
+    pagerank = reference_pagerank(n, edges, PAGERANK_DAMPING_FACTOR)
+
+    rng = np.random.default_rng(seed + 1)
+    previous_edges = edges[rng.random(len(edges)) >= stale_fraction]
+    previous = reference_pagerank(n, previous_edges, PAGERANK_DAMPING_FACTOR)
+    previous_pagerank = {node: float(score) for node, score in enumerate(previous)}
+
+    # Seed: halaman dengan link keluar terbanyak, seperti beranda situs
+    seed_node = int(np.argmax([len(targets) for targets in outlinks]))
+    rows = []
+    for strategy in STRATEGIES:
+        max_budget = max(int(n * budget) for budget in budgets)
+        start = time.perf_counter()
+        crawled = simulate_crawl(outlinks, seed_node, max_budget, strategy, previous_pagerank)
+        elapsed = time.perf_counter() - start
+        captured = np.cumsum(pagerank[crawled]) if crawled else np.zeros(1)
+        row = {'generator': generator, 'N': n, 'strategy': strategy,
+               'pages_per_s': len(crawled) / elapsed if elapsed else 0.0}
+        for budget in budgets:
+            pages = min(int(n * budget), len(crawled))
+            row[budget] = float(captured[pages - 1]) if pages else 0.0
+        rows.append(row)
+    return rows
+
+def print_report(rows, budgets):
+    """Menampilkan cakupan PageRank per strategi dan batas halaman."""
+    columns = ['generator', 'N', 'strategy'] + [f"{budget:.0%} hal." for budget in budgets] + ['pages_per_s']
+    print(' '.join(f"{column:>12}" for column in columns))
+    for row in rows:
+        cells = [f"{row['generator']:>12}", f"{row['N']:>12}", f"{row['strategy']:>12}"]
+        cells += [f"{row[budget]:>12.3f}" for budget in budgets]
+        cells.append(f"{row['pages_per_s']:>12.0f}")
+        print(' '.join(cells))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cakupan PageRank berbagai urutan frontier crawler.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[20000])
+    parser.add_argument('--generators', nargs='+', choices=sorted(GENERATORS), default=['power_law'])
+    parser.add_argument('--budgets', type=float, nargs='+', default=[0.01, 0.05, 0.2],
+                        help="Batas halaman sebagai pecahan dari jumlah halaman graf.")
+    parser.add_argument('--stale-fraction', type=float, default=0.2,
+                        help="Pecahan edge yang berbeda pada graf crawl sebelumnya (strategi 'pagerank').")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rows = []
+    for generator in args.generators:
+        for n in args.sizes:
+            print(f"Menjalankan {generator}, N={n}...")
+            rows.extend(run_case(generator, n, args.budgets, args.seed, args.stale_fraction))
+
+    print("\n--- Bagian PageRank total yang tercakup oleh halaman yang di-crawl ---")
+    print_report(rows, args.budgets)
+
+if __name__ == '__main__':
+    main()
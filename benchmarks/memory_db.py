@@ -0,0 +1,172 @@
+import hashlib
+import time
+from datetime import datetime, timezone
+
+class InMemoryDBManager:
+    """
+    Pengganti DBManager yang menyimpan data di memori, untuk benchmark tanpa server MySQL.
+    Menyediakan method yang sama dengan DBManager. Data disimpan di level kelas (store)
+    sehingga setiap instance baru (misalnya satu per request Flask) melihat data yang sama.
+
+    write_latency (detik) bisa diisi untuk meniru round-trip MySQL pada setiap UPDATE.
+    """
+    store = {'pages': {}, 'links': [], 'topic_pagerank': {}, 'engine_state': {}}
+    write_latency = 0.0
+    write_seconds = 0.0
+
+    def __init__(self):
+        self.connection = None
+        self.cursor = None
+
+    @classmethod
+    def reset(cls):
+        """Mengosongkan seluruh data dan penghitung waktu tulis."""
+        cls.store = {'pages': {}, 'links': [], 'topic_pagerank': {}, 'engine_state': {}}
+        cls.write_seconds = 0.0
+
+    @classmethod
+    def load(cls, pages, links):
+        """Mengisi store langsung dari list dictionary halaman dan list tuple link."""
+        cls.reset()
+        for page in pages:
+            cls.store['pages'][page['id']] = cls._page_row(page['id'], page['url'], page.get('content', ''),
+                                                           page.get('pagerank_score', 0.0))
+        cls.store['links'] = list(links)
+
+    @staticmethod
+    def _page_row(page_id, url, content, pagerank_score=0.0, outlinks=(), etag=None, last_modified=None):
+        return {
+            'id': page_id,
+            'url': url,
+            'content': content,
+            'pagerank_score': pagerank_score,
+            'content_hash': hashlib.sha1((content or '').encode('utf-8')).hexdigest(),
+            'crawled_at': datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0),
+            'http_etag': etag,
+            'http_last_modified': last_modified,
+            'outlinks': list(outlinks),
+        }
+
+    def connect(self):
+        self.connection = True
+        return True
+
+    def close_connection(self):
+        self.connection = None
+
+    def create_tables(self):
+        return True
+
+    def migrate_content(self, batch_size=500):
+        return True
+
+    def insert_page(self, url, content):
+        pages = self.store['pages']
+        for page in pages.values():
+            if page['url'] == url:
+                return page['id']
+        page_id = max(pages, default=0) + 1
+        pages[page_id] = self._page_row(page_id, url, content)
+        return page_id
+
+    def upsert_page(self, url, content, outlinks=(), etag=None, last_modified=None):
+        pages = self.store['pages']
+        page_id = next((page['id'] for page in pages.values() if page['url'] == url), None)
+        if page_id is None:
+            page_id = max(pages, default=0) + 1
+            pagerank_score = 0.0
+        else:
+            pagerank_score = pages[page_id]['pagerank_score']
+        pages[page_id] = self._page_row(page_id, url, content, pagerank_score, outlinks, etag, last_modified)
+        return page_id
+
+    def update_fetch_validators(self, page_id, etag, last_modified):
+        page = self.store['pages'].get(page_id)
+        if page:
+            page['http_etag'] = etag
+            page['http_last_modified'] = last_modified
+        return True
+
+    def delete_pages(self, page_ids):
+        page_ids = set(page_ids)
+        for page_id in page_ids:
+            self.store['pages'].pop(page_id, None)
+            for scores in self.store['topic_pagerank'].values():
+                scores.pop(page_id, None)
+        self.store['links'] = [(source, target) for source, target in self.store['links']
+                               if source not in page_ids and target not in page_ids]
+        return True
+
+    def replace_links(self, source_page_id, target_page_ids):
+        self.store['links'] = [link for link in self.store['links'] if link[0] != source_page_id]
+        self.store['links'].extend((source_page_id, target_id) for target_id in target_page_ids)
+        return True
+
+    def get_crawl_state(self):
+        link_targets = {}
+        for source, target in self.store['links']:
+            link_targets.setdefault(source, []).append(target)
+        return {page['url']: {'id': page['id'], 'http_etag': page['http_etag'],
+                              'http_last_modified': page['http_last_modified'],
+                              'content_hash': page['content_hash'], 'outlinks': list(page['outlinks']),
+                              'link_targets': link_targets.get(page['id'], [])}
+                for page in self.store['pages'].values()}
+
+    def insert_link(self, source_page_id, target_page_id):
+        self.store['links'].append((source_page_id, target_page_id))
+        return True
+
+    def get_all_documents(self, include_content=False):
+        if not include_content:
+            return [{'id': page['id'], 'url': page['url'], 'pagerank_score': page['pagerank_score']}
+                    for page in self.store['pages'].values()]
+        return [dict(page) for page in self.store['pages'].values()]
+
+    def iter_document_batches(self, batch_size=500):
+        pages = [dict(self.store['pages'][page_id]) for page_id in sorted(self.store['pages'])]
+        for start in range(0, len(pages), batch_size):
+            yield pages[start:start + batch_size]
+
+    def get_pagerank_by_url(self):
+        return {page['url']: page['pagerank_score'] or 0.0 for page in self.store['pages'].values()}
+
+    def get_links(self):
+        return list(self.store['links'])
+
+    def update_pagerank_score(self, page_id, score):
+        start = time.perf_counter()
+        if self.write_latency:
+            time.sleep(self.write_latency)
+        if page_id in self.store['pages']:
+            self.store['pages'][page_id]['pagerank_score'] = score
+        InMemoryDBManager.write_seconds += time.perf_counter() - start
+        return True
+
+    def replace_topic_pagerank_scores(self, topic, scores):
+        self.store['topic_pagerank'][topic] = dict(scores)
+        return True
+
+    def get_topic_pagerank_scores(self):
+        return {topic: dict(scores) for topic, scores in self.store['topic_pagerank'].items()}
+
+    def get_state(self, name):
+        return self.store['engine_state'].get(name)
+
+    def get_all_state(self):
+        return dict(self.store['engine_state'])
+
+    def set_state(self, name, value):
+        self.store['engine_state'][name] = value
+        return True
+
+    def get_document_by_id(self, page_id):
+        page = self.store['pages'].get(page_id)
+        return dict(page) if page else None
+
+    def get_page_version(self, page_id):
+        page = self.store['pages'].get(page_id)
+        return {'content_hash': page['content_hash'], 'crawled_at': page['crawled_at']} if page else None
+
+    def clear_tables(self):
+        self.reset()
+        return True
@@ -0,0 +1,250 @@
+"""
+Benchmark perhitungan PageRank dengan graf web sintetis, tanpa server MySQL.
+
+Contoh:
+    python benchmarks/pagerank_benchmark.py --sizes 1000 10000 --generators power_law dangling --workers 1 4
+    python benchmarks/pagerank_benchmark.py --find-crossover 4
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import scipy.sparse as sp
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'pagerank')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from memory_db import InMemoryDBManager
+from link_graph import build_link_graph
+from pagerank_calculator import calculate_pagerank, power_iteration
+from parallel_pagerank import parallel_power_iteration
+from config import PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS, PAGERANK_TOLERANCE
+
+# --- Generator graf sintetis ---
+# Setiap generator mengembalikan array edge (source_idx, target_idx) berukuran [E, 2].
+
+def power_law_graph(n, avg_out_degree=10, exponent=2.1, seed=0, dangling_fraction=0.0):
+    """
+    Graf dengan distribusi in-degree dan out-degree power-law, mirip graf web.
+    Target dipilih sebanding dengan popularitas halaman yang mengikuti hukum Zipf.
+    Rata-rata out-degree (sebelum dangling_fraction diterapkan) mendekati avg_out_degree.
+    """
+    rng = np.random.default_rng(seed)
+    # Sampel Zipf dipotong ke n - 1 dulu agar outlier tidak mendominasi rata-rata, lalu skalanya
+    # disesuaikan berulang kali karena pembulatan dan pemotongan ulang ikut menggeser rata-rata.
+    samples = np.minimum(rng.zipf(exponent, size=n), n - 1).astype(np.float64)
+    scale = avg_out_degree / samples.mean()
+    for _ in range(20):
+        out_degrees = np.minimum(np.round(samples * scale), n - 1).astype(np.int64)
+        mean = out_degrees.mean()
+        if mean == 0 or abs(mean - avg_out_degree) <= 0.01 * avg_out_degree:
+            break
+        scale *= avg_out_degree / mean
+    if dangling_fraction > 0:
+        out_degrees[rng.random(n) < dangling_fraction] = 0
+
+    popularity = 1.0 / np.arange(1, n + 1) ** (1.0 / (exponent - 1))
+    popularity = rng.permutation(popularity / popularity.sum())
+
+    sources = np.repeat(np.arange(n), out_degrees)
+    targets = rng.choice(n, size=len(sources), p=popularity)
+    edges = np.stack([sources, targets], axis=1)
+    return edges[edges[:, 0] != edges[:, 1]]
+
+def barabasi_albert_graph(n, m=5, seed=0):
+    """
+    Graf Barabási–Albert: setiap halaman baru menautkan ke m halaman lama
+    yang dipilih sebanding dengan derajatnya (preferential attachment).
+    """
+    rnd = random.Random(seed)
+    edges = []
+    repeated_nodes = list(range(m))
+    for new_node in range(m, n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(rnd.choice(repeated_nodes))
+        for target in targets:
+            edges.append((new_node, target))
+        repeated_nodes.extend(targets)
+        repeated_nodes.extend([new_node] * m)
+    return np.array(edges, dtype=np.int64).reshape(-1, 2)
+
+def dangling_heavy_graph(n, avg_out_degree=10, seed=0, dangling_fraction=0.6):
+    """Graf power-law dengan sebagian besar halaman tanpa link keluar (misalnya file/halaman buntu)."""
+    return power_law_graph(n, avg_out_degree, seed=seed, dangling_fraction=dangling_fraction)
+
+GENERATORS = {
+    'power_law': power_law_graph,
+    'barabasi_albert': barabasi_albert_graph,
+    'dangling': dangling_heavy_graph,
+}
+
+def reference_pagerank(n, edges, damping, tolerance=1e-13, max_iterations=10000):
+    """
+    Vektor PageRank acuan, dihitung terpisah dengan matriks sparse SciPy dan toleransi ketat.
+    Dangling node mendistribusikan skornya secara merata seperti pada calculate_pagerank.
+    """
+    edges = np.unique(edges, axis=0)
+    out_degrees = np.bincount(edges[:, 0], minlength=n).astype(np.float64)
+    weights = 1.0 / out_degrees[edges[:, 0]]
+    M = sp.csr_matrix((weights, (edges[:, 1], edges[:, 0])), shape=(n, n))
+    dangling = out_degrees == 0
+
+    pr = np.full(n, 1.0 / n)
+    for _ in range(max_iterations):
+        pr_new = damping * (M @ pr + pr[dangling].sum() / n) + (1 - damping) / n
+        if np.abs(pr_new - pr).sum() < tolerance:
+            return pr_new / pr_new.sum()
+        pr = pr_new
+    return pr / pr.sum()
+
+def make_corpus(n, edges):
+    """Membuat daftar halaman dan link (dengan ID gaya database, mulai dari 1)."""
+    pages = [{'id': i + 1, 'url': f"https://bench.local/halaman/{i + 1}", 'content': ''} for i in range(n)]
+    links = [(int(source) + 1, int(target) + 1) for source, target in edges]
+    return pages, links
+
+def run_case(generator, n, workers, seed, write_latency):
+    """Menjalankan satu kasus benchmark dan mengembalikan dictionary hasil pengukuran."""
+    edges = GENERATORS[generator](n, seed=seed)
+    pages, links = make_corpus(n, edges)
+    InMemoryDBManager.load(pages, links)
+    InMemoryDBManager.write_latency = write_latency
+    db_manager = InMemoryDBManager()
+    db_manager.connect()
+
+    reference = reference_pagerank(n, edges, PAGERANK_DAMPING_FACTOR)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        graph = build_link_graph(db_manager.get_all_documents(), db_manager.get_links())
+        build_seconds = time.perf_counter() - start
+
+        # tracemalloc hanya melihat alokasi Python di proses induk: memori worker dan
+        # segmen shared memory solve paralel tidak ikut terhitung (kolom parent_peak_mb)
+        tracemalloc.start()
+        start = time.perf_counter()
+        if workers > 1:
+            pr, iterations, _ = parallel_power_iteration(graph, PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS,
+                                                         PAGERANK_TOLERANCE, workers)
+        else:
+            pr, iterations, _ = power_iteration(graph, PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS,
+                                                PAGERANK_TOLERANCE)
+        solve_seconds = time.perf_counter() - start
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        # Jalankan calculate_pagerank penuh untuk mengukur write-back dan memeriksa hasil akhirnya
+        InMemoryDBManager.write_seconds = 0.0
+        start = time.perf_counter()
+        results = calculate_pagerank(db_manager, num_workers=workers)
+        end_to_end_seconds = time.perf_counter() - start
+
+    pr = pr / pr.sum()
+    final = np.array([results[page['id']] for page in pages])
+    return {
+        'generator': generator,
+        'N': n,
+        'edges': len(graph['sources']),
+        'workers': workers,
+        'build_s': build_seconds,
+        'iterations': iterations,
+        'solve_s': solve_seconds,
+        'parent_peak_mb': peak_memory / (1024 * 1024),
+        'writeback_s': InMemoryDBManager.write_seconds,
+        'total_s': end_to_end_seconds,
+        'l1_error': float(np.abs(final - reference).sum()),
+        'solver_l1_error': float(np.abs(pr - reference).sum()),
+    }
+
+def find_crossover(workers, generator, seed, max_n):
+    """
+    Mencari ukuran graf terkecil (N dilipatduakan mulai 1000) di mana solve paralel dengan
+    'workers' worker, termasuk waktu menyalakan worker, lebih cepat daripada solve satu core.
+    Hasilnya dipakai untuk menentukan PAGERANK_PARALLEL_MIN_PAGES di mesin tersebut.
+    """
+    print(f"{'N':>10} {'serial_s':>10} {'paralel_s':>10}")
+    n = 1000
+    while n <= max_n:
+        edges = GENERATORS[generator](n, seed=seed)
+        pages, links = make_corpus(n, edges)
+        with contextlib.redirect_stdout(io.StringIO()):
+            graph = build_link_graph(pages, links)
+            timings = []
+            for solve in (lambda: power_iteration(graph, PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS,
+                                                  PAGERANK_TOLERANCE),
+                          lambda: parallel_power_iteration(graph, PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS,
+                                                           PAGERANK_TOLERANCE, workers)):
+                best = float('inf')
+                for _ in range(3):
+                    start = time.perf_counter()
+                    solve()
+                    best = min(best, time.perf_counter() - start)
+                timings.append(best)
+        print(f"{n:>10} {timings[0]:>10.4f} {timings[1]:>10.4f}")
+        if timings[1] < timings[0]:
+            print(f"\nParalel ({workers} worker) lebih cepat mulai N={n}.")
+            return n
+        n *= 2
+    print(f"\nParalel ({workers} worker) tidak lebih cepat sampai N={max_n}.")
+    return None
+
+def print_report(rows):
+    """Menampilkan hasil benchmark dalam bentuk tabel."""
+    columns = ['generator', 'N', 'edges', 'workers', 'build_s', 'iterations', 'solve_s',
+               'parent_peak_mb', 'writeback_s', 'total_s', 'l1_error']
+    print(' '.join(f"{column:>15}" for column in columns))
+    for row in rows:
+        cells = []
+        for column in columns:
+            value = row[column]
+            if isinstance(value, float):
+                cells.append(f"{value:>15.3e}" if column == 'l1_error' else f"{value:>15.4f}")
+            else:
+                cells.append(f"{value:>15}")
+        print(' '.join(cells))
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark calculate_pagerank dengan graf web sintetis.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--generators', nargs='+', choices=sorted(GENERATORS), default=sorted(GENERATORS))
+    parser.add_argument('--workers', type=int, nargs='+', default=[1])
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--write-latency-ms', type=float, default=0.0,
+                        help="Latensi tiruan per UPDATE pagerank_score (meniru round-trip MySQL).")
+    parser.add_argument('--max-l1-error', type=float, default=1e-4,
+                        help="Batas selisih L1 terhadap vektor acuan; benchmark gagal jika dilampaui.")
+    parser.add_argument('--find-crossover', type=int, metavar='WORKERS',
+                        help="Cari N terkecil di mana solve paralel dengan WORKERS worker mengalahkan satu core.")
+    parser.add_argument('--max-size', type=int, default=1_000_000, help="Batas N untuk --find-crossover.")
+    args = parser.parse_args()
+
+    if args.find_crossover:
+        find_crossover(args.find_crossover, args.generators[0], args.seed, args.max_size)
+        return
+
+    rows = []
+    for generator in args.generators:
+        for n in args.sizes:
+            for workers in args.workers:
+                print(f"Menjalankan {generator}, N={n}, workers={workers}...")
+                rows.append(run_case(generator, n, workers, args.seed, args.write_latency_ms / 1000.0))
+
+    print("\n--- Hasil Benchmark PageRank ---")
+    print_report(rows)
+
+    failed = [row for row in rows if row['l1_error'] > args.max_l1_error]
+    if failed:
+        print(f"\n{len(failed)} kasus melebihi batas error L1 {args.max_l1_error}.")
+        sys.exit(1)
+    print(f"\nSemua kasus sesuai dengan vektor acuan (error L1 <= {args.max_l1_error}).")
+
+if __name__ == '__main__':
+    main()
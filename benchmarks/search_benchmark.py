@@ -0,0 +1,271 @@
+"""
+Benchmark latensi /search dan /view_page/<id> pada korpus sintetis, tanpa server MySQL.
+
+Korpus dibuat dengan memperluas data/raw_pages/*.txt menjadi variasi dokumen,
+lalu campuran query diputar ulang melalui Flask test client (bisa beberapa thread sekaligus).
+
+Contoh:
+    python benchmarks/search_benchmark.py --sizes 200 2000 --requests 300 --concurrency 1 4
+"""
+import argparse
+import contextlib
+import glob
+import io
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote_plus
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'web')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'pagerank')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'index')))
+
+from memory_db import InMemoryDBManager
+from pagerank_benchmark import power_law_graph
+import app as web_app
+from pagerank_calculator import calculate_pagerank, calculate_topic_pagerank, load_link_graph
+from indexer import build_index
+
+RAW_PAGES_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'raw_pages'))
+STAGES = ['load', 'typo', 'filter', 'scoring', 'render']
+
+def load_seed_sections():
+    """
+    Membaca data/raw_pages/*.txt dan memecahnya menjadi bagian (dipisah '---').
+    Setiap bagian berisi nama file (sebagai bagian situs), judul, dan daftar kalimat.
+    """
+    sections = []
+    for path in sorted(glob.glob(os.path.join(RAW_PAGES_DIR, '*.txt'))):
+        site_section = os.path.splitext(os.path.basename(path))[0]
+        with open(path, encoding='utf-8') as f:
+            text = f.read()
+        for block in re.split(r'\n-{3,}\s*\n', text):
+            lines = [line.strip() for line in block.splitlines() if line.strip() and not line.startswith('#')]
+            if not lines:
+                continue
+            sentences = [s for s in re.split(r'(?<=[.!?])\s+', ' '.join(lines[1:])) if s]
+            sections.append({'site_section': site_section, 'title': lines[0], 'sentences': sentences or [lines[0]]})
+    return sections
+
+def build_synthetic_corpus(size, seed=0):
+    """
+    Membuat 'size' dokumen sintetis. Setiap dokumen mengambil judul dari satu bagian asli,
+    menggabungkan kalimat acak dari seluruh korpus, dan menambahkan istilah buatan
+    agar kosakata ikut bertambah seiring ukuran korpus.
+    """
+    rnd = random.Random(seed)
+    sections = load_seed_sections()
+    all_sentences = [sentence for section in sections for sentence in section['sentences']]
+    synthetic_vocabulary = [f"istilah{i}" for i in range(max(50, size // 2))]
+
+    pages = []
+    for i in range(size):
+        section = rnd.choice(sections)
+        title = f"{section['title']} {i}" if i >= len(sections) else section['title']
+        sentences = rnd.sample(section['sentences'], min(len(section['sentences']), rnd.randint(1, 4)))
+        sentences += rnd.sample(all_sentences, min(len(all_sentences), rnd.randint(3, 10)))
+        rnd.shuffle(sentences)
+        extra_terms = ' '.join(rnd.choice(synthetic_vocabulary) for _ in range(rnd.randint(5, 30)))
+        pages.append({
+            'id': i + 1,
+            'url': f"https://elektro.um.ac.id/{section['site_section']}/halaman-{i + 1}/",
+            'content': f"{title}\n\n{' '.join(sentences)} {extra_terms}",
+        })
+    return pages
+
+def seed_database(size, seed=0, index_dir=None, num_shards=1):
+    """
+    Mengisi InMemoryDBManager dengan korpus sintetis, graf link, dan skor PageRank-nya.
+    Jika index_dir diisi, indeks pencarian (dengan num_shards shard) juga dibangun dan
+    dipakai oleh aplikasi; jika tidak, aplikasi memakai pemindaian database.
+    """
+    pages = build_synthetic_corpus(size, seed)
+    edges = power_law_graph(size, avg_out_degree=8, seed=seed)
+    links = [(int(source) + 1, int(target) + 1) for source, target in edges]
+    InMemoryDBManager.load(pages, links)
+
+    db_manager = InMemoryDBManager()
+    db_manager.connect()
+    with contextlib.redirect_stdout(io.StringIO()):
+        link_graph = load_link_graph(db_manager)
+        calculate_pagerank(db_manager, link_graph=link_graph)
+        calculate_topic_pagerank(db_manager, link_graph=link_graph)
+        if index_dir:
+            build_index(db_manager, index_dir, num_shards=num_shards)
+
+    # Aplikasi membuka indeks dari index_dir pada request berikutnya (None = pemindaian database)
+    web_app._search_index.update(index_dir=index_dir, index=None, generation=None, checked_at=None)
+    # Cache render dan versi korpus milik korpus sebelumnya tidak berlaku lagi
+    web_app._rendered_pages.clear()
+    web_app._corpus_version.update(version=None, token=None)
+    web_app._corpus_state['state'] = None
+    return pages
+
+def make_typo(word, rnd):
+    """Membuat salah ketik sederhana: hapus, tukar, atau ganti satu huruf."""
+    if len(word) < 4:
+        return word
+    i = rnd.randrange(1, len(word) - 1)
+    kind = rnd.choice(['delete', 'swap', 'replace'])
+    if kind == 'delete':
+        return word[:i] + word[i + 1:]
+    if kind == 'swap':
+        return word[:i - 1] + word[i] + word[i - 1] + word[i + 1:]
+    return word[:i] + rnd.choice('aiueokmnrst') + word[i + 1:]
+
+def build_query_mix(pages, count, seed=0):
+    """
+    Membuat campuran query: kata umum, kata jarang, dua kata, kata dengan typo,
+    dan judul lengkap, dengan proporsi yang mirip pola pencarian pengguna.
+    """
+    rnd = random.Random(seed)
+    document_frequency = {}
+    for page in pages:
+        for word in set(re.findall(r'\w+', page['content'].lower())):
+            if len(word) > 3 and word not in web_app.stopwords and not word.isdigit():
+                document_frequency[word] = document_frequency.get(word, 0) + 1
+    by_frequency = sorted(document_frequency, key=document_frequency.get, reverse=True)
+    common = by_frequency[:max(1, len(by_frequency) // 10)]
+    rare = by_frequency[len(by_frequency) // 2:] or by_frequency
+    titles = [page['content'].split('\n', 1)[0] for page in pages]
+
+    generators = [
+        (0.35, lambda: rnd.choice(common)),
+        (0.20, lambda: rnd.choice(rare)),
+        (0.20, lambda: f"{rnd.choice(common)} {rnd.choice(by_frequency)}"),
+        (0.15, lambda: make_typo(rnd.choice(common), rnd)),
+        (0.10, lambda: rnd.choice(titles)),
+    ]
+    weights = [weight for weight, _ in generators]
+    return [rnd.choices(generators, weights)[0][1]() for _ in range(count)]
+
+def percentile_ms(values, q):
+    return float(np.percentile(values, q)) * 1000 if values else 0.0
+
+def replay(requests_to_send, concurrency):
+    """
+    Memutar ulang daftar path melalui Flask test client.
+    Mengembalikan (list latensi per endpoint, list waktu tahap per endpoint, durasi total).
+    """
+    latencies = {'search': [], 'view_page': []}
+    stage_times = {'search': [], 'view_page': []}
+    lock = threading.Lock()
+    local = threading.local()
+
+    def send(item):
+        endpoint, path = item
+        if not hasattr(local, 'client'):
+            local.client = web_app.app.test_client()
+        start = time.perf_counter()
+        response = local.client.get(path)
+        elapsed = time.perf_counter() - start
+        if response.status_code >= 500:
+            raise RuntimeError(f"{path} mengembalikan status {response.status_code}")
+        with lock:
+            latencies[endpoint].append(elapsed)
+
+    def collect_stage_times(response):
+        times = getattr(web_app.g, 'stage_times', None)
+        if times is not None:
+            endpoint = 'search' if web_app.request.path == '/search' else 'view_page'
+            with lock:
+                stage_times[endpoint].append(dict(times))
+        return response
+
+    web_app.app.after_request_funcs.setdefault(None, []).append(collect_stage_times)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                list(executor.map(send, requests_to_send))
+            duration = time.perf_counter() - start
+    finally:
+        web_app.app.after_request_funcs[None].remove(collect_stage_times)
+    return latencies, stage_times, duration
+
+def run_case(size, request_count, concurrency, view_ratio, seed, mode, num_shards=1):
+    """Menjalankan satu kasus benchmark dan mengembalikan ringkasan hasil."""
+    with tempfile.TemporaryDirectory() as index_dir:
+        return _run_case(size, request_count, concurrency, view_ratio, seed, mode,
+                         index_dir if mode == 'index' else None, num_shards)
+
+def _run_case(size, request_count, concurrency, view_ratio, seed, mode, index_dir, num_shards):
+    pages = seed_database(size, seed, index_dir, num_shards)
+    rnd = random.Random(seed + 1)
+    queries = build_query_mix(pages, request_count, seed)
+    requests_to_send = []
+    for query in queries:
+        if rnd.random() < view_ratio:
+            requests_to_send.append(('view_page', f"/view_page/{rnd.choice(pages)['id']}"))
+        else:
+            requests_to_send.append(('search', '/search?q=' + quote_plus(query)))
+
+    # Pemanasan: isi cache (template Jinja, cache PageRank per topik) sebelum diukur
+    replay(requests_to_send[:5], 1)
+    latencies, stage_times, duration = replay(requests_to_send, concurrency)
+
+    summary = {'size': size, 'concurrency': concurrency,
+               'mode': f"{mode} ({num_shards} shard)" if index_dir else mode,
+               'throughput': len(requests_to_send) / duration if duration else 0.0, 'endpoints': {}}
+    for endpoint, values in latencies.items():
+        stages = {}
+        for stage in STAGES:
+            per_request = [times.get(stage, 0.0) for times in stage_times[endpoint] if stage in times]
+            if per_request:
+                stages[stage] = (float(np.mean(per_request)) * 1000, percentile_ms(per_request, 95))
+        summary['endpoints'][endpoint] = {
+            'count': len(values),
+            'p50': percentile_ms(values, 50),
+            'p95': percentile_ms(values, 95),
+            'p99': percentile_ms(values, 99),
+            'stages': stages,
+        }
+    return summary
+
+def print_summary(summary):
+    print(f"\n=== Korpus {summary['size']} dokumen, mode {summary['mode']}, concurrency {summary['concurrency']}: "
+          f"{summary['throughput']:.1f} request/detik ===")
+    for endpoint, result in summary['endpoints'].items():
+        if not result['count']:
+            continue
+        print(f"  {endpoint:<10} n={result['count']:<5} p50={result['p50']:.2f} ms  "
+              f"p95={result['p95']:.2f} ms  p99={result['p99']:.2f} ms")
+        for stage in STAGES:
+            if stage in result['stages']:
+                mean, p95 = result['stages'][stage]
+                print(f"      {stage:<8} rata-rata={mean:.2f} ms  p95={p95:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latensi /search dan /view_page pada korpus sintetis.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[200, 2000])
+    parser.add_argument('--requests', type=int, default=200, help="Jumlah request per kasus.")
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1])
+    parser.add_argument('--view-ratio', type=float, default=0.3,
+                        help="Proporsi request ke /view_page/<id> (sisanya /search).")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--modes', nargs='+', choices=['scan', 'index'], default=['scan', 'index'],
+                        help="scan = memindai database per query, index = memakai artefak indexer.")
+    parser.add_argument('--shards', type=int, nargs='+', default=[1],
+                        help="Jumlah shard indeks yang diuji pada mode index.")
+    args = parser.parse_args()
+
+    # Semua koneksi database aplikasi diarahkan ke korpus sintetis di memori
+    web_app.DBManager = InMemoryDBManager
+
+    for size in args.sizes:
+        for mode in args.modes:
+            for num_shards in (args.shards if mode == 'index' else [1]):
+                for concurrency in args.concurrency:
+                    print_summary(run_case(size, args.requests, concurrency, args.view_ratio, args.seed,
+                                           mode, num_shards))
+
+if __name__ == '__main__':
+    main()
@@ -6,13 +6,42 @@ CREATE TABLE IF NOT EXISTS pages (
     id INT AUTO_INCREMENT PRIMARY KEY,
     url VARCHAR(255) UNIQUE NOT NULL,
     content TEXT,
+    content_compressed MEDIUMBLOB,
+    content_hash CHAR(40),
+    crawled_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP,
+    http_etag VARCHAR(255),
+    http_last_modified VARCHAR(64),
+    outlinks MEDIUMBLOB,
     pagerank_score FLOAT DEFAULT 0.0
 );
 
+-- Database lama: kolom-kolom baru ditambahkan otomatis oleh DBManager.create_tables(),
+-- atau manual dengan perintah di bawah. Isi kolom content dipindahkan ke content_compressed
+-- (beserta content_hash-nya) sekali dengan: python src/main.py --migrate
+-- ALTER TABLE pages ADD COLUMN content_compressed MEDIUMBLOB AFTER content;
+-- ALTER TABLE pages ADD COLUMN content_hash CHAR(40) AFTER content_compressed;
+-- ALTER TABLE pages ADD COLUMN crawled_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP AFTER content_hash;
+-- ALTER TABLE pages ADD COLUMN http_etag VARCHAR(255) AFTER crawled_at;
+-- ALTER TABLE pages ADD COLUMN http_last_modified VARCHAR(64) AFTER http_etag;
+-- ALTER TABLE pages ADD COLUMN outlinks MEDIUMBLOB AFTER http_last_modified;
+
 CREATE TABLE IF NOT EXISTS links (
     id INT AUTO_INCREMENT PRIMARY KEY,
     source_page_id INT NOT NULL,
     target_page_id INT NOT NULL,
     FOREIGN KEY (source_page_id) REFERENCES pages(id) ON DELETE CASCADE,
     FOREIGN KEY (target_page_id) REFERENCES pages(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS topic_pagerank (
+    page_id INT NOT NULL,
+    topic VARCHAR(64) NOT NULL,
+    score FLOAT DEFAULT 0.0,
+    PRIMARY KEY (topic, page_id),
+    FOREIGN KEY (page_id) REFERENCES pages(id) ON DELETE CASCADE
+);
+
+CREATE TABLE IF NOT EXISTS engine_state (
+    name VARCHAR(64) PRIMARY KEY,
+    value VARCHAR(255)
 );
\ No newline at end of file
@@ -0,0 +1,88 @@
+import heapq
+from itertools import count
+
+# Strategi urutan frontier crawling:
+#   bfs      : urutan ditemukan (breadth-first, perilaku crawler sebelumnya)
+#   indegree : jumlah in-link yang sudah terlihat selama crawling berjalan
+#   opic     : OPIC (On-line Page Importance Computation), "cash" halaman dibagi rata ke link keluarnya
+#   pagerank : skor PageRank dari crawl sebelumnya; halaman yang belum dikenal memakai cash OPIC
+STRATEGIES = ('bfs', 'indegree', 'opic', 'pagerank')
+
+class CrawlFrontier:
+    """
+    Antrian URL yang belum dikunjungi, diurutkan berdasarkan estimasi kepentingan halaman.
+    URL dengan prioritas sama keluar sesuai urutan ditemukan, sehingga strategi 'bfs'
+    sama dengan antrian deque biasa.
+
+    Prioritas hanya bisa naik (in-link dan cash bertambah), jadi perubahan prioritas cukup
+    dicatat dengan menambahkan entri baru ke heap; entri lama yang sudah usang dilewati saat pop().
+    """
+    def __init__(self, strategy='opic', previous_pagerank=None):
+        if strategy not in STRATEGIES:
+            raise ValueError(f"Strategi frontier tidak dikenal: {strategy} (pilihan: {', '.join(STRATEGIES)})")
+        self.strategy = strategy
+        self.previous_pagerank = previous_pagerank or {}
+        self._heap = []
+        self._order = count()
+        self._discovered_at = {}  # url -> urutan pertama kali ditemukan (untuk tie-break)
+        self._priority = {}       # url -> prioritas terbaru di heap
+        self._done = set()        # url yang sudah keluar dari frontier
+        self.in_links = {}
+        self.cash = {}            # OPIC: cash yang belum dibagikan per url
+
+    def __len__(self):
+        return len(self._priority)
+
+    def _current_priority(self, url):
+        if self.strategy == 'indegree':
+            return self.in_links.get(url, 0)
+        if self.strategy == 'opic':
+            return self.cash.get(url, 0.0)
+        if self.strategy == 'pagerank':
+            return (self.previous_pagerank.get(url, 0.0), self.cash.get(url, 0.0))
+        return 0
+
+    def _push(self, url):
+        if url in self._done:
+            return
+        if url not in self._discovered_at:
+            self._discovered_at[url] = next(self._order)
+        priority = self._current_priority(url)
+        if self._priority.get(url) == priority:
+            return
+        self._priority[url] = priority
+        # heapq adalah min-heap, jadi prioritas dinegasikan
+        key = tuple(-value for value in priority) if isinstance(priority, tuple) else -priority
+        heapq.heappush(self._heap, (key, self._discovered_at[url], url, priority))
+
+    def add_seed(self, url, cash=1.0):
+        """Menambahkan URL awal crawling beserta cash OPIC awalnya."""
+        self.cash[url] = self.cash.get(url, 0.0) + cash
+        self._push(url)
+
+    def record_links(self, source_url, target_urls):
+        """
+        Mencatat link keluar dari halaman yang baru selesai diambil: menambah in-link setiap
+        target, membagikan cash OPIC halaman sumber ke target-targetnya, lalu memasukkan
+        target yang belum dikunjungi ke frontier.
+        """
+        targets = list(dict.fromkeys(url for url in target_urls if url != source_url))
+        # Cash halaman tanpa link keluar tidak dibagikan ke mana pun; yang penting bagi
+        # frontier hanya urutan relatif halaman yang belum dikunjungi
+        source_cash = self.cash.pop(source_url, 0.0)
+        share = source_cash / len(targets) if targets else 0.0
+        for url in targets:
+            self.in_links[url] = self.in_links.get(url, 0) + 1
+            self.cash[url] = self.cash.get(url, 0.0) + share
+            self._push(url)
+
+    def pop(self):
+        """Mengambil URL dengan prioritas tertinggi, atau None jika frontier kosong."""
+        while self._heap:
+            _, _, url, priority = heapq.heappop(self._heap)
+            if url in self._done or self._priority.get(url) != priority:
+                continue  # Entri usang: prioritas url ini sudah diperbarui atau sudah diambil
+            del self._priority[url]
+            self._done.add(url)
+            return url
+        return None
@@ -1,10 +1,11 @@
-import osAdd commentMore actions
+import os
+import time
 import re
 import sys
+import json
 import requests # Masih diperlukan untuk beberapa kasus atau jika ingin fallbacks
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
-from collections import deque
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
@@ -14,16 +15,95 @@ from selenium.common.exceptions import TimeoutException, WebDriverException
 
 # Tambahkan path ke folder database agar db_manager bisa diimpor
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database')))
-from db_manager import DBManager # Hanya dibutuhkan jika ingin test standalone
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'utils')))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+from db_manager import DBManager, content_hash # DBManager hanya dibutuhkan jika ingin test standalone
+from config import METRICS_DIR, CRAWL_FRONTIER_STRATEGY, CRAWL_CONDITIONAL_TIMEOUT, CRAWL_DELTA_FILE
+from frontier import CrawlFrontier
+import metrics
 
-def crawl_website(start_url, base_domain, max_pages_to_crawl=100):
+# Nama entri engine_state yang berubah setiap kali hasil crawl baru dimasukkan ke database
+CORPUS_VERSION_STATE = 'corpus_version'
+
+# Metrik crawler (ditulis ke METRICS_DIR di akhir crawling standalone)
+PAGES_FETCHED = metrics.counter('crawler_pages_fetched_total', 'Jumlah halaman yang berhasil diambil dan diproses.')
+FETCH_ERRORS = metrics.counter('crawler_fetch_errors_total', 'Jumlah kegagalan pengambilan halaman per jenis error.')
+FETCH_DURATION = metrics.histogram('crawler_fetch_duration_seconds', 'Durasi mengambil dan memproses satu halaman.')
+PAGES_PER_SECOND = metrics.gauge('crawler_pages_per_second', 'Kecepatan crawling (halaman per detik) pada run terakhir.')
+LINKS_FOUND = metrics.counter('crawler_links_found_total', 'Jumlah link keluar dalam domain yang ditemukan.')
+FRONTIER_SIZE = metrics.gauge('crawler_frontier_size', 'Jumlah URL yang menunggu di frontier saat crawling selesai.')
+PAGES_UNCHANGED = metrics.counter('crawler_pages_unchanged_total',
+                                  'Jumlah halaman yang tidak berubah sejak crawl sebelumnya (304 atau hash konten sama).')
+
+def fetch_validators(url, known_page=None):
+    """
+    Mengirim GET bersyarat (If-None-Match / If-Modified-Since dari crawl sebelumnya) sebelum
+    halaman dimuat lewat Selenium. Hanya header respons yang dibaca (stream=True, body tidak diunduh).
+    Halaman tanpa validator tersimpan (termasuk semua halaman pada crawl pertama) tidak mungkin
+    menjawab 304, jadi tidak ada request sama sekali; validatornya diambil dari pemuatan Selenium
+    (lihat document_response).
+
+    Returns:
+        tuple: (status HTTP, ETag, Last-Modified); status None jika request gagal atau tidak dikirim.
+    """
+    headers = {}
+    if known_page and known_page['http_etag']:
+        headers['If-None-Match'] = known_page['http_etag']
+    if known_page and known_page['http_last_modified']:
+        headers['If-Modified-Since'] = known_page['http_last_modified']
+    if not headers:
+        return None, None, None
+    try:
+        with requests.get(url, headers=headers, timeout=CRAWL_CONDITIONAL_TIMEOUT, stream=True) as response:
+            return response.status_code, response.headers.get('ETag'), response.headers.get('Last-Modified')
+    except requests.exceptions.RequestException as e:
+        print(f"    - Request bersyarat ke {url} gagal, halaman tetap diambil lewat Selenium: {e}")
+        return None, None, None
+
+def document_response(driver):
+    """
+    Status HTTP, ETag, dan Last-Modified dokumen utama dari pemuatan Selenium terakhir, dibaca dari
+    log performance Chrome (event Network.responseReceived pertama bertipe Document; iframe dimuat
+    sesudahnya). Membaca log sekaligus mengosongkannya.
+
+    Returns:
+        tuple: (status HTTP, ETag, Last-Modified); status None jika log tidak tersedia.
+    """
+    try:
+        entries = driver.get_log('performance')
+    except WebDriverException:
+        return None, None, None
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        if message.get('method') == 'Network.responseReceived' and message['params'].get('type') == 'Document':
+            response = message['params']['response']
+            headers = {name.lower(): value for name, value in response.get('headers', {}).items()}
+            return int(response['status']), headers.get('etag'), headers.get('last-modified')
+    return None, None, None
+
+def crawl_website(start_url, base_domain, max_pages_to_crawl=100, frontier_strategy=CRAWL_FRONTIER_STRATEGY,
+                  previous_pagerank=None, crawl_state=None):
     """
     Melakukan crawling pada situs web menggunakan Selenium, mengekstrak konten dan tautan.
     Mampu menangani situs dengan konten yang dimuat JavaScript dan lebih cerdas dalam ekstraksi konten.
+
+    URL berikutnya diambil dari frontier berprioritas (lihat frontier.py), sehingga dengan batas
+    max_pages_to_crawl yang ketat halaman yang paling penting diambil lebih dulu.
+    previous_pagerank ({url: skor}) dipakai oleh strategi 'pagerank'.
+
+    crawl_state (hasil DBManager.get_crawl_state()) berisi validator HTTP dan hash konten crawl
+    sebelumnya. Request bersyarat hanya dikirim untuk halaman yang punya validator tersimpan; halaman
+    yang menjawab 304 Not Modified tidak dimuat maupun di-parse ulang, dan link keluarnya diambil dari
+    database. Halaman lain dimuat sekali lewat Selenium, dan status serta validatornya dibaca dari
+    log performance browser. Untuk server tanpa validator, halaman tetap dimuat dan di-parse penuh;
+    perubahan dideteksi dari hash konten. Setiap halaman di hasil diberi 'status': 'new', 'changed',
+    'unchanged' (konten None), atau 'removed' (404/410), untuk disimpan oleh populate_database().
     """
+    crawl_state = crawl_state or {}
     pages_data = []
     visited_urls = set()
-    urls_to_visit = deque([start_url])
+    frontier = CrawlFrontier(frontier_strategy, previous_pagerank)
+    frontier.add_seed(start_url)
 
     # Konfigurasi WebDriver
     options = webdriver.ChromeOptions()
@@ -32,6 +112,8 @@ def crawl_website(start_url, base_domain, max_pages_to_crawl=100):
     options.add_argument('--disable-dev-shm-usage') # Diperlukan untuk lingkungan tertentu
     options.add_argument('--disable-gpu') # Mencegah isu rendering di headless mode
     options.add_argument('--log-level=3') # Menekan pesan log yang tidak perlu dari Chrome
+    # Log performance berisi header respons dokumen (status, ETag, Last-Modified), lihat document_response
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
 
     # Inisialisasi driver Chrome
     try:
@@ -46,10 +128,12 @@ def crawl_website(start_url, base_domain, max_pages_to_crawl=100):
 
     print(f"Memulai crawling dari: {start_url}")
     print(f"Membatasi crawling pada domain: {base_domain}")
+    print(f"Urutan frontier: {frontier.strategy}")
+    crawl_start = time.perf_counter()
 
     try:
-        while urls_to_visit and len(visited_urls) < max_pages_to_crawl:
-            current_url = urls_to_visit.popleft()
+        while len(frontier) and len(visited_urls) < max_pages_to_crawl:
+            current_url = frontier.pop()
 
             # Pastikan URL belum dikunjungi dan tidak ada fragmen (#)
             parsed_current_url = urlparse(current_url)
@@ -61,11 +145,44 @@ def crawl_website(start_url, base_domain, max_pages_to_crawl=100):
             print(f"  - Mengambil: {current_url}")
             visited_urls.add(clean_current_url) # Simpan URL bersih ke daftar yang sudah dikunjungi
 
+            fetch_start = time.perf_counter()
             try:
-                driver.get(current_url)
-                
-                # Tambahkan waktu tunggu eksplisit untuk elemen body agar halaman dimuat
-                WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+                known_page = crawl_state.get(clean_current_url)
+                status, etag, last_modified = fetch_validators(clean_current_url, known_page)
+                if known_page and status == 304:
+                    # Tidak berubah: link keluar dari crawl sebelumnya tetap dipakai untuk frontier
+                    frontier.record_links(current_url, known_page['outlinks'])
+                    pages_data.append({
+                        'url': clean_current_url,
+                        'title': None,
+                        'content': None,
+                        'links_to': known_page['outlinks'],
+                        'status': 'unchanged',
+                        'etag': etag or known_page['http_etag'],
+                        'last_modified': last_modified or known_page['http_last_modified']
+                    })
+                    print(f"    - Tidak berubah (304): '{clean_current_url}'")
+                    PAGES_UNCHANGED.inc(reason='not_modified')
+                    continue
+                if status not in (404, 410):
+                    document_response(driver) # Buang entri log dari pemuatan sebelumnya
+                    driver.get(current_url)
+
+                    # Tambahkan waktu tunggu eksplisit untuk elemen body agar halaman dimuat
+                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+
+                    load_status, load_etag, load_last_modified = document_response(driver)
+                    status = load_status or status
+                    etag = load_etag or etag
+                    last_modified = load_last_modified or last_modified
+
+                if status in (404, 410):
+                    if known_page:
+                        pages_data.append({'url': clean_current_url, 'title': None, 'content': None, 'links_to': [],
+                                           'status': 'removed', 'etag': None, 'last_modified': None})
+                    print(f"    - Halaman sudah tidak ada ({status}): '{clean_current_url}'")
+                    FETCH_ERRORS.inc(reason='gone')
+                    continue
 
                 soup = BeautifulSoup(driver.page_source, 'html.parser')
 
@@ -118,7 +235,6 @@ def crawl_website(start_url, base_domain, max_pages_to_crawl=100):
                         clean_text_parts.append(chunk)
                         seen_phrases.add(chunk)
                 main_content_text = " ".join(clean_text_parts).strip()
-Add commentMore actions
 
                 # Gabungkan judul dan konten
                 full_content = f"{title}\n\n{main_content_text}"
@@ -137,29 +253,55 @@ Add commentMore actions
                        not parsed_absolute_url.fragment and \
                        not parsed_absolute_url.query and \
                        not absolute_url.startswith('mailto:') and \
-                       not absolute_url.lower().endswith(('.pdf', '.doc', '.docx', '.xls', '.xlsx', '.zip', '.rar', '.jpg', '.png', '.gif')) and \
-                       urljoin(absolute_url, parsed_absolute_url.path) not in visited_urls: # Hindari URL yang sudah dikunjungi (versi bersih)
+                       not absolute_url.lower().endswith(('.pdf', '.doc', '.docx', '.xls', '.xlsx', '.zip', '.rar', '.jpg', '.png', '.gif')):
+                        # Link ke halaman yang sudah dikunjungi tetap dicatat (frontier tidak mengambilnya lagi),
+                        # agar link keluar halaman tidak bergantung pada urutan crawling
                         
                         clean_link_url = urljoin(absolute_url, parsed_absolute_url.path) # Bersihkan URL target juga
                         if clean_link_url != clean_current_url: # Hindari link ke halaman itu sendiri
                             links_to.append(clean_link_url)
-                            urls_to_visit.append(clean_link_url) # Tambahkan URL bersih ke antrian
+
+                # Tambahkan URL bersih ke frontier dan perbarui prioritasnya (in-link / cash OPIC)
+                frontier.record_links(current_url, links_to)
+
+                # Server tanpa ETag/Last-Modified: perubahan dideteksi dari hash konten dan link keluarnya
+                if known_page is None:
+                    page_status = 'new'
+                elif (known_page['content_hash'] == content_hash(full_content)
+                      and sorted(set(known_page['outlinks'])) == sorted(set(links_to))):
+                    page_status = 'unchanged'
+                    PAGES_UNCHANGED.inc(reason='same_hash')
+                else:
+                    page_status = 'changed'
 
                 pages_data.append({
                     'url': clean_current_url, # Simpan URL yang sudah bersih
                     'title': title, 
-                    'content': full_content, 
-                    'links_to': links_to
+                    'content': full_content if page_status != 'unchanged' else None,
+                    'links_to': links_to,
+                    'status': page_status,
+                    'etag': etag,
+                    'last_modified': last_modified
                 })
-                print(f"    - Berhasil: '{clean_current_url}' (Judul: '{title}', ditemukan {len(links_to)} link baru)")
+                print(f"    - Berhasil ({page_status}): '{clean_current_url}' (Judul: '{title}', ditemukan {len(links_to)} link)")
+                PAGES_FETCHED.inc()
+                LINKS_FOUND.inc(len(links_to))
 
             except TimeoutException:
                 print(f"    - Timeout saat mengambil {current_url}.")
+                FETCH_ERRORS.inc(reason='timeout')
             except requests.exceptions.RequestException as e:
                 print(f"    - Gagal mengambil {current_url} (HTTP/Network error): {e}")
+                FETCH_ERRORS.inc(reason='network')
             except Exception as e:
                 print(f"    - Error memproses {current_url}: {e}")
+                FETCH_ERRORS.inc(reason='processing')
+            finally:
+                FETCH_DURATION.observe(time.perf_counter() - fetch_start)
                 
+        crawl_seconds = time.perf_counter() - crawl_start
+        FRONTIER_SIZE.set(len(frontier))
+        PAGES_PER_SECOND.set(len(pages_data) / crawl_seconds if crawl_seconds > 0 else 0.0)
         print(f"\nCrawling selesai. Total halaman yang di-crawl: {len(pages_data)}")
         return pages_data
     finally:
@@ -167,43 +309,78 @@ Add commentMore actions
             driver.quit()
             print("WebDriver ditutup.")
 
-def populate_database(pages_data, db_manager):
+def populate_database(pages_data, db_manager, crawl_state=None):
     """
-    Mengisi database dengan data halaman dan link yang sudah di-crawl.
+    Menyimpan hasil crawl ke database secara inkremental (data lama tidak dihapus).
     Dilakukan dalam dua pass:
-    1. Masukkan semua halaman untuk mendapatkan ID.
-    2. Masukkan semua link menggunakan ID yang sudah ada.
+    1. Halaman baru/berubah di-upsert (ID dan skor PageRank halaman lama tetap), halaman yang
+       sudah tidak ada dihapus, halaman yang tidak berubah tidak ditulis sama sekali kecuali
+       validator HTTP-nya berganti.
+    2. Target link setiap halaman dihitung dari URL link keluarnya, dan tabel links hanya ditulis
+       untuk halaman yang target-nya berbeda dari yang tersimpan.
+    crawl_state adalah hasil db_manager.get_crawl_state() sebelum crawling (dibaca jika None).
+
+    Returns:
+        dict: Delta crawl: halaman 'new', 'changed', dan 'removed' (list {'id', 'url'}),
+              'links_changed' (ID halaman sumber yang link-nya berubah), jumlah 'unchanged',
+              dan 'corpus_version'.
     """
-    url_to_id_map = {}
+    if crawl_state is None:
+        crawl_state = db_manager.get_crawl_state()
+    url_to_id_map = {url: state['id'] for url, state in crawl_state.items()}
+    delta = {'new': [], 'changed': [], 'removed': [], 'links_changed': [], 'unchanged': 0}
 
-    print("\n--- Memasukkan Halaman ke Database (Pass 1) ---")
+    print("\n--- Menyimpan Halaman yang Berubah ke Database (Pass 1) ---")
     for page in pages_data:
-        # Asumsi insert_page(url, content)
-        page_id = db_manager.insert_page(page['url'], page['content']) 
-        if page_id is not None:
-            url_to_id_map[page['url']] = page_id
+        known_page = crawl_state.get(page['url'])
+        if page['status'] == 'removed':
+            delta['removed'].append({'id': url_to_id_map.pop(page['url']), 'url': page['url']})
+        elif page['status'] == 'unchanged':
+            delta['unchanged'] += 1
+            if (page['etag'], page['last_modified']) != (known_page['http_etag'], known_page['http_last_modified']):
+                db_manager.update_fetch_validators(known_page['id'], page['etag'], page['last_modified'])
         else:
-            print(f"Warning: Gagal memasukkan halaman '{page['url']}' ke database (mungkin duplikat atau error DB).")
+            page_id = db_manager.upsert_page(page['url'], page['content'], page['links_to'],
+                                             page['etag'], page['last_modified'])
+            if page_id is None:
+                print(f"Warning: Gagal menyimpan halaman '{page['url']}' ke database.")
+                continue
+            url_to_id_map[page['url']] = page_id
+            delta[page['status']].append({'id': page_id, 'url': page['url']})
+    db_manager.delete_pages([page['id'] for page in delta['removed']])
 
-    print("\n--- Memasukkan Link ke Database (Pass 2) ---")
+    print("\n--- Memperbarui Link yang Berubah (Pass 2) ---")
     for page in pages_data:
-        source_url = page['url']
-        source_id = url_to_id_map.get(source_url) 
-
-        if source_id is None:
-            print(f"Warning: ID tidak ditemukan untuk URL sumber: {source_url}. Lewati link-nya.")
+        source_id = url_to_id_map.get(page['url'])
+        if page['status'] == 'removed' or source_id is None:
             continue
+        # Link ke URL yang belum pernah di-crawl (di luar batas halaman) tidak disimpan
+        target_ids = [url_to_id_map[url] for url in page['links_to'] if url in url_to_id_map]
+        known_page = crawl_state.get(page['url'])
+        if sorted(target_ids) != sorted(known_page['link_targets'] if known_page else []):
+            db_manager.replace_links(source_id, target_ids)
+            delta['links_changed'].append(source_id)
 
-        for target_url in page['links_to']:
-            target_id = url_to_id_map.get(target_url) 
-
-            if target_id is None:
-                print(f"Warning: ID tidak ditemukan untuk URL target: {target_url} (dari {source_url}). Link diabaikan.")
-                continue 
+    # Versi korpus (ETag /search di aplikasi web) hanya diganti jika ada yang berubah
+    if delta['new'] or delta['changed'] or delta['removed'] or delta['links_changed']:
+        db_manager.set_state(CORPUS_VERSION_STATE, time.strftime('%Y%m%d%H%M%S'))
+    delta['corpus_version'] = db_manager.get_state(CORPUS_VERSION_STATE)
+    print(f"\nProses pengisian database selesai: {len(delta['new'])} halaman baru, {len(delta['changed'])} berubah, "
+          f"{len(delta['removed'])} dihapus, {delta['unchanged']} tidak berubah, "
+          f"link {len(delta['links_changed'])} halaman diperbarui.")
+    return delta
 
-            db_manager.insert_link(source_id, target_id)
-
-    print("\nProses pengisian database selesai.")
+def write_crawl_delta(path, delta):
+    """
+    Menulis delta crawl ke file JSON untuk proses berikutnya (indexer, perhitungan PageRank).
+    Ditulis ke file sementara lalu di-rename agar pembaca tidak melihat file setengah jadi.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(delta, f, indent=2)
+    os.replace(temp_path, path)
+    return path
 
 # Blok __main__ ini untuk menjalankan crawler secara standalone
 if __name__ == '__main__':
@@ -216,10 +393,18 @@ if __name__ == '__main__':
     
     if db_manager.connection:
         db_manager.create_tables() 
-        db_manager.clear_tables() # Disarankan untuk membersihkan DB sebelum crawl baru
+        # Recrawl bersifat inkremental; --full-recrawl mengosongkan database terlebih dahulu
+        if '--full-recrawl' in sys.argv[1:]:
+            db_manager.clear_tables()
+        # Validator HTTP, hash konten, dan PageRank crawl sebelumnya (untuk request bersyarat dan frontier)
+        crawl_state = db_manager.get_crawl_state()
+        previous_pagerank = db_manager.get_pagerank_by_url()
         
-        pages_data = crawl_website(start_url, base_domain, max_pages_to_crawl=50) # Batasi 50 halaman untuk uji coba
-        populate_database(pages_data, db_manager)
+        pages_data = crawl_website(start_url, base_domain, max_pages_to_crawl=50, # Batasi 50 halaman untuk uji coba
+                                   previous_pagerank=previous_pagerank, crawl_state=crawl_state)
+        delta = populate_database(pages_data, db_manager, crawl_state)
+        write_crawl_delta(CRAWL_DELTA_FILE, delta)
         db_manager.close_connection()
+        metrics.write_textfile(METRICS_DIR, 'crawler')
     else:
         print("Tidak dapat melakukan crawling karena koneksi database gagal.")
@@ -1,10 +1,46 @@
 import mysql.connector
 from mysql.connector import Error
 import os
+import hashlib
+import zlib
 
 # Nama database yang akan digunakan (pastikan database ini sudah dibuat di server MySQL Anda)
 DB_NAME = 'engine'
 
+# Level kompresi zlib untuk konten halaman (kolom pages.content_compressed)
+CONTENT_COMPRESSION_LEVEL = 6
+# Jumlah baris per batch saat memindahkan konten lama (kolom TEXT) ke kolom terkompresi
+CONTENT_MIGRATION_BATCH_SIZE = 500
+
+def compress_content(content):
+    """Compresses page text for the 'content_compressed' column (None stays None)."""
+    if content is None:
+        return None
+    return zlib.compress(content.encode('utf-8'), CONTENT_COMPRESSION_LEVEL)
+
+def content_hash(content):
+    """SHA-1 of the page text, used as the page's ETag and to detect content changes."""
+    return hashlib.sha1((content or '').encode('utf-8')).hexdigest()
+
+def encode_outlinks(urls):
+    """Packs the out-link URLs found on a page into one compressed value for the 'outlinks' column."""
+    return compress_content('\n'.join(urls))
+
+def decode_outlinks(compressed):
+    """Inverse of encode_outlinks; pages stored before the column existed have no out-links."""
+    if compressed is None:
+        return []
+    return [url for url in decompress_content(compressed).split('\n') if url]
+
+def decompress_content(compressed, legacy_content=None):
+    """
+    Returns the page text from a 'content_compressed' value, falling back to the
+    legacy uncompressed 'content' column for rows that have not been migrated yet.
+    """
+    if compressed is not None:
+        return zlib.decompress(compressed).decode('utf-8')
+    return legacy_content
+
 class DBManager:
     """
     Manages database connections and operations for the search engine.
@@ -47,6 +83,9 @@ class DBManager:
         """
         Creates the 'pages' and 'links' tables if they don't exist,
         based on the provided SQL schema (for MySQL).
+        Legacy uncompressed rows are not migrated here; run migrate_content() once
+        (python src/main.py --migrate) after upgrading an existing database.
+        Returns True on success, False on failure.
         """
         if not self.connection or not self.connection.is_connected():
             print("Cannot create tables: No database connection.")
@@ -55,15 +94,30 @@ class DBManager:
             # Use the database
             self.cursor.execute(f"USE {DB_NAME};")
 
-            # Table for pages, storing URL, content, and PageRank score
+            # Table for pages, storing URL, content, and PageRank score.
+            # Content is stored zlib-compressed in content_compressed; the TEXT column
+            # only holds rows written before compression was introduced (see migrate_content).
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS pages (
                     id INT AUTO_INCREMENT PRIMARY KEY,
                     url VARCHAR(255) UNIQUE NOT NULL,
                     content TEXT,
+                    content_compressed MEDIUMBLOB,
+                    content_hash CHAR(40),
+                    crawled_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP,
+                    http_etag VARCHAR(255),
+                    http_last_modified VARCHAR(64),
+                    outlinks MEDIUMBLOB,
                     pagerank_score FLOAT DEFAULT 0.0
                 )
             ''')
+            # Columns added after the first schema version, for databases created earlier
+            self._ensure_column('pages', 'content_compressed', 'MEDIUMBLOB AFTER content')
+            self._ensure_column('pages', 'content_hash', 'CHAR(40) AFTER content_compressed')
+            self._ensure_column('pages', 'crawled_at', 'TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP AFTER content_hash')
+            self._ensure_column('pages', 'http_etag', 'VARCHAR(255) AFTER crawled_at')
+            self._ensure_column('pages', 'http_last_modified', 'VARCHAR(64) AFTER http_etag')
+            self._ensure_column('pages', 'outlinks', 'MEDIUMBLOB AFTER http_last_modified')
             # Table for links between pages
             self.cursor.execute('''
                 CREATE TABLE IF NOT EXISTS links (
@@ -74,12 +128,77 @@ class DBManager:
                     FOREIGN KEY (target_page_id) REFERENCES pages(id) ON DELETE CASCADE
                 )
             ''')
+            # Key-value table for engine state, e.g. the link graph fingerprint of the stored scores
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS engine_state (
+                    name VARCHAR(64) PRIMARY KEY,
+                    value VARCHAR(255)
+                )
+            ''')
+            # Table for topic-sensitive PageRank basis vectors (one row per page and topic)
+            self.cursor.execute('''
+                CREATE TABLE IF NOT EXISTS topic_pagerank (
+                    page_id INT NOT NULL,
+                    topic VARCHAR(64) NOT NULL,
+                    score FLOAT DEFAULT 0.0,
+                    PRIMARY KEY (topic, page_id),
+                    FOREIGN KEY (page_id) REFERENCES pages(id) ON DELETE CASCADE
+                )
+            ''')
             self.connection.commit()
             print("Tables checked/created successfully.")
-            return True
         except Error as e:
             print(f"Error creating tables: {e}")
             return False
+        return True
+
+    def _ensure_column(self, table, column, definition):
+        """Adds a column to an existing table if it is missing (MySQL has no ADD COLUMN IF NOT EXISTS)."""
+        self.cursor.execute('''
+            SELECT COUNT(*) FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s
+        ''', (DB_NAME, table, column))
+        if self.cursor.fetchone()[0] == 0:
+            self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+            print(f"Added column {table}.{column}.")
+
+    def migrate_content(self, batch_size=CONTENT_MIGRATION_BATCH_SIZE):
+        """
+        Moves page text from the legacy uncompressed 'content' column into 'content_compressed',
+        in batches, clearing the TEXT column and filling 'content_hash' for every migrated row.
+        Safe to run repeatedly; rows that already have a content hash are skipped.
+        Returns True on success, False on failure.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot migrate content: No database connection.")
+            return False
+        migrated = 0
+        try:
+            while True:
+                self.cursor.execute(
+                    "SELECT id, content_compressed, content FROM pages WHERE content_hash IS NULL LIMIT %s",
+                    (batch_size,)
+                )
+                rows = self.cursor.fetchall()
+                if not rows:
+                    break
+                updates = []
+                for page_id, compressed, legacy_content in rows:
+                    content = decompress_content(compressed, legacy_content)
+                    updates.append((compressed if compressed is not None else compress_content(content),
+                                    content_hash(content), page_id))
+                self.cursor.executemany(
+                    "UPDATE pages SET content_compressed = %s, content = NULL, content_hash = %s WHERE id = %s",
+                    updates
+                )
+                self.connection.commit()
+                migrated += len(rows)
+            if migrated:
+                print(f"Compressed content of {migrated} existing pages.")
+            return True
+        except Error as e:
+            print(f"Error migrating page content: {e}")
+            return False
 
     def insert_page(self, url, content):
         """
@@ -91,7 +210,8 @@ class DBManager:
             print("Cannot insert page: No database connection.")
             return None
         try:
-            self.cursor.execute("INSERT INTO pages (url, content) VALUES (%s, %s)", (url, content))
+            self.cursor.execute("INSERT INTO pages (url, content_compressed, content_hash) VALUES (%s, %s, %s)",
+                                (url, compress_content(content), content_hash(content)))
             self.connection.commit()
             return self.cursor.lastrowid # Returns the ID of the last inserted row
         except mysql.connector.IntegrityError as e:
@@ -108,6 +228,69 @@ class DBManager:
             print(f"Error inserting page: {e}")
             return None
 
+    def upsert_page(self, url, content, outlinks=(), etag=None, last_modified=None):
+        """
+        Inserts a page, or updates the existing row with the same URL in place (keeping its ID,
+        PageRank score and links), together with its out-link URLs and the HTTP validators
+        (ETag, Last-Modified) of the response. crawled_at is set to the current time.
+        Returns the ID of the inserted/updated page, or None on error.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot upsert page: No database connection.")
+            return None
+        try:
+            # LAST_INSERT_ID(id) makes lastrowid return the existing ID when the row is updated
+            self.cursor.execute('''
+                INSERT INTO pages (url, content_compressed, content_hash, crawled_at, http_etag, http_last_modified, outlinks)
+                VALUES (%s, %s, %s, CURRENT_TIMESTAMP, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE id = LAST_INSERT_ID(id), content = NULL,
+                    content_compressed = VALUES(content_compressed), content_hash = VALUES(content_hash),
+                    crawled_at = CURRENT_TIMESTAMP, http_etag = VALUES(http_etag),
+                    http_last_modified = VALUES(http_last_modified), outlinks = VALUES(outlinks)
+            ''', (url, compress_content(content), content_hash(content), etag, last_modified, encode_outlinks(outlinks)))
+            self.connection.commit()
+            return self.cursor.lastrowid
+        except Error as e:
+            print(f"Error upserting page '{url}': {e}")
+            return None
+
+    def update_fetch_validators(self, page_id, etag, last_modified):
+        """
+        Stores new HTTP validators for a page whose content did not change, without
+        touching its content or crawled_at.
+        Returns True on success, False on failure.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot update fetch validators: No database connection.")
+            return False
+        try:
+            self.cursor.execute("UPDATE pages SET http_etag = %s, http_last_modified = %s WHERE id = %s",
+                                (etag, last_modified, page_id))
+            self.connection.commit()
+            return True
+        except Error as e:
+            print(f"Error updating fetch validators for ID {page_id}: {e}")
+            return False
+
+    def delete_pages(self, page_ids):
+        """
+        Deletes pages by ID; their links and topic PageRank rows go with them (ON DELETE CASCADE).
+        Returns True on success, False on failure.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot delete pages: No database connection.")
+            return False
+        if not page_ids:
+            return True
+        try:
+            placeholders = ', '.join(['%s'] * len(page_ids))
+            self.cursor.execute(f"DELETE FROM pages WHERE id IN ({placeholders})", tuple(page_ids))
+            self.connection.commit()
+            return True
+        except Error as e:
+            print(f"Error deleting pages: {e}")
+            return False
+
     def insert_link(self, source_page_id, target_page_id):
         """
         Inserts a link between two pages into the 'links' table.
@@ -125,30 +308,127 @@ class DBManager:
             print(f"Error inserting link ({source_page_id} -> {target_page_id}): {e}")
             return False
 
-    def get_all_documents(self):
+    def get_all_documents(self, include_content=False):
         """
         Retrieves all documents (pages) from the database, including their PageRank scores.
+        By default the content column is not transferred at all and the dictionaries have
+        no 'content' key (enough for the link graph and PageRank). include_content=True
+        decompresses every page into memory at once; use iter_document_batches() to
+        stream content instead.
         Returns a list of dictionaries, or an empty list on error.
         """
         if not self.connection or not self.connection.is_connected():
             print("Cannot retrieve all documents: No database connection.")
             return []
         try:
-            self.cursor.execute("SELECT id, url, content, pagerank_score FROM pages")
+            if not include_content:
+                self.cursor.execute("SELECT id, url, pagerank_score FROM pages")
+                return [{'id': row[0], 'url': row[1], 'pagerank_score': row[2]} for row in self.cursor.fetchall()]
+            self.cursor.execute("SELECT id, url, content_compressed, content, pagerank_score FROM pages")
             rows = self.cursor.fetchall()
             documents = []
             for row in rows:
                 documents.append({
                     'id': row[0],
                     'url': row[1],
-                    'content': row[2],
-                    'pagerank_score': row[3]
+                    'content': decompress_content(row[2], row[3]),
+                    'pagerank_score': row[4]
                 })
             return documents
         except Error as e:
             print(f"Error retrieving all documents: {e}")
             return []
 
+    def iter_document_batches(self, batch_size=500):
+        """
+        Streams all documents ordered by ID, yielding lists of at most batch_size dictionaries.
+        Uses a separate unbuffered cursor, so rows are read from the server as batches are
+        consumed instead of being transferred in one result set and each batch is
+        decompressed only when it is reached.
+        No other query can run on this connection until the generator is exhausted or closed.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot stream documents: No database connection.")
+            return
+        cursor = self.connection.cursor(buffered=False)
+        try:
+            cursor.execute("SELECT id, url, content_compressed, content, pagerank_score FROM pages ORDER BY id")
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield [{'id': row[0], 'url': row[1], 'content': decompress_content(row[2], row[3]),
+                        'pagerank_score': row[4]} for row in rows]
+        except Error as e:
+            print(f"Error streaming documents: {e}")
+        finally:
+            cursor.close()
+
+    def get_pagerank_by_url(self):
+        """
+        Retrieves the stored PageRank score of every page, keyed by URL.
+        Returns a dictionary {url: score}, or an empty dictionary on error.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot retrieve PageRank scores: No database connection.")
+            return {}
+        try:
+            self.cursor.execute("SELECT url, pagerank_score FROM pages")
+            return {url: score or 0.0 for url, score in self.cursor.fetchall()}
+        except Error as e:
+            print(f"Error retrieving PageRank scores: {e}")
+            return {}
+
+    def replace_links(self, source_page_id, target_page_ids):
+        """
+        Replaces all outgoing links of one page with links to target_page_ids, in one transaction.
+        Returns True on success, False on failure.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot replace links: No database connection.")
+            return False
+        try:
+            self.cursor.execute("DELETE FROM links WHERE source_page_id = %s", (source_page_id,))
+            self.cursor.executemany("INSERT INTO links (source_page_id, target_page_id) VALUES (%s, %s)",
+                                    [(source_page_id, target_id) for target_id in target_page_ids])
+            self.connection.commit()
+            return True
+        except Error as e:
+            self.connection.rollback()
+            print(f"Error replacing links of page {source_page_id}: {e}")
+            return False
+
+    def get_crawl_state(self):
+        """
+        Retrieves what a recrawl needs to detect changes, keyed by URL: the page ID, the stored
+        HTTP validators and content hash, the out-link URLs found at the last fetch, and the
+        target IDs currently stored in 'links' for the page (the content itself is not transferred).
+        Returns a dictionary {url: {...}}, or an empty dictionary on error.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot retrieve crawl state: No database connection.")
+            return {}
+        try:
+            self.cursor.execute("SELECT source_page_id, target_page_id FROM links")
+            link_targets = {}
+            for source_id, target_id in self.cursor.fetchall():
+                link_targets.setdefault(source_id, []).append(target_id)
+            self.cursor.execute("SELECT id, url, http_etag, http_last_modified, content_hash, outlinks FROM pages")
+            return {
+                row[1]: {
+                    'id': row[0],
+                    'http_etag': row[2],
+                    'http_last_modified': row[3],
+                    'content_hash': row[4],
+                    'outlinks': decode_outlinks(row[5]),
+                    'link_targets': link_targets.get(row[0], [])
+                }
+                for row in self.cursor.fetchall()
+            }
+        except Error as e:
+            print(f"Error retrieving crawl state: {e}")
+            return {}
+
     def get_links(self):
         """
         Retrieves all links (source_page_id, target_page_id) from the database.
@@ -180,36 +460,89 @@ class DBManager:
             print(f"Error updating PageRank for ID {page_id}: {e}")
             return False
 
-    def search_pages_by_keyword(self, keyword):
+    def replace_topic_pagerank_scores(self, topic, scores):
         """
-        Performs a basic keyword search on page content and URL,
-        ordering results by PageRank score in descending order.
-        Returns a list of dictionaries, or an empty list on error.
+        Replaces all stored topic-sensitive PageRank scores for one topic.
+        scores is a dictionary {page_id: score}.
+        Returns True on success, False on failure.
         """
         if not self.connection or not self.connection.is_connected():
-            print("Cannot search pages: No database connection.")
-            return []
+            print("Cannot update topic PageRank: No database connection.")
+            return False
         try:
-            # Using LIKE for basic keyword search (case-insensitive)
-            # Orders by pagerank_score to prioritize more important pages
-            search_pattern = f"%{keyword.lower()}%"
-            self.cursor.execute(
-                "SELECT id, url, content, pagerank_score FROM pages WHERE LOWER(content) LIKE %s OR LOWER(url) LIKE %s ORDER BY pagerank_score DESC",
-                (search_pattern, search_pattern)
-            )
-            rows = self.cursor.fetchall()
-            results = []
-            for row in rows:
-                results.append({
-                    'id': row[0],
-                    'url': row[1],
-                    'content': row[2],
-                    'pagerank_score': row[3]
-                })
-            return results
+            self.cursor.execute("DELETE FROM topic_pagerank WHERE topic = %s", (topic,))
+            self.cursor.executemany("INSERT INTO topic_pagerank (page_id, topic, score) VALUES (%s, %s, %s)",
+                                    [(page_id, topic, score) for page_id, score in scores.items()])
+            self.connection.commit()
+            return True
         except Error as e:
-            print(f"Error searching pages by keyword: {e}")
-            return []
+            print(f"Error updating topic PageRank for topic '{topic}': {e}")
+            return False
+
+    def get_topic_pagerank_scores(self):
+        """
+        Retrieves all topic-sensitive PageRank scores.
+        Returns a dictionary {topic: {page_id: score}}, or an empty dictionary on error.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot retrieve topic PageRank: No database connection.")
+            return {}
+        try:
+            self.cursor.execute("SELECT topic, page_id, score FROM topic_pagerank")
+            topic_scores = {}
+            for topic, page_id, score in self.cursor.fetchall():
+                topic_scores.setdefault(topic, {})[page_id] = score
+            return topic_scores
+        except Error as e:
+            print(f"Error retrieving topic PageRank: {e}")
+            return {}
+
+    def get_state(self, name):
+        """
+        Retrieves a value from the 'engine_state' table.
+        Returns the stored string, or None if not found or on error.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot retrieve engine state: No database connection.")
+            return None
+        try:
+            self.cursor.execute("SELECT value FROM engine_state WHERE name = %s", (name,))
+            row = self.cursor.fetchone()
+            return row[0] if row else None
+        except Error as e:
+            print(f"Error retrieving engine state '{name}': {e}")
+            return None
+
+    def get_all_state(self):
+        """
+        Retrieves every entry of the 'engine_state' table.
+        Returns a dictionary {name: value}, or an empty dictionary on error.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot retrieve engine state: No database connection.")
+            return {}
+        try:
+            self.cursor.execute("SELECT name, value FROM engine_state")
+            return dict(self.cursor.fetchall())
+        except Error as e:
+            print(f"Error retrieving engine state: {e}")
+            return {}
+
+    def set_state(self, name, value):
+        """
+        Stores a value in the 'engine_state' table, replacing any previous value.
+        Returns True on success, False on failure.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot store engine state: No database connection.")
+            return False
+        try:
+            self.cursor.execute("REPLACE INTO engine_state (name, value) VALUES (%s, %s)", (name, value))
+            self.connection.commit()
+            return True
+        except Error as e:
+            print(f"Error storing engine state '{name}': {e}")
+            return False
 
     def get_document_by_id(self, page_id):
         """
@@ -220,20 +553,42 @@ class DBManager:
             print("Cannot get document by ID: No database connection.")
             return None
         try:
-            self.cursor.execute("SELECT id, url, content, pagerank_score FROM pages WHERE id = %s", (page_id,))
+            self.cursor.execute(
+                "SELECT id, url, content_compressed, content, pagerank_score, content_hash, crawled_at FROM pages WHERE id = %s",
+                (page_id,)
+            )
             row = self.cursor.fetchone()
             if row:
                 return {
                     'id': row[0],
                     'url': row[1],
-                    'content': row[2],
-                    'pagerank_score': row[3]
+                    'content': decompress_content(row[2], row[3]),
+                    'pagerank_score': row[4],
+                    'content_hash': row[5],
+                    'crawled_at': row[6]
                 }
             return None
         except Error as e:
             print(f"Error retrieving document by ID {page_id}: {e}")
             return None
 
+    def get_page_version(self, page_id):
+        """
+        Retrieves only the content hash and crawl time of a page, without its content,
+        so callers can validate cached copies cheaply.
+        Returns a dictionary {'content_hash', 'crawled_at'}, or None if not found or on error.
+        """
+        if not self.connection or not self.connection.is_connected():
+            print("Cannot get page version: No database connection.")
+            return None
+        try:
+            self.cursor.execute("SELECT content_hash, crawled_at FROM pages WHERE id = %s", (page_id,))
+            row = self.cursor.fetchone()
+            return {'content_hash': row[0], 'crawled_at': row[1]} if row else None
+        except Error as e:
+            print(f"Error retrieving version of page {page_id}: {e}")
+            return None
+
     def clear_tables(self):
         """
         Clears all data from the 'links' and 'pages' tables.
@@ -247,6 +602,8 @@ class DBManager:
             # Note: FOREIGN_KEY_CHECKS might need to be temporarily disabled for clearing parent table first
             # but DELETE FROM handles dependencies if ON DELETE CASCADE is set up correctly.
             self.cursor.execute("DELETE FROM links")
+            self.cursor.execute("DELETE FROM topic_pagerank")
+            self.cursor.execute("DELETE FROM engine_state")
             self.cursor.execute("DELETE FROM pages")
             self.connection.commit()
             print("All tables cleared successfully.")
@@ -0,0 +1,114 @@
+import mmap
+import os
+import struct
+
+# Format file metadata dokumen (little-endian):
+#
+#   header  : magic 'PRDS', versi (uint32), jumlah dokumen (uint32)
+#   doc id  : jumlah_dokumen x uint32, terurut naik (dicari dengan binary search)
+#   record  : per dokumen -> panjang dokumen (uint32, jumlah token), panjang judul (uint32),
+#             skor PageRank (float64), posisi string (uint64)
+#   string  : per dokumen -> url, judul, cuplikan; masing-masing diawali panjangnya (uint32)
+#
+# File ini juga dibaca lewat mmap, sehingga metadata tidak perlu dimuat ke memori setiap proses.
+
+MAGIC = b'PRDS'
+VERSION = 1
+
+_HEADER = struct.Struct('<4sII')
+_RECORD = struct.Struct('<IIdQ')
+_UINT32 = struct.Struct('<I')
+
+def write_docstore(path, documents):
+    """
+    Menulis metadata dokumen ke 'path' (atomik lewat file sementara).
+    documents adalah list dictionary dengan key id, url, title, snippet, length,
+    title_length, dan pagerank_score, terurut berdasarkan id.
+    """
+    strings = bytearray()
+    records = bytearray()
+    ids = bytearray()
+    for doc in documents:
+        ids += _UINT32.pack(doc['id'])
+        records += _RECORD.pack(doc['length'], doc['title_length'], doc['pagerank_score'] or 0.0, len(strings))
+        for value in (doc['url'], doc['title'], doc['snippet']):
+            encoded = (value or '').encode('utf-8')
+            strings += _UINT32.pack(len(encoded))
+            strings += encoded
+
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, len(documents)))
+        f.write(ids)
+        f.write(records)
+        f.write(strings)
+    os.replace(temp_path, path)
+
+class DocStore:
+    """Pembaca metadata dokumen yang di-mmap, dengan pencarian berdasarkan doc id."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.count = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"File metadata dokumen tidak dikenali atau versinya berbeda: {path}")
+        self._ids_start = _HEADER.size
+        self._records_start = self._ids_start + _UINT32.size * self.count
+        self._strings_start = self._records_start + _RECORD.size * self.count
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self):
+        return self.count
+
+    def id_at(self, i):
+        return _UINT32.unpack_from(self._buffer, self._ids_start + i * _UINT32.size)[0]
+
+    def position(self, doc_id):
+        """Posisi dokumen di file, atau None jika doc id tidak ada."""
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.id_at(middle) < doc_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and self.id_at(low) == doc_id:
+            return low
+        return None
+
+    def _read_string(self, offset):
+        length = _UINT32.unpack_from(self._buffer, offset)[0]
+        start = offset + _UINT32.size
+        return self._buffer[start:start + length].decode('utf-8'), start + length
+
+    def document_at(self, i):
+        """Mengembalikan metadata dokumen ke-i sebagai dictionary."""
+        length, title_length, pagerank_score, string_offset = _RECORD.unpack_from(
+            self._buffer, self._records_start + i * _RECORD.size)
+        offset = self._strings_start + string_offset
+        url, offset = self._read_string(offset)
+        title, offset = self._read_string(offset)
+        snippet, _ = self._read_string(offset)
+        return {
+            'id': self.id_at(i),
+            'url': url,
+            'title': title,
+            'snippet': snippet,
+            'length': length,
+            'title_length': title_length,
+            'pagerank_score': pagerank_score,
+        }
+
+    def get(self, doc_id):
+        """Metadata dokumen berdasarkan doc id, atau None jika tidak ada."""
+        i = self.position(doc_id)
+        return self.document_at(i) if i is not None else None
@@ -0,0 +1,197 @@
+"""
+Indexer offline: membangun semua artefak pencarian dari tabel pages dalam satu kali jalan.
+
+Contoh:
+    python src/index/indexer.py --workers 4 --batch-size 500
+"""
+import argparse
+import heapq
+import os
+import shutil
+import sys
+import time
+from collections import Counter
+from functools import partial
+from itertools import groupby
+from multiprocessing import Pool
+from operator import itemgetter
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'utils')))
+
+from db_manager import DBManager
+from config import INDEX_DIR, INDEX_KEEP_GENERATIONS, INDEX_SHARDS, INDEX_RUN_POSTINGS, METRICS_DIR
+from text import tokenize, split_title, SNIPPET_LENGTH
+from postings import IndexWriter, write_run, iter_run
+from docstore import write_docstore
+from search_index import (POSTINGS_FILE, DOCUMENTS_FILE, TERM_LENGTHS_FILE, TERM_STATS_FILE, SHARD_DIR_PREFIX,
+                          publish_generation, shard_for_url, write_term_lengths, write_term_stats,
+                          write_topic_pagerank)
+import metrics
+
+DOCUMENTS_INDEXED = metrics.gauge('indexer_documents', 'Jumlah dokumen pada build indeks terakhir.')
+TERMS_INDEXED = metrics.gauge('indexer_terms', 'Jumlah term pada build indeks terakhir.')
+BUILD_DURATION = metrics.gauge('indexer_build_seconds', 'Durasi build indeks terakhir.')
+
+def tokenize_batch(rows, num_shards=1):
+    """
+    Men-tokenisasi satu batch dokumen (dijalankan di worker).
+    Mengembalikan list per shard berisi (indeks parsial {term: [(doc_id, frekuensi), ...]},
+    metadata dokumen); setiap dokumen masuk ke shard sesuai hash URL-nya.
+    """
+    shards = [({}, []) for _ in range(num_shards)]
+    for row in rows:
+        partial_postings, documents = shards[shard_for_url(row['url'], num_shards)]
+        content = row['content'] or ''
+        title, _ = split_title(content)
+        tokens = tokenize(content)
+        for term, frequency in Counter(tokens).items():
+            partial_postings.setdefault(term, []).append((row['id'], frequency))
+        documents.append({
+            'id': row['id'],
+            'url': row['url'],
+            'title': title,
+            'snippet': content[:SNIPPET_LENGTH],
+            'length': len(tokens),
+            'title_length': len(tokenize(title)),
+            'pagerank_score': row['pagerank_score'],
+        })
+    return shards
+
+def merge_runs(run_paths, postings):
+    """
+    Menggabungkan run di disk (urutan pembuatan, yaitu urutan doc_id) dan indeks parsial di
+    memori yang terakhir menjadi satu aliran (term, postings) terurut berdasarkan term.
+    Postings term yang sama disambung sesuai urutan run, sehingga doc_id tetap terurut naik.
+    """
+    sources = [iter_run(path) for path in run_paths] + [iter(sorted(postings.items()))]
+    merged = heapq.merge(*sources, key=itemgetter(0))
+    for term, group in groupby(merged, key=itemgetter(0)):
+        term_postings = []
+        for _, run_postings in group:
+            term_postings.extend(run_postings)
+        yield term, term_postings
+
+def write_shard(shard_dir, term_postings, documents, topic_scores):
+    """
+    Menulis semua artefak satu shard (atau indeks tanpa shard) ke shard_dir.
+    term_postings adalah aliran (term, postings) terurut berdasarkan term (lihat merge_runs).
+    Mengembalikan daftar term shard ini.
+    """
+    os.makedirs(shard_dir, exist_ok=True)
+    pagerank_by_doc = {doc['id']: doc['pagerank_score'] or 0.0 for doc in documents}
+    doc_freqs = []
+    pagerank_sums = []
+    with IndexWriter(os.path.join(shard_dir, POSTINGS_FILE), len(documents)) as writer:
+        for term, postings in term_postings:
+            writer.add(term, postings)
+            doc_freqs.append(len(postings))
+            pagerank_sums.append(sum(pagerank_by_doc.get(doc_id, 0.0) for doc_id, _ in postings))
+    write_docstore(os.path.join(shard_dir, DOCUMENTS_FILE), documents)
+    write_term_lengths(os.path.join(shard_dir, TERM_LENGTHS_FILE), writer.terms)
+    write_term_stats(os.path.join(shard_dir, TERM_STATS_FILE), doc_freqs, pagerank_sums)
+    write_topic_pagerank(shard_dir, [doc['id'] for doc in documents], topic_scores)
+    return writer.terms
+
+def build_index(db_manager, index_dir=INDEX_DIR, num_workers=1, batch_size=500, num_shards=INDEX_SHARDS,
+                run_postings=INDEX_RUN_POSTINGS):
+    """
+    Membangun indeks dari tabel pages: dokumen dibaca per batch (streaming), ditokenisasi
+    sekali (paralel jika num_workers > 1), lalu indeks parsial digabung dan ditulis ke
+    generasi indeks baru yang kemudian diaktifkan secara atomik. Skor PageRank global dan
+    per topik ikut disalin dari database, jadi jalankan ulang setelah PageRank dihitung ulang.
+
+    Setiap kali postings di memori mencapai run_postings, indeks parsial setiap shard ditulis
+    ke disk sebagai run terurut; di akhir, run-run tersebut digabung (merge) term demi term
+    langsung ke file indeks, sehingga memori tidak bertambah seiring ukuran korpus.
+
+    Jika num_shards > 1, dokumen dibagi ke beberapa shard berdasarkan hash URL dan setiap
+    shard ditulis ke subfolder sendiri di dalam generasi yang sama, sehingga semua shard
+    berganti bersamaan saat CURRENT diganti.
+
+    Returns:
+        str: Nama generasi indeks yang baru, atau None jika tidak ada dokumen.
+    """
+    start = time.perf_counter()
+    # Per shard: indeks parsial di memori, metadata dokumen, dan daftar run di disk
+    shards = [({}, [], []) for _ in range(num_shards)]
+    generation = time.strftime('%Y%m%d%H%M%S') + f"-{os.getpid()}"
+    generation_dir = os.path.join(index_dir, generation)
+    runs_dir = os.path.join(index_dir, f".runs-{generation}")
+
+    batches = db_manager.iter_document_batches(batch_size)
+    documents_count = 0
+    buffered_postings = 0
+    pool = Pool(num_workers) if num_workers > 1 else None
+    try:
+        tokenize_shards = partial(tokenize_batch, num_shards=num_shards)
+        results = pool.imap(tokenize_shards, batches) if pool else map(tokenize_shards, batches)
+        # Batch diproses berurutan berdasarkan id, sehingga postings hasil penggabungan tetap terurut
+        for batch_shards in results:
+            for (postings, documents, _), (partial_postings, batch_documents) in zip(shards, batch_shards):
+                for term, term_postings in partial_postings.items():
+                    postings.setdefault(term, []).extend(term_postings)
+                    buffered_postings += len(term_postings)
+                documents.extend(batch_documents)
+                documents_count += len(batch_documents)
+            print(f"  - {documents_count} dokumen ditokenisasi...")
+            if buffered_postings >= run_postings:
+                os.makedirs(runs_dir, exist_ok=True)
+                for shard, (postings, _, runs) in enumerate(shards):
+                    if postings:
+                        runs.append(os.path.join(runs_dir, f"{shard:02d}-{len(runs):05d}.run"))
+                        write_run(runs[-1], postings)
+                        postings.clear()
+                buffered_postings = 0
+    finally:
+        if pool:
+            pool.close()
+            pool.join()
+
+    try:
+        if not documents_count:
+            print("Tidak ada dokumen di database. Indeks tidak dibangun.")
+            return None
+
+        topic_scores = db_manager.get_topic_pagerank_scores()
+        shard_terms = []
+        for shard, (postings, documents, runs) in enumerate(shards):
+            shard_dir = generation_dir if num_shards == 1 else os.path.join(generation_dir, f"{SHARD_DIR_PREFIX}{shard:02d}")
+            shard_terms.append(write_shard(shard_dir, merge_runs(runs, postings), documents, topic_scores))
+            if num_shards > 1:
+                print(f"  - Shard {shard}: {len(documents)} dokumen, {len(shard_terms[-1])} term, {len(runs)} run")
+    finally:
+        shutil.rmtree(runs_dir, ignore_errors=True)
+    publish_generation(index_dir, generation, INDEX_KEEP_GENERATIONS)
+
+    terms_count = len(set().union(*shard_terms))
+    DOCUMENTS_INDEXED.set(documents_count)
+    TERMS_INDEXED.set(terms_count)
+    BUILD_DURATION.set(time.perf_counter() - start)
+    print(f"Indeks '{generation}' selesai: {documents_count} dokumen, {terms_count} term, "
+          f"{num_shards} shard, {time.perf_counter() - start:.2f} detik.")
+    return generation
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Membangun indeks pencarian dari tabel pages.")
+    parser.add_argument('--workers', type=int, default=1, help="Jumlah proses untuk tokenisasi (0 = semua core).")
+    parser.add_argument('--batch-size', type=int, default=500, help="Jumlah dokumen per batch yang dibaca dari database.")
+    parser.add_argument('--output', default=INDEX_DIR, help="Folder indeks.")
+    parser.add_argument('--shards', type=int, default=INDEX_SHARDS,
+                        help="Jumlah shard indeks (dokumen dibagi berdasarkan hash URL).")
+    args = parser.parse_args()
+
+    db_manager = DBManager()
+    db_manager.connect()
+    if not db_manager.connection:
+        print("Gagal terhubung ke database. Indeks tidak dapat dibangun.")
+        sys.exit(1)
+
+    try:
+        print("--- Memulai Build Indeks Pencarian ---")
+        build_index(db_manager, args.output, args.workers if args.workers > 0 else (os.cpu_count() or 1),
+                    args.batch_size, max(1, args.shards))
+        metrics.write_textfile(METRICS_DIR, 'indexer')
+    finally:
+        db_manager.close_connection()
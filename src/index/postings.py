@@ -0,0 +1,382 @@
+import mmap
+import os
+import shutil
+import struct
+from bisect import bisect_left
+
+# Format file indeks (semua bilangan little-endian):
+#
+#   header        : magic 'PRIX', versi (uint32), jumlah term (uint32), jumlah dokumen (uint32),
+#                   posisi tabel offset term, blob term, tabel entri term, dan data postings (4 x uint64)
+#   offset term   : (jumlah_term + 1) x uint32, posisi awal setiap term di blob term
+#   blob term     : semua term (UTF-8) berurutan secara leksikografis, tanpa pemisah
+#   entri term    : per term -> df (uint32), posisi postings (uint64), panjang postings (uint32)
+#   postings      : per term -> jumlah blok (uint32), tabel skip (per blok: doc id terakhir di blok
+#                   dan posisi blok relatif terhadap awal data blok, 2 x uint32), lalu data blok.
+#                   Setiap blok berisi SKIP_INTERVAL posting: selisih doc id (delta dari doc id
+#                   terakhir blok sebelumnya) lalu frekuensi, keduanya dalam variable-byte.
+#
+# Dengan format ini file bisa di-mmap: mencari term cukup binary search pada blob term,
+# dan membaca postings cukup men-decode blok yang diperlukan (tabel skip untuk lompat).
+
+MAGIC = b'PRIX'
+VERSION = 1
+SKIP_INTERVAL = 128
+
+_HEADER = struct.Struct('<4sIII4Q')
+_TERM_ENTRY = struct.Struct('<IQI')
+_SKIP_ENTRY = struct.Struct('<II')
+_UINT32 = struct.Struct('<I')
+
+def encode_varbyte(numbers, out):
+    """Menambahkan bilangan bulat non-negatif ke bytearray out dalam format variable-byte (7 bit per byte)."""
+    for number in numbers:
+        while number >= 0x80:
+            out.append((number & 0x7F) | 0x80)
+            number >>= 7
+        out.append(number)
+
+def decode_varbyte(buffer, position, count):
+    """Membaca 'count' bilangan variable-byte mulai dari position. Mengembalikan (list bilangan, posisi akhir)."""
+    numbers = []
+    for _ in range(count):
+        number = 0
+        shift = 0
+        while True:
+            byte = buffer[position]
+            position += 1
+            number |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        numbers.append(number)
+    return numbers, position
+
+def encode_postings(postings):
+    """
+    Mengubah list (doc_id, frekuensi) yang terurut berdasarkan doc_id menjadi bytes
+    berformat blok dengan tabel skip.
+    """
+    blocks = []
+    skip_table = []
+    previous_doc_id = 0
+    block_offset = 0
+    for start in range(0, len(postings), SKIP_INTERVAL):
+        block = postings[start:start + SKIP_INTERVAL]
+        data = bytearray()
+        deltas = []
+        for doc_id, _ in block:
+            deltas.append(doc_id - previous_doc_id)
+            previous_doc_id = doc_id
+        encode_varbyte(deltas, data)
+        encode_varbyte([frequency for _, frequency in block], data)
+        skip_table.append((previous_doc_id, block_offset))
+        blocks.append(bytes(data))
+        block_offset += len(data)
+
+    out = bytearray(_UINT32.pack(len(blocks)))
+    for last_doc_id, offset in skip_table:
+        out += _SKIP_ENTRY.pack(last_doc_id, offset)
+    for data in blocks:
+        out += data
+    return bytes(out)
+
+def write_index(path, postings_by_term, num_documents):
+    """
+    Menulis indeks ke 'path'. postings_by_term adalah {term: [(doc_id, frekuensi), ...]}
+    dengan doc_id terurut naik. File ditulis ke file sementara lalu di-rename (atomik),
+    sehingga pembaca tidak pernah melihat file setengah jadi.
+    """
+    with IndexWriter(path, num_documents) as writer:
+        for term in sorted(postings_by_term):
+            writer.add(term, postings_by_term[term])
+
+class IndexWriter:
+    """
+    Menulis indeks term demi term (term harus ditambahkan dalam urutan leksikografis), sehingga
+    postings tidak perlu disimpan semuanya di memori. Data postings ditulis ke file sementara;
+    saat close(), header, kamus term, dan data postings digabung menjadi file indeks di 'path'.
+    Hanya daftar term dan entrinya yang disimpan di memori.
+    """
+    def __init__(self, path, num_documents):
+        self.path = path
+        self.num_documents = num_documents
+        self.terms = []
+        self._entries = []
+        self._data_path = f"{path}.{os.getpid()}.postings.tmp"
+        self._data = open(self._data_path, 'wb')
+        self._position = 0
+
+    def add(self, term, postings):
+        """Menambahkan postings [(doc_id, frekuensi), ...] (doc_id terurut naik) milik satu term."""
+        if self.terms and term <= self.terms[-1]:
+            raise ValueError(f"Term '{term}' ditambahkan di luar urutan kamus.")
+        data = encode_postings(postings)
+        self._data.write(data)
+        self.terms.append(term)
+        self._entries.append((len(postings), self._position, len(data)))
+        self._position += len(data)
+
+    def close(self):
+        """Menyusun file indeks akhir lalu me-rename-nya ke 'path' (atomik)."""
+        self._data.close()
+        encoded_terms = [term.encode('utf-8') for term in self.terms]
+
+        term_offsets = bytearray()
+        position = 0
+        for encoded in encoded_terms:
+            term_offsets += _UINT32.pack(position)
+            position += len(encoded)
+        term_offsets += _UINT32.pack(position)
+        term_blob = b''.join(encoded_terms)
+
+        offsets_start = _HEADER.size
+        blob_start = offsets_start + len(term_offsets)
+        entries_start = blob_start + len(term_blob)
+        postings_start = entries_start + _TERM_ENTRY.size * len(self.terms)
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(_HEADER.pack(MAGIC, VERSION, len(self.terms), self.num_documents,
+                                 offsets_start, blob_start, entries_start, postings_start))
+            f.write(term_offsets)
+            f.write(term_blob)
+            entries = bytearray()
+            for df, offset, length in self._entries:
+                entries += _TERM_ENTRY.pack(df, postings_start + offset, length)
+            f.write(entries)
+            with open(self._data_path, 'rb') as data:
+                shutil.copyfileobj(data, f)
+        os.remove(self._data_path)
+        os.replace(temp_path, self.path)
+
+    def abort(self):
+        """Membuang file sementara tanpa menulis indeks."""
+        self._data.close()
+        if os.path.exists(self._data_path):
+            os.remove(self._data_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+def write_run(path, postings_by_term):
+    """
+    Menulis indeks parsial {term: [(doc_id, frekuensi), ...]} sebagai run terurut berdasarkan term
+    (dipakai indexer untuk membuang postings dari memori ke disk). Per term: panjang term (uint32),
+    term (UTF-8), jumlah posting (uint32), panjang data (uint32), lalu selisih doc id dan frekuensi
+    dalam variable-byte.
+    """
+    with open(path, 'wb') as f:
+        for term in sorted(postings_by_term):
+            postings = postings_by_term[term]
+            encoded = term.encode('utf-8')
+            data = bytearray()
+            previous_doc_id = 0
+            deltas = []
+            for doc_id, _ in postings:
+                deltas.append(doc_id - previous_doc_id)
+                previous_doc_id = doc_id
+            encode_varbyte(deltas, data)
+            encode_varbyte([frequency for _, frequency in postings], data)
+            f.write(_UINT32.pack(len(encoded)) + encoded + _UINT32.pack(len(postings)) + _UINT32.pack(len(data)))
+            f.write(data)
+
+def iter_run(path):
+    """Membaca run hasil write_run secara berurutan, menghasilkan (term, [(doc_id, frekuensi), ...])."""
+    with open(path, 'rb') as f:
+        while True:
+            header = f.read(_UINT32.size)
+            if not header:
+                return
+            term = f.read(_UINT32.unpack(header)[0]).decode('utf-8')
+            count = _UINT32.unpack(f.read(_UINT32.size))[0]
+            data = f.read(_UINT32.unpack(f.read(_UINT32.size))[0])
+            deltas, position = decode_varbyte(data, 0, count)
+            frequencies, _ = decode_varbyte(data, position, count)
+            postings = []
+            doc_id = 0
+            for delta, frequency in zip(deltas, frequencies):
+                doc_id += delta
+                postings.append((doc_id, frequency))
+            yield term, postings
+
+class PostingsCursor:
+    """
+    Cursor untuk membaca postings satu term secara berurutan.
+    advance_to() memakai tabel skip untuk melompati blok yang tidak diperlukan
+    tanpa men-decode isinya.
+    """
+    def __init__(self, buffer, offset, df):
+        self._buffer = buffer
+        self.df = df
+        self._num_blocks = _UINT32.unpack_from(buffer, offset)[0]
+        self._skip_start = offset + _UINT32.size
+        self._data_start = self._skip_start + _SKIP_ENTRY.size * self._num_blocks
+        self._block = -1
+        self._doc_ids = []
+        self._frequencies = []
+        self._position = 0
+
+    def _block_last_doc_id(self, block):
+        return _SKIP_ENTRY.unpack_from(self._buffer, self._skip_start + block * _SKIP_ENTRY.size)[0]
+
+    def _load_block(self, block):
+        _, block_offset = _SKIP_ENTRY.unpack_from(self._buffer, self._skip_start + block * _SKIP_ENTRY.size)
+        previous_doc_id = self._block_last_doc_id(block - 1) if block > 0 else 0
+        count = min(SKIP_INTERVAL, self.df - block * SKIP_INTERVAL)
+        deltas, position = decode_varbyte(self._buffer, self._data_start + block_offset, count)
+        self._frequencies, _ = decode_varbyte(self._buffer, position, count)
+        doc_ids = []
+        for delta in deltas:
+            previous_doc_id += delta
+            doc_ids.append(previous_doc_id)
+        self._doc_ids = doc_ids
+        self._block = block
+        self._position = 0
+
+    def next(self):
+        """Mengembalikan (doc_id, frekuensi) berikutnya, atau None jika postings habis."""
+        if self._position >= len(self._doc_ids):
+            if self._block + 1 >= self._num_blocks:
+                return None
+            self._load_block(self._block + 1)
+        posting = (self._doc_ids[self._position], self._frequencies[self._position])
+        self._position += 1
+        return posting
+
+    def advance_to(self, target_doc_id):
+        """Mengembalikan posting pertama dengan doc_id >= target_doc_id, atau None jika tidak ada."""
+        if self._block >= self._num_blocks:
+            return None
+        block = max(self._block, 0)
+        if self._block < 0 or self._block_last_doc_id(self._block) < target_doc_id:
+            # Binary search pada tabel skip untuk blok pertama yang mungkin berisi target
+            low, high = block, self._num_blocks
+            while low < high:
+                middle = (low + high) // 2
+                if self._block_last_doc_id(middle) < target_doc_id:
+                    low = middle + 1
+                else:
+                    high = middle
+            if low >= self._num_blocks:
+                self._block = self._num_blocks
+                self._doc_ids = []
+                return None
+            if low != self._block:
+                self._load_block(low)
+        self._position = bisect_left(self._doc_ids, target_doc_id, self._position)
+        return self.next()
+
+    def __iter__(self):
+        while True:
+            posting = self.next()
+            if posting is None:
+                return
+            yield posting
+
+class IndexReader:
+    """
+    Pembaca indeks yang di-mmap. Kamus term dan postings dibaca langsung dari file
+    tanpa memuat seluruh isi ke memori, sehingga beberapa proses yang membuka file
+    yang sama berbagi halaman yang sama di page cache OS.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._buffer = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.num_terms, self.num_documents, self._offsets_start,
+         self._blob_start, self._entries_start, self._postings_start) = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"File indeks tidak dikenali atau versinya berbeda: {path}")
+
+    def close(self):
+        if self._buffer is not None:
+            self._buffer.close()
+            self._buffer = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def term_at(self, i):
+        """Mengembalikan term ke-i (urutan leksikografis)."""
+        start, end = struct.unpack_from('<II', self._buffer, self._offsets_start + i * _UINT32.size)
+        return self._buffer[self._blob_start + start:self._blob_start + end].decode('utf-8')
+
+    def _term_bytes_at(self, i):
+        start, end = struct.unpack_from('<II', self._buffer, self._offsets_start + i * _UINT32.size)
+        return self._buffer[self._blob_start + start:self._blob_start + end]
+
+    def lower_bound(self, term):
+        """Posisi term pertama yang >= term (binary search pada kamus term)."""
+        encoded = term.encode('utf-8')
+        low, high = 0, self.num_terms
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_bytes_at(middle) < encoded:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find_term(self, term):
+        """Mengembalikan posisi term di kamus, atau None jika tidak ada."""
+        i = self.lower_bound(term)
+        if i < self.num_terms and self._term_bytes_at(i) == term.encode('utf-8'):
+            return i
+        return None
+
+    def _entry(self, i):
+        return _TERM_ENTRY.unpack_from(self._buffer, self._entries_start + i * _TERM_ENTRY.size)
+
+    def doc_freq(self, term):
+        """Jumlah dokumen yang mengandung term (0 jika term tidak ada)."""
+        i = self.find_term(term)
+        return self._entry(i)[0] if i is not None else 0
+
+    def doc_freq_at(self, i):
+        return self._entry(i)[0]
+
+    def postings(self, term):
+        """Mengembalikan PostingsCursor untuk term, atau None jika term tidak ada."""
+        i = self.find_term(term)
+        if i is None:
+            return None
+        df, offset, _ = self._entry(i)
+        return PostingsCursor(self._buffer, offset, df)
+
+    def prefix_range(self, prefix):
+        """(awal, akhir) posisi term yang diawali prefix; semua term tersebut berurutan di kamus."""
+        start = self.lower_bound(prefix)
+        encoded_prefix = prefix.encode('utf-8')
+        low, high = start, self.num_terms
+        while low < high:
+            middle = (low + high) // 2
+            if self._term_bytes_at(middle).startswith(encoded_prefix):
+                low = middle + 1
+            else:
+                high = middle
+        return start, low
+
+    def terms_with_prefix(self, prefix):
+        """Iterator (posisi, term) untuk semua term yang diawali prefix."""
+        i = self.lower_bound(prefix)
+        encoded_prefix = prefix.encode('utf-8')
+        while i < self.num_terms:
+            term_bytes = self._term_bytes_at(i)
+            if not term_bytes.startswith(encoded_prefix):
+                return
+            yield i, term_bytes.decode('utf-8')
+            i += 1
@@ -0,0 +1,361 @@
+import difflib
+import glob
+import math
+import os
+import shutil
+import zlib
+
+import numpy as np
+
+from postings import IndexReader
+from docstore import DocStore
+
+# Struktur folder indeks:
+#   <index_dir>/CURRENT            : nama generasi indeks yang sedang aktif
+#   <index_dir>/<generasi>/        : artefak hasil satu kali build (lihat nama file di bawah)
+#   <index_dir>/<generasi>/shard-NN/ : jika indeks di-shard, artefak setiap shard ada di subfolder ini
+# Build baru ditulis ke folder generasi baru, lalu CURRENT diganti secara atomik.
+# Semua artefak dibuka read-only lewat mmap, sehingga beberapa proses worker aplikasi web
+# berbagi halaman yang sama di page cache OS, bukan masing-masing menyimpan salinan.
+CURRENT_FILE = 'CURRENT'
+POSTINGS_FILE = 'postings.idx'
+DOCUMENTS_FILE = 'documents.idx'
+# Kosakata terurut berdasarkan panjang term: array [2 x jumlah_term] (panjang, posisi term)
+TERM_LENGTHS_FILE = 'term_lengths.npy'
+# PageRank per topik: matrix [jumlah_dokumen x jumlah_topik] (float32), baris sesuai urutan documents.idx
+TOPIC_PAGERANK_FILE = 'topic_pagerank.npy'
+TOPIC_NAMES_FILE = 'topics.txt'
+# Statistik per term untuk autocomplete: array [2 x jumlah_term] (df, jumlah PageRank dokumennya),
+# sejajar dengan urutan kamus term di postings.idx
+TERM_STATS_FILE = 'term_stats.npy'
+SHARD_DIR_PREFIX = 'shard-'
+
+# Batas kemiripan koreksi typo (sama dengan cutoff difflib sebelumnya di /search)
+TYPO_CUTOFF = 0.7
+# Pada indeks yang di-shard, setiap shard mengirim limit x faktor ini kandidat autocomplete
+# sebelum bobotnya dijumlahkan, agar term yang tersebar di banyak shard tetap terambil
+SUGGEST_SHARD_OVERFETCH = 3
+
+def current_generation(index_dir):
+    """Mengembalikan nama generasi indeks yang aktif, atau None jika belum ada."""
+    try:
+        with open(os.path.join(index_dir, CURRENT_FILE), encoding='utf-8') as f:
+            generation = f.read().strip()
+    except OSError:
+        return None
+    return generation or None
+
+def shard_for_url(url, num_shards):
+    """Nomor shard untuk sebuah URL (hash CRC32 URL modulo jumlah shard)."""
+    return zlib.crc32(url.encode('utf-8')) % num_shards
+
+def open_current(index_dir):
+    """
+    Membuka generasi indeks yang aktif: SearchIndex untuk indeks satu bagian, atau
+    ShardedSearchIndex jika generasi tersebut berisi beberapa shard.
+    Mengembalikan None jika indeks belum ada atau tidak valid.
+    """
+    generation = current_generation(index_dir)
+    if generation is None:
+        return None
+    generation_dir = os.path.join(index_dir, generation)
+    shard_dirs = sorted(glob.glob(os.path.join(generation_dir, SHARD_DIR_PREFIX + '*')))
+    try:
+        return ShardedSearchIndex(generation_dir, shard_dirs) if shard_dirs else SearchIndex(generation_dir)
+    except (OSError, ValueError) as e:
+        print(f"Gagal membuka indeks pencarian '{generation}': {e}")
+        return None
+
+def publish_generation(index_dir, generation, keep_generations=2):
+    """
+    Menjadikan 'generation' indeks yang aktif dengan mengganti file CURRENT secara atomik,
+    lalu menghapus generasi lama (menyisakan keep_generations generasi terbaru).
+
+    Generasi yang aktif sebelum pemanggilan ini tidak pernah dihapus di sini, karena proses
+    aplikasi web mungkin masih me-mmap-nya sampai pemeriksaan CURRENT berikutnya; generasi itu
+    baru dihapus pada publish berikutnya, setelah semua pembaca sempat berpindah. Generasi yang
+    gagal dihapus (misalnya file masih terbuka di Windows) dicatat dan dicoba lagi pada publish
+    berikutnya.
+    """
+    previous = current_generation(index_dir)
+    current_path = os.path.join(index_dir, CURRENT_FILE)
+    temp_path = f"{current_path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(generation)
+    os.replace(temp_path, current_path)
+
+    # Folder berawalan titik adalah data sementara build yang sedang berjalan (misalnya run indexer)
+    generations = sorted(name for name in os.listdir(index_dir)
+                         if not name.startswith('.') and os.path.isdir(os.path.join(index_dir, name)))
+    for name in generations[:-keep_generations]:
+        if name in (generation, previous):
+            continue
+        try:
+            shutil.rmtree(os.path.join(index_dir, name))
+        except OSError as e:
+            print(f"Gagal menghapus generasi indeks lama '{name}' (dicoba lagi pada publish berikutnya): {e}")
+
+def write_term_lengths(path, terms):
+    """Menulis posisi term (urutan kamus) yang diurutkan berdasarkan panjang term, untuk koreksi typo."""
+    lengths = np.fromiter((len(term) for term in terms), dtype=np.uint32, count=len(terms))
+    order = np.argsort(lengths, kind='stable').astype(np.uint32)
+    np.save(path, np.vstack([lengths[order], order]))
+
+def write_term_stats(path, doc_freqs, pagerank_sums):
+    """
+    Menulis df dan jumlah PageRank dokumen yang mengandung setiap term (keduanya dalam urutan
+    kamus), dipakai sebagai bobot autocomplete.
+    """
+    np.save(path, np.array([doc_freqs, pagerank_sums], dtype=np.float64).reshape(2, -1))
+
+def write_topic_pagerank(generation_dir, doc_ids, topic_scores):
+    """
+    Menulis skor PageRank per topik ({topik: {page_id: skor}}) sebagai matrix yang barisnya
+    sejajar dengan doc_ids (urutan documents.idx). Halaman tanpa skor bernilai 0.
+    """
+    topics = sorted(topic_scores)
+    matrix = np.zeros((len(doc_ids), len(topics)), dtype=np.float32)
+    for col, topic in enumerate(topics):
+        scores = topic_scores[topic]
+        matrix[:, col] = [scores.get(doc_id, 0.0) for doc_id in doc_ids]
+    np.save(os.path.join(generation_dir, TOPIC_PAGERANK_FILE), matrix)
+    with open(os.path.join(generation_dir, TOPIC_NAMES_FILE), 'w', encoding='utf-8') as f:
+        f.write('\n'.join(topics))
+
+class SearchIndex:
+    """
+    Gabungan kamus term + postings (postings.idx), metadata dokumen beserta PageRank
+    (documents.idx), dan PageRank per topik dari satu generasi indeks.
+    Semua file dibaca lewat mmap (read-only), tidak ada struktur besar yang disalin per proses.
+
+    Objek ini tidak diubah setelah dibuka. Untuk berganti ke generasi baru, buka SearchIndex
+    baru lalu ganti referensinya; request yang masih memakai objek lama tetap aman karena
+    mmap baru dilepas saat objek lama tidak direferensikan lagi.
+    """
+    def __init__(self, generation_dir):
+        self.generation_dir = generation_dir
+        self.generation = os.path.basename(generation_dir)
+        self.postings = IndexReader(os.path.join(generation_dir, POSTINGS_FILE))
+        self.documents = DocStore(os.path.join(generation_dir, DOCUMENTS_FILE))
+        self._term_lengths = np.load(os.path.join(generation_dir, TERM_LENGTHS_FILE), mmap_mode='r')
+        try:
+            self._term_stats = np.load(os.path.join(generation_dir, TERM_STATS_FILE), mmap_mode='r')
+        except OSError:
+            # Indeks dibangun sebelum autocomplete ada
+            self._term_stats = None
+        try:
+            self.topic_pagerank = np.load(os.path.join(generation_dir, TOPIC_PAGERANK_FILE), mmap_mode='r')
+            with open(os.path.join(generation_dir, TOPIC_NAMES_FILE), encoding='utf-8') as f:
+                self.topics = [line.strip() for line in f if line.strip()]
+        except OSError:
+            # PageRank per topik belum pernah dihitung saat indeks dibangun
+            self.topic_pagerank = None
+            self.topics = []
+
+    def close(self):
+        """Menutup semua file. Hanya aman dipanggil jika tidak ada request lain yang memakai indeks ini."""
+        self.postings.close()
+        self.documents.close()
+
+    def doc_freq(self, term):
+        return self.postings.doc_freq(term)
+
+    @property
+    def num_documents(self):
+        return self.postings.num_documents
+
+    def _typo_candidates(self, word):
+        """
+        Term yang panjangnya masih mungkin mencapai TYPO_CUTOFF dengan 'word'.
+        Rasio difflib = 2*M / (len_a + len_b) dengan M <= panjang yang lebih pendek, sehingga
+        term di luar rentang panjang ini pasti di bawah cutoff dan aman untuk dilewati.
+        """
+        lengths, positions = self._term_lengths
+        shortest = math.ceil(TYPO_CUTOFF * len(word) / (2 - TYPO_CUTOFF))
+        longest = math.floor(len(word) * (2 - TYPO_CUTOFF) / TYPO_CUTOFF)
+        start = int(np.searchsorted(lengths, shortest, side='left'))
+        end = int(np.searchsorted(lengths, longest, side='right'))
+        candidates = [self.postings.term_at(int(i)) for i in positions[start:end]]
+        return candidates
+
+    def has_term(self, word):
+        return self.postings.find_term(word) is not None
+
+    def closest_term(self, word):
+        """
+        Term terdekat dengan 'word' menurut difflib, sebagai (rasio, term), atau None jika
+        tidak ada yang mencapai TYPO_CUTOFF. Urutan (rasio, term) sama dengan get_close_matches.
+        """
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(word)
+        best = None
+        for term in self._typo_candidates(word):
+            matcher.set_seq1(term)
+            if matcher.real_quick_ratio() >= TYPO_CUTOFF and matcher.quick_ratio() >= TYPO_CUTOFF:
+                candidate = (matcher.ratio(), term)
+                if candidate[0] >= TYPO_CUTOFF and (best is None or candidate > best):
+                    best = candidate
+        return best
+
+    def correct(self, word):
+        """Koreksi typo: kata yang ada di kosakata dikembalikan apa adanya, selain itu term terdekat."""
+        if not word or self.has_term(word):
+            return word
+        best = self.closest_term(word)
+        return best[1] if best else word
+
+    def match(self, words):
+        """
+        Mengembalikan {doc_id: {kata: frekuensi}} untuk dokumen yang mengandung
+        minimal satu kata (gabungan postings).
+        """
+        matches = {}
+        for word in dict.fromkeys(words):
+            cursor = self.postings.postings(word)
+            if cursor is None:
+                continue
+            for doc_id, frequency in cursor:
+                matches.setdefault(doc_id, {})[word] = frequency
+        return matches
+
+    def document(self, doc_id):
+        """Metadata dokumen (url, judul, cuplikan, panjang, PageRank) atau None."""
+        return self.documents.get(doc_id)
+
+    def candidates(self, words):
+        """
+        Dokumen yang mengandung minimal satu kata, sebagai list (metadata dokumen, {kata: frekuensi})
+        terurut berdasarkan doc id (urutan ini menentukan posisi dokumen dengan skor sama).
+        """
+        return [(self.documents.get(doc_id), frequencies) for doc_id, frequencies in sorted(self.match(words).items())]
+
+    def topic_scores(self, doc_ids, topic_weights):
+        """
+        Kombinasi linear PageRank per topik (bobot topic_weights) untuk doc_ids.
+        Mengembalikan {doc_id: skor} untuk dokumen yang ada di indeks.
+        """
+        if self.topic_pagerank is None:
+            return {}
+        weights = np.array([topic_weights.get(topic, 0.0) for topic in self.topics], dtype=np.float32)
+        if not weights.any():
+            return {}
+        known = [(doc_id, position) for doc_id, position in
+                 ((doc_id, self.documents.position(doc_id)) for doc_id in doc_ids) if position is not None]
+        if not known:
+            return {}
+        combined = self.topic_pagerank[[position for _, position in known]] @ weights
+        return {doc_id: float(score) for (doc_id, _), score in zip(known, combined)}
+
+    def suggest_terms(self, prefix, limit, num_documents=None):
+        """
+        Term berawalan prefix dengan bobot tertinggi, sebagai list (bobot, term) terurut menurun.
+        Bobot = df + num_documents x jumlah PageRank dokumen yang mengandung term, yaitu jumlah
+        dokumen ditambah "massa" PageRank-nya dalam satuan halaman rata-rata (1 / num_documents).
+        Rentang term dicari dengan binary search pada kamus terurut; top-k dipilih dengan numpy.
+        """
+        if self._term_stats is None or not prefix or limit <= 0:
+            return []
+        start, end = self.postings.prefix_range(prefix)
+        if start == end:
+            return []
+        num_documents = num_documents or self.num_documents
+        weights = self._term_stats[0, start:end] + num_documents * self._term_stats[1, start:end]
+        top = np.argpartition(-weights, limit)[:limit] if end - start > limit else np.arange(end - start)
+        # Bobot sama diurutkan menurut term (kamus terurut), sama seperti penggabungan antar shard
+        top = top[np.lexsort((top, -weights[top]))]
+        return [(float(weights[i]), self.postings.term_at(start + int(i))) for i in top]
+
+class ShardedSearchIndex:
+    """
+    Indeks yang dipartisi per dokumen ke beberapa shard (berdasarkan hash URL, lihat shard_for_url).
+    Setiap shard adalah SearchIndex biasa; query dikirim ke setiap shard (scatter) lalu hasilnya
+    digabung (gather). Antarmukanya sama dengan SearchIndex, sehingga aplikasi web tidak perlu
+    tahu apakah indeks di-shard atau tidak.
+
+    Sharding hanya untuk kapasitas (file indeks per shard tetap kecil dan bisa dibangun atau
+    dipindah terpisah), bukan untuk mempercepat query: koreksi typo dan decoding postings adalah
+    kode Python yang memegang GIL, sehingga thread per shard tidak berjalan paralel dan hanya
+    menambah overhead. Karena itu shard dikunjungi berurutan di thread request.
+
+    Hasilnya sama dengan indeks tanpa shard: skor relevansi memakai frekuensi term tanpa IDF,
+    doc_freq dijumlahkan dari semua shard (global), koreksi typo memilih term terdekat dari semua
+    shard, dan normalisasi skor dilakukan setelah kandidat dari semua shard digabung. PageRank di
+    metadata dokumen sudah global karena dihitung dari graf link lengkap sebelum indeks dibangun.
+    """
+    def __init__(self, generation_dir, shard_dirs):
+        self.generation_dir = generation_dir
+        self.generation = os.path.basename(generation_dir)
+        self.shards = []
+        try:
+            for shard_dir in shard_dirs:
+                self.shards.append(SearchIndex(shard_dir))
+        except (OSError, ValueError):
+            self.close()
+            raise
+        self.topics = sorted({topic for shard in self.shards for topic in shard.topics})
+
+    def _scatter(self, function):
+        """Menjalankan function(shard) di semua shard, hasilnya berurutan per shard."""
+        return [function(shard) for shard in self.shards]
+
+    def close(self):
+        for shard in self.shards:
+            shard.close()
+
+    def doc_freq(self, term):
+        return sum(shard.doc_freq(term) for shard in self.shards)
+
+    @property
+    def num_documents(self):
+        return sum(shard.num_documents for shard in self.shards)
+
+    def has_term(self, word):
+        return any(shard.has_term(word) for shard in self.shards)
+
+    def closest_term(self, word):
+        matches = [best for best in self._scatter(lambda shard: shard.closest_term(word)) if best is not None]
+        return max(matches) if matches else None
+
+    def correct(self, word):
+        if not word or self.has_term(word):
+            return word
+        best = self.closest_term(word)
+        return best[1] if best else word
+
+    def match(self, words):
+        matches = {}
+        for shard_matches in self._scatter(lambda shard: shard.match(words)):
+            matches.update(shard_matches)
+        return matches
+
+    def document(self, doc_id):
+        for shard in self.shards:
+            doc = shard.document(doc_id)
+            if doc is not None:
+                return doc
+        return None
+
+    def candidates(self, words):
+        candidates = [candidate for shard_candidates in self._scatter(lambda shard: shard.candidates(words))
+                      for candidate in shard_candidates]
+        # Urutkan berdasarkan doc id seperti SearchIndex.candidates, agar dokumen dengan skor sama
+        # tetap muncul dengan urutan yang sama berapa pun jumlah shard-nya
+        candidates.sort(key=lambda candidate: candidate[0]['id'])
+        return candidates
+
+    def topic_scores(self, doc_ids, topic_weights):
+        scores = {}
+        for shard_scores in self._scatter(lambda shard: shard.topic_scores(doc_ids, topic_weights)):
+            scores.update(shard_scores)
+        return scores
+
+    def suggest_terms(self, prefix, limit, num_documents=None):
+        # Bobot term bersifat aditif antar shard (df dan massa PageRank, dengan jumlah dokumen global)
+        num_documents = num_documents or self.num_documents
+        weights = {}
+        for shard_terms in self._scatter(
+                lambda shard: shard.suggest_terms(prefix, limit * SUGGEST_SHARD_OVERFETCH, num_documents)):
+            for weight, term in shard_terms:
+                weights[term] = weights.get(term, 0.0) + weight
+        ranked = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(weight, term) for term, weight in ranked]
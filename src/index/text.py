@@ -0,0 +1,29 @@
+import re
+
+# Stopwords dasar Bahasa Indonesia (bisa kamu tambahkan)
+STOPWORDS = {
+    "yang", "dan", "di", "ke", "untuk", "dengan", "adalah", "pada",
+    "dari", "sebagai", "oleh", "dalam", "itu", "ini", "atau", "sudah",
+    "akan", "karena", "juga", "bahwa", "oleh", "maka", "dapat", "lebih",
+    "saya", "kami", "mereka", "dia", "anda", "kita", "nya", "hal", "pun",
+    "begitu", "saja", "masih", "tapi", "tetapi", "tidak", "belum", "serta",
+    "guna", "bagi", "setiap", "seluruh", "semua", "lain", "bahkan"
+}
+
+# Panjang cuplikan konten yang ditampilkan di halaman hasil pencarian
+SNIPPET_LENGTH = 300
+
+def tokenize(text):
+    """Memecah teks menjadi kata (huruf kecil) dan membuang stopwords."""
+    return [word for word in re.findall(r'\w+', text.lower()) if word not in STOPWORDS]
+
+def split_title(content):
+    """
+    Memisahkan judul (baris pertama konten) dari isi halaman.
+    Mengembalikan (judul, isi); isi adalah seluruh konten jika tidak ada baris kedua.
+    """
+    content = content or ''
+    content_lines = content.split('\n', 1)
+    title = content_lines[0].strip() if content_lines else ''
+    body = content_lines[1].strip() if len(content_lines) > 1 else content.strip()
+    return title, body
@@ -5,17 +5,40 @@ from urllib.parse import urlparse # Tetap dibutuhkan untuk urlparse jika digunak
 # Tambahkan path ke folder src agar modul-modul di dalamnya bisa diimpor
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'database')))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'pagerank')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), 'index')))
 # Untuk config.py, path-nya harus ke utils yang ada di root project
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
 
 
 from db_manager import DBManager
 # Mengimpor modul crawl_website dan populate_database dihapus karena tidak lagi digunakan di sini.
-from pagerank_calculator import calculate_pagerank
+from pagerank_calculator import calculate_pagerank, calculate_topic_pagerank, load_link_graph
+from pagerank_calculator import pagerank_fingerprint, pagerank_is_current, PAGERANK_FINGERPRINT_STATE
+from search_index import open_current
+from text import tokenize
+from config import METRICS_DIR, INDEX_DIR
+import metrics
 
-def run_pagerank_calculation():
+def run_content_migration():
+    """
+    Memindahkan konten halaman lama (kolom TEXT tanpa kompresi) ke kolom terkompresi.
+    Cukup dijalankan sekali setelah database lama di-upgrade: python src/main.py --migrate
+    """
+    db_manager = DBManager()
+    db_manager.connect()
+    if not db_manager.connection:
+        print("Gagal terhubung ke database. Migrasi konten dibatalkan.")
+        return False
+    try:
+        return db_manager.create_tables() and db_manager.migrate_content()
+    finally:
+        db_manager.close_connection()
+
+def run_pagerank_calculation(force=False):
     """
     Menjalankan proses perhitungan PageRank berdasarkan data yang sudah ada di database.
+    Perhitungan dilewati jika graf link tidak berubah sejak perhitungan terakhir,
+    kecuali force=True.
     """
     db_manager = DBManager()
     db_manager.connect()
@@ -26,9 +49,21 @@ def run_pagerank_calculation():
     try:
         # Pastikan tabel ada.
         db_manager.create_tables()
+
+        # Graf link dibaca dan dibangun sekali untuk sidik jari, PageRank global, dan semua topik
+        link_graph = load_link_graph(db_manager)
+        fingerprint = pagerank_fingerprint(link_graph)
+        if not force and pagerank_is_current(db_manager, fingerprint):
+            print("Graf link tidak berubah sejak perhitungan terakhir. Skor PageRank di database masih berlaku.")
+            return True
         
         print("\n--- Memulai Perhitungan PageRank ---")
-        calculate_pagerank(db_manager)
+        calculate_pagerank(db_manager, link_graph=link_graph)
+        calculate_topic_pagerank(db_manager, link_graph=link_graph)
+        if fingerprint is not None:
+            db_manager.set_state(PAGERANK_FINGERPRINT_STATE, fingerprint)
+        # Simpan snapshot metrik agar bisa dibaca endpoint /metrics aplikasi web
+        metrics.write_textfile(METRICS_DIR, 'pagerank')
 
         print("\nProses perhitungan PageRank selesai.")
         return True # Mengindikasikan keberhasilan
@@ -41,11 +76,12 @@ def run_pagerank_calculation():
 def search_engine_cli():
     """
     Menyediakan antarmuka Command Line Interface (CLI) untuk pencarian.
+    Pencarian memakai indeks hasil src/index/indexer.py (konten di database tersimpan
+    terkompresi, sehingga tidak dipindai per query); hasil diurutkan berdasarkan PageRank.
     """
-    db_manager = DBManager()
-    db_manager.connect()
-    if not db_manager.connection:
-        print("Gagal terhubung ke database. Fungsi pencarian tidak tersedia.")
+    search_index = open_current(INDEX_DIR)
+    if search_index is None:
+        print("Indeks pencarian belum dibangun. Jalankan python src/index/indexer.py terlebih dahulu.")
         return
 
     print("\n--- Selamat Datang di Search Engine Sederhana ---")
@@ -58,7 +94,8 @@ def search_engine_cli():
         if not query:
             continue
 
-        results = db_manager.search_pages_by_keyword(query)
+        results = [doc for doc, _ in search_index.candidates(tokenize(query))]
+        results.sort(key=lambda doc: doc['pagerank_score'] or 0.0, reverse=True)
 
         if results:
             print(f"\nDitemukan {len(results)} hasil untuk '{query}':")
@@ -66,20 +103,24 @@ def search_engine_cli():
                 print(f"  {i+1}. URL: {result['url']}")
                 print(f"    PageRank Score: {result['pagerank_score']:.6f}")
                 # Tampilkan cuplikan konten (misalnya 100 karakter pertama)
-                snippet = result['content'][:100] + ('...' if len(result['content']) > 100 else '')
+                snippet = result['snippet'][:100] + ('...' if len(result['snippet']) > 100 else '')
                 print(f"    Konten: {snippet}")
         else:
             print(f"Tidak ada hasil ditemukan untuk '{query}'.")
 
-    db_manager.close_connection()
     print("\nTerima kasih telah menggunakan search engine.")
 
 if __name__ == '__main__':
     # Konfigurasi URL dan batasan crawling dihapus dari sini karena crawling tidak lagi dilakukan di main.py
+
+    # --migrate hanya memindahkan konten lama ke kolom terkompresi, lalu selesai
+    if '--migrate' in sys.argv[1:]:
+        sys.exit(0 if run_content_migration() else 1)
     
     print("--- Memulai Proses Perhitungan PageRank ---")
     # Panggilan ke fungsi yang baru, tanpa parameter crawling
-    pagerank_successful = run_pagerank_calculation()
+    # Gunakan argumen --force-pagerank untuk tetap menghitung ulang meskipun graf tidak berubah
+    pagerank_successful = run_pagerank_calculation(force='--force-pagerank' in sys.argv[1:])
 
     if pagerank_successful:
         print("\n--- Memulai Antarmuka Pencarian ---")
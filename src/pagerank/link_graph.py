@@ -0,0 +1,71 @@
+import numpy as np
+
+def build_link_graph(pages, links):
+    """
+    Membangun representasi graf link yang sparse dari data halaman dan link di database.
+
+    Edge disimpan terurut berdasarkan halaman target (mirip format CSR), sehingga
+    satu blok halaman target [start, end) selalu menempati potongan edge yang berurutan
+    yaitu sources[indptr[start]:indptr[end]]. Link ganda (sumber dan target sama)
+    hanya dihitung satu kali.
+
+    Args:
+        pages (list): Daftar dictionary halaman, minimal berisi key 'id'.
+        links (list): Daftar tuple (source_page_id, target_page_id).
+
+    Returns:
+        dict: Berisi 'page_ids', 'sources', 'targets', 'indptr', 'out_degrees', dan 'N'.
+    """
+    page_ids = [page['id'] for page in pages]
+    id_to_idx = {page_id: i for i, page_id in enumerate(page_ids)}
+    N = len(page_ids)
+
+    edges = set()
+    for source_id, target_id in links:
+        if source_id in id_to_idx and target_id in id_to_idx:
+            edges.add((id_to_idx[source_id], id_to_idx[target_id]))
+        else:
+            print(f"Warning: Link dari ID {source_id} ke ID {target_id} merujuk ke halaman yang tidak ditemukan di dokumen yang di-crawl. Diabaikan.")
+
+    if edges:
+        edge_array = np.array(sorted(edges, key=lambda edge: (edge[1], edge[0])), dtype=np.int64)
+        sources = np.ascontiguousarray(edge_array[:, 0])
+        targets = np.ascontiguousarray(edge_array[:, 1])
+    else:
+        sources = np.zeros(0, dtype=np.int64)
+        targets = np.zeros(0, dtype=np.int64)
+
+    # indptr[i] adalah posisi edge pertama yang menuju halaman i
+    indptr = np.zeros(N + 1, dtype=np.int64)
+    np.cumsum(np.bincount(targets, minlength=N), out=indptr[1:])
+
+    out_degrees = np.bincount(sources, minlength=N).astype(np.float64)
+
+    return {
+        'page_ids': page_ids,
+        'sources': sources,
+        'targets': targets,
+        'indptr': indptr,
+        'out_degrees': out_degrees,
+        'N': N,
+    }
+
+def link_contributions(pr, out_degrees):
+    """
+    Menghitung kontribusi setiap halaman sumber (pr[j] / out-degree j) dan total
+    skor milik dangling node (halaman tanpa link keluar).
+    """
+    contrib = np.zeros_like(pr)
+    np.divide(pr, out_degrees, out=contrib, where=out_degrees > 0)
+    dangling_sum = float(pr[out_degrees == 0].sum())
+    return contrib, dangling_sum
+
+def block_update(sources, targets, contrib, start, end, lo, hi, damping, base):
+    """
+    Menghitung skor PageRank baru untuk blok halaman target [start, end).
+    lo dan hi adalah batas potongan edge milik blok tersebut (indptr[start], indptr[end]).
+    base adalah bagian teleport + dangling, berupa skalar (teleport seragam) atau
+    array sepanjang end - start (teleport personalisasi).
+    """
+    incoming = np.bincount(targets[lo:hi] - start, weights=contrib[sources[lo:hi]], minlength=end - start)
+    return damping * incoming + base
@@ -1,6 +1,9 @@
 import numpy as np
+import scipy.sparse as sp
+import hashlib
 import sys
 import os
+import time
 
 # Tambahkan path ke folder database agar db_manager bisa diimpor
 # os.path.dirname(__file__) -> src/pagerank
@@ -9,120 +12,315 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database')))
 # Tambahkan path ke folder utils agar config bisa diimpor
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'utils')))
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
 
 from db_manager import DBManager
 # Pastikan file config.py ada di folder utils/
 # dan mendefinisikan PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS, PAGERANK_TOLERANCE
 from config import PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS, PAGERANK_TOLERANCE
+from config import PAGERANK_NUM_WORKERS, PAGERANK_PARALLEL_MIN_PAGES, PAGERANK_TOPICS, METRICS_DIR
+from link_graph import build_link_graph, link_contributions, block_update
+from parallel_pagerank import parallel_power_iteration
+import metrics
 
-def calculate_pagerank(db_manager):
+# Metrik perhitungan PageRank (ditulis ke METRICS_DIR oleh pemanggil batch, lihat main.py)
+ITERATIONS_TOTAL = metrics.counter('pagerank_iterations_total', 'Jumlah iterasi power iteration per mode.')
+ITERATION_DURATION = metrics.histogram('pagerank_iteration_duration_seconds', 'Durasi satu iterasi power iteration per mode.')
+STAGE_DURATION = metrics.histogram('pagerank_stage_duration_seconds', 'Durasi tahap perhitungan PageRank.',
+                                   buckets=(0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0))
+PAGES_GAUGE = metrics.gauge('pagerank_pages', 'Jumlah halaman pada perhitungan PageRank terakhir.')
+LINKS_GAUGE = metrics.gauge('pagerank_links', 'Jumlah link unik pada perhitungan PageRank terakhir.')
+
+def power_iteration(graph, damping, max_iterations, tolerance, teleport=None):
+    """
+    Menjalankan power iteration PageRank pada satu core.
+    teleport=None berarti teleport seragam; jika diisi, vektor teleport (jumlahnya 1)
+    juga menerima skor dari dangling node (PageRank personalisasi).
+
+    Returns:
+        tuple: (vektor PageRank, jumlah iterasi, list waktu per iterasi dalam detik)
+    """
+    N = graph['N']
+    if teleport is None:
+        teleport = np.full(N, 1.0 / N)
+    pr = teleport.copy()
+    iteration_times = []
+
+    print(f"Memulai iterasi PageRank dengan {N} halaman...")
+    for i in range(max_iterations):
+        iteration_start = time.perf_counter()
+        contrib, dangling_sum = link_contributions(pr, graph['out_degrees'])
+        base = (damping * dangling_sum + (1 - damping) * pr.sum()) * teleport
+        pr_new = block_update(graph['sources'], graph['targets'], contrib, 0, N, 0, len(graph['sources']), damping, base)
+        # Hitung perubahan (norma L1) untuk cek konvergensi
+        change = np.sum(np.abs(pr_new - pr))
+        pr = pr_new
+        iteration_times.append(time.perf_counter() - iteration_start)
+        if change < tolerance:
+            print(f"Konvergen pada iterasi {i+1}.")
+            break
+    else:
+        print(f"Mencapai maksimum iterasi ({max_iterations}) tanpa konvergensi penuh.")
+    return pr, len(iteration_times), iteration_times
+
+def batched_power_iteration(graph, damping, max_iterations, tolerance, teleports):
+    """
+    Power iteration untuk beberapa vektor teleport sekaligus (satu kolom per topik), sehingga
+    setiap iterasi hanya satu kali melewati edge graf untuk semua topik. Iterasi berhenti saat
+    perubahan L1 semua kolom di bawah tolerance.
+
+    Returns:
+        tuple: (matriks PageRank N x jumlah_topik, jumlah iterasi, list waktu per iterasi dalam detik)
+    """
+    N = graph['N']
+    out_degrees = graph['out_degrees']
+    inv_out = np.zeros(N, dtype=np.float64)
+    np.divide(1.0, out_degrees, out=inv_out, where=out_degrees > 0)
+    dangling = out_degrees == 0
+    # Matriks transisi sparse: M[target, source] = 1 / out-degree source
+    transition = sp.csr_matrix((inv_out[graph['sources']], (graph['targets'], graph['sources'])), shape=(N, N))
+
+    pr = teleports.copy()
+    iteration_times = []
+    print(f"Memulai iterasi PageRank dengan {N} halaman untuk {teleports.shape[1]} topik...")
+    for i in range(max_iterations):
+        iteration_start = time.perf_counter()
+        base = damping * pr[dangling].sum(axis=0) + (1 - damping) * pr.sum(axis=0)
+        pr_new = damping * (transition @ pr) + teleports * base
+        change = np.abs(pr_new - pr).sum(axis=0).max()
+        pr = pr_new
+        iteration_times.append(time.perf_counter() - iteration_start)
+        if change < tolerance:
+            print(f"Konvergen pada iterasi {i+1}.")
+            break
+    else:
+        print(f"Mencapai maksimum iterasi ({max_iterations}) tanpa konvergensi penuh.")
+    return pr, len(iteration_times), iteration_times
+
+def solve_pagerank(graph, num_workers=None, teleport=None):
+    """
+    Memilih power iteration satu core atau paralel sesuai jumlah worker dan ukuran graf,
+    lalu mengembalikan vektor PageRank yang sudah dinormalisasi (jumlahnya 1).
+    """
+    if num_workers is None:
+        num_workers = PAGERANK_NUM_WORKERS
+    if num_workers <= 0:
+        num_workers = os.cpu_count() or 1
+
+    if num_workers > 1 and graph['N'] >= PAGERANK_PARALLEL_MIN_PAGES:
+        mode = 'parallel'
+        pr, iterations, iteration_times = parallel_power_iteration(graph, PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS,
+                                                                   PAGERANK_TOLERANCE, num_workers, teleport=teleport)
+    else:
+        mode = 'serial'
+        pr, iterations, iteration_times = power_iteration(graph, PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS,
+                                                          PAGERANK_TOLERANCE, teleport=teleport)
+
+    ITERATIONS_TOTAL.inc(iterations, mode=mode)
+    for seconds in iteration_times:
+        ITERATION_DURATION.observe(seconds, mode=mode)
+
+    # Normalisasi terakhir (pastikan jumlah semua PR = 1)
+    return pr / np.sum(pr)
+
+def solve_topic_pagerank(graph, teleports, num_workers=None):
+    """
+    Menghitung PageRank untuk setiap kolom teleports (N x jumlah_topik) dan mengembalikan
+    matriks hasil yang setiap kolomnya sudah dinormalisasi. Graf besar dengan beberapa worker
+    diselesaikan per topik secara paralel; selain itu semua topik diiterasi bersama.
+    """
+    if num_workers is None:
+        num_workers = PAGERANK_NUM_WORKERS
+    if num_workers <= 0:
+        num_workers = os.cpu_count() or 1
+    if num_workers > 1 and graph['N'] >= PAGERANK_PARALLEL_MIN_PAGES:
+        return np.column_stack([solve_pagerank(graph, num_workers, teleport=teleports[:, topic])
+                                for topic in range(teleports.shape[1])])
+
+    pr, iterations, iteration_times = batched_power_iteration(graph, PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS,
+                                                              PAGERANK_TOLERANCE, teleports)
+    ITERATIONS_TOTAL.inc(iterations, mode='batched')
+    for seconds in iteration_times:
+        ITERATION_DURATION.observe(seconds, mode='batched')
+    return pr / pr.sum(axis=0)
+
+# Nama entri engine_state yang menyimpan sidik jari graf saat skor PageRank terakhir dihitung
+PAGERANK_FINGERPRINT_STATE = 'pagerank_graph_fingerprint'
+# Nama entri engine_state yang berganti setiap kali skor PageRank (global atau per topik) disimpan,
+# sehingga versi korpus aplikasi web (ETag /search) ikut berganti
+PAGERANK_SCORES_STATE = 'pagerank_scores_version'
+
+def mark_scores_updated(db_manager):
+    """Menandai bahwa skor PageRank di database baru saja diganti."""
+    db_manager.set_state(PAGERANK_SCORES_STATE, f"{time.time():.6f}")
+
+def pagerank_fingerprint(link_graph):
+    """
+    Menghitung sidik jari graf yang benar-benar dipakai untuk perhitungan (hasil load_link_graph:
+    id dan URL halaman serta link unik antar halaman yang ada) digabung dengan parameter PageRank
+    dan definisi topik. Jika sama dengan yang tersimpan, skor di database masih berlaku.
+    Mengembalikan None jika tidak ada graf.
+    """
+    if link_graph is None:
+        return None
+    graph = link_graph['graph']
+    digest = hashlib.sha1()
+    # Tidak bergantung pada urutan halaman dari database: halaman dan edge diurutkan berdasarkan id
+    for page in sorted(link_graph['pages'], key=lambda page: page['id']):
+        digest.update(f"{page['id']} {page['url']}\n".encode('utf-8'))
+    page_ids = np.asarray(graph['page_ids'], dtype=np.int64)
+    source_ids = page_ids[graph['sources']]
+    target_ids = page_ids[graph['targets']]
+    order = np.lexsort((target_ids, source_ids))
+    digest.update(np.ascontiguousarray(np.stack([source_ids[order], target_ids[order]], axis=1)).tobytes())
+    params = repr((PAGERANK_DAMPING_FACTOR, PAGERANK_MAX_ITERATIONS, PAGERANK_TOLERANCE, sorted(PAGERANK_TOPICS.items())))
+    digest.update(f"|{params}".encode('utf-8'))
+    return digest.hexdigest()
+
+def pagerank_is_current(db_manager, fingerprint):
+    """Mengembalikan True jika skor PageRank tersimpan dihitung dari graf dengan sidik jari ini."""
+    return fingerprint is not None and db_manager.get_state(PAGERANK_FINGERPRINT_STATE) == fingerprint
+
+def _end_stage(name, stage_start):
+    """Mencatat durasi tahap ke metrik dan mengembalikan waktu mulai tahap berikutnya."""
+    now = time.perf_counter()
+    STAGE_DURATION.observe(now - stage_start, stage=name)
+    return now
+
+def topic_teleport_vector(pages, url_patterns):
+    """
+    Membangun vektor teleport untuk satu topik: peluang teleport dibagi rata ke halaman
+    yang URL-nya mengandung salah satu pola. Mengembalikan None jika tidak ada yang cocok.
+    """
+    patterns = [pattern.lower() for pattern in url_patterns]
+    in_topic = np.array([any(pattern in page['url'].lower() for pattern in patterns) for page in pages],
+                        dtype=np.float64)
+    if not in_topic.any():
+        return None
+    return in_topic / in_topic.sum()
+
+def load_link_graph(db_manager):
+    """
+    Membaca halaman (tanpa konten) dan link dari database lalu membangun graf link sparse
+    (edge terurut berdasarkan halaman target). Hasilnya bisa dipakai bersama oleh
+    calculate_pagerank dan calculate_topic_pagerank agar graf hanya dibaca dan dibangun sekali.
+
+    Returns:
+        dict: Berisi 'pages', 'links', dan 'graph', atau None jika tidak ada halaman.
+    """
+    stage_start = time.perf_counter()
+    # Tanpa konten halaman, karena graf link hanya butuh id dan url
+    pages = db_manager.get_all_documents(include_content=False)
+    links = db_manager.get_links()
+    stage_start = _end_stage('load', stage_start)
+    if not pages:
+        return None
+
+    # Matriks transisi dan matriks Google tidak dibentuk secara eksplisit:
+    # G * pr = alpha * (M_link * pr + skor_dangling / N) + (1 - alpha) * sum(pr) / N
+    graph = build_link_graph(pages, links)
+    PAGES_GAUGE.set(graph['N'])
+    LINKS_GAUGE.set(len(graph['sources']))
+    _end_stage('build', stage_start)
+    return {'pages': pages, 'links': links, 'graph': graph}
+
+def calculate_pagerank(db_manager, num_workers=None, link_graph=None):
     """
     Menghitung skor PageRank untuk semua halaman dalam database.
 
     Args:
         db_manager (DBManager): Instance dari DBManager untuk interaksi database.
+        num_workers (int, optional): Jumlah proses untuk power iteration paralel.
+            None memakai PAGERANK_NUM_WORKERS dari config, 0 memakai semua core.
+        link_graph (dict, optional): Hasil load_link_graph(); dibaca dari database jika None.
 
     Returns:
         dict: Kamus berisi {page_id: pagerank_score}.
     """
     print("\n--- Memulai Perhitungan PageRank ---")
 
-    # Menggunakan db_manager.get_all_documents() sesuai definisi di db_manager.py
-    pages = db_manager.get_all_documents()
-    # Menggunakan db_manager.get_links() sesuai definisi di db_manager.py
-    links = db_manager.get_links()
-
-    if not pages:
+    if link_graph is None:
+        link_graph = load_link_graph(db_manager)
+    if link_graph is None:
         print("Tidak ada halaman di database untuk dihitung PageRank. Proses dihentikan.")
         return {}
 
-    N = len(pages)
-    if N == 0:
-        print("Jumlah halaman nol. Tidak ada PageRank untuk dihitung.")
-        return {}
-
-    # Buat pemetaan ID database ke indeks matriks (0-N-1) dan sebaliknya
-    # Pastikan 'id' ada di setiap dictionary 'page'
-    id_to_idx = {page['id']: i for i, page in enumerate(pages)}
-    idx_to_id = {i: page['id'] for i, page in enumerate(pages)}
-
-    # Inisialisasi matriks transisi A (Adjacency Matrix)
-    # A[i, j] = 1 jika ada link dari j ke i (j adalah sumber, i adalah target)
-    A = np.zeros((N, N))
-
-    # Hitung out-degree (jumlah link keluar) untuk setiap halaman
-    out_degrees = np.zeros(N)
-
-    # Catatan: Fungsi get_links() di db_manager.py mengembalikan list of tuples (source_id, target_id)
-    # Anda perlu menyesuaikan cara mengakses elemen link di sini.
-    for source_id, target_id in links: # Ubah cara mengakses link
-        # Pastikan ID sumber dan target ada di pemetaan
-        if source_id in id_to_idx and target_id in id_to_idx:
-            source_idx = id_to_idx[source_id]
-            target_idx = id_to_idx[target_id]
-            
-            # Matriks A: A[i][j] berarti link dari j ke i
-            # Untuk PageRank, kolom j merepresentasikan halaman sumber
-            # Jadi, A[target_idx][source_idx] = 1
-            A[target_idx, source_idx] = 1
-            out_degrees[source_idx] += 1
-        else:
-            # Ini akan memberikan peringatan jika ada link ke halaman yang tidak ada di pages
-            print(f"Warning: Link dari ID {source_id} ke ID {target_id} merujuk ke halaman yang tidak ditemukan di dokumen yang di-crawl. Diabaikan.")
-
-    # Bangun Matriks Transisi M
-    # M[i, j] = 1 / (out-degree of j) jika ada link dari j ke i
-    M = np.zeros((N, N))
-    for j in range(N): # Iterasi kolom (halaman sumber)
-        if out_degrees[j] > 0:
-            # Normalisasi kolom jika ada link keluar
-            M[:, j] = A[:, j] / out_degrees[j]
-        else:
-            # Jika dangling node (halaman tanpa link keluar),
-            # distribusikan probabilitas secara merata ke semua node.
-            # Ini penting agar matriks tetap stokastik.
-            M[:, j] = 1.0 / N
-
-    # Bangun Matriks Google (G) dengan Damping Factor
-    # G = alpha * M + (1 - alpha) * (1/N) * J
-    # J adalah matriks N x N yang semua elemennya 1
-    # Matriks E di sini adalah matriks N x N yang semua elemennya 1/N
-    E = np.full((N, N), 1.0 / N)
-    G = PAGERANK_DAMPING_FACTOR * M + (1 - PAGERANK_DAMPING_FACTOR) * E
-
-    # Inisialisasi vektor PageRank
-    # PR_0 = vektor kolom yang semua elemennya 1/N
-    pr = np.full((N, 1), 1.0 / N)
-
-    print(f"Memulai iterasi PageRank dengan {N} halaman...")
-    # Power Iteration
-    for i in range(PAGERANK_MAX_ITERATIONS):
-        pr_new = np.dot(G, pr)
-        # Hitung perubahan (norma L1) untuk cek konvergensi
-        change = np.sum(np.abs(pr_new - pr))
-        # print(f"   Iterasi {i+1}: Perubahan = {change:.8f}") # Untuk debug, bisa di-comment
-        if change < PAGERANK_TOLERANCE:
-            print(f"Konvergen pada iterasi {i+1}.")
-            break
-        pr = pr_new
-    else:
-        print(f"Mencapai maksimum iterasi ({PAGERANK_MAX_ITERATIONS}) tanpa konvergensi penuh.")
+    graph = link_graph['graph']
+    N = graph['N']
+    idx_to_id = dict(enumerate(graph['page_ids']))
+    stage_start = time.perf_counter()
 
-    # Normalisasi terakhir (pastikan jumlah semua PR = 1, meskipun sudah dinormalisasi di G)
-    pr = pr / np.sum(pr)
+    pr = solve_pagerank(graph, num_workers)
+    stage_start = _end_stage('solve', stage_start)
 
     # Simpan hasil PageRank ke database
     pagerank_results = {}
     print("\n--- Menyimpan Hasil PageRank ke Database ---")
     for i in range(N):
         page_id = idx_to_id[i]
-        score = float(pr[i][0])
+        score = float(pr[i])
         db_manager.update_pagerank_score(page_id, score)
         pagerank_results[page_id] = score
+    mark_scores_updated(db_manager)
+    _end_stage('writeback', stage_start)
     
     print("Perhitungan PageRank selesai dan hasil disimpan ke database.")
     return pagerank_results
 
+def calculate_topic_pagerank(db_manager, topics=None, num_workers=None, link_graph=None):
+    """
+    Menghitung PageRank per topik (topic-sensitive PageRank) untuk setiap teleport set
+    yang didefinisikan di PAGERANK_TOPICS, lalu menyimpannya ke tabel topic_pagerank.
+    Vektor-vektor ini menjadi basis yang dikombinasikan secara linear saat pencarian,
+    sehingga tidak ada perhitungan PageRank per query.
+
+    Args:
+        db_manager (DBManager): Instance dari DBManager untuk interaksi database.
+        topics (dict, optional): {nama_topik: {'url_patterns': [...], ...}}. Default PAGERANK_TOPICS.
+        num_workers (int, optional): Sama seperti pada calculate_pagerank.
+        link_graph (dict, optional): Hasil load_link_graph(); dibaca dari database jika None.
+
+    Returns:
+        dict: Kamus berisi {nama_topik: {page_id: skor}}.
+    """
+    if topics is None:
+        topics = PAGERANK_TOPICS
+
+    print("\n--- Memulai Perhitungan PageRank per Topik ---")
+    if link_graph is None:
+        link_graph = load_link_graph(db_manager)
+    if link_graph is None:
+        print("Tidak ada halaman di database untuk dihitung PageRank per topik. Proses dihentikan.")
+        return {}
+
+    pages = link_graph['pages']
+    graph = link_graph['graph']
+    teleports = {}
+    for topic, topic_config in topics.items():
+        teleport = topic_teleport_vector(pages, topic_config.get('url_patterns', []))
+        if teleport is None:
+            print(f"Warning: Tidak ada halaman yang cocok untuk topik '{topic}'. Topik dilewati.")
+            # Skor lama topik ini dihapus agar tidak ikut dipakai pada ranking yang dipersonalisasi
+            db_manager.replace_topic_pagerank_scores(topic, {})
+            continue
+        print(f"Topik '{topic}': {int(np.count_nonzero(teleport))} halaman di teleport set.")
+        teleports[topic] = teleport
+
+    topic_results = {}
+    if teleports:
+        stage_start = time.perf_counter()
+        pr = solve_topic_pagerank(graph, np.column_stack(list(teleports.values())), num_workers)
+        stage_start = _end_stage('topic_solve', stage_start)
+        for column, topic in enumerate(teleports):
+            scores = {page_id: float(score) for page_id, score in zip(graph['page_ids'], pr[:, column])}
+            db_manager.replace_topic_pagerank_scores(topic, scores)
+            topic_results[topic] = scores
+        _end_stage('topic_writeback', stage_start)
+    mark_scores_updated(db_manager)
+
+    print("Perhitungan PageRank per topik selesai dan hasil disimpan ke database.")
+    return topic_results
+
 # Blok __main__ ini untuk testing standalone.
 # Akan dipanggil dari main.py atau app.py dalam skenario aplikasi penuh.
 if __name__ == '__main__':
@@ -133,17 +331,18 @@ if __name__ == '__main__':
         print("Gagal terhubung ke database. Tidak dapat melakukan pengujian PageRank mandiri.")
     else:
         # Untuk pengujian, pastikan ada data di DB (jalankan src/crawler/simple_crawler.py lebih dulu)
-        pages_in_db = db_manager.get_all_documents() # Menggunakan get_all_documents
+        pages_in_db = db_manager.get_all_documents(include_content=False) # Menggunakan get_all_documents
         if not pages_in_db:
             print("Database kosong. Mohon jalankan 'simple_crawler.py' terlebih dahulu untuk mengisi data.")
         else:
             print(f"Ditemukan {len(pages_in_db)} halaman di database.")
             pageranks = calculate_pagerank(db_manager)
+            metrics.write_textfile(METRICS_DIR, 'pagerank')
             print("\nHasil PageRank:")
             # Ambil kembali data pages dari database untuk mendapatkan URL terbaru
             # ini penting karena data 'pages_in_db' di awal bisa jadi tidak update
             # jika pagerank dihitung di run_pagerank_calculation() terpisah
-            updated_pages = db_manager.get_all_documents()
+            updated_pages = db_manager.get_all_documents(include_content=False)
             for page_id, score in pageranks.items():
                 page_info = next((p for p in updated_pages if p['id'] == page_id), None)
                 url = page_info['url'] if page_info else f"ID: {page_id}"
@@ -0,0 +1,177 @@
+import numpy as np
+import os
+import sys
+import time
+import multiprocessing
+from multiprocessing import shared_memory
+from threading import BrokenBarrierError
+
+sys.path.append(os.path.abspath(os.path.dirname(__file__)))
+
+# Kolom array 'partials' (per buffer dan per worker): total skor dangling node di blok worker,
+# total skor blok, dan perubahan L1 blok pada iterasi tersebut
+_DANGLING, _TOTAL, _CHANGE = 0, 1, 2
+
+def _create_shared_array(source):
+    """Menyalin array numpy ke segmen shared memory baru."""
+    shm = shared_memory.SharedMemory(create=True, size=max(source.nbytes, 1))
+    array = np.ndarray(source.shape, dtype=source.dtype, buffer=shm.buf)
+    array[:] = source
+    return shm, array
+
+def _attach(specs):
+    """Menempelkan (attach) proses ini ke segmen shared memory yang dibuat proses utama."""
+    segments = []
+    arrays = {}
+    for key, (name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=name)
+        segments.append(shm)
+        arrays[key] = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return segments, arrays
+
+def _run_block(worker, block, a, barrier, damping, max_iterations, tolerance):
+    """
+    Iterasi untuk satu blok halaman target [start, end). Setiap iterasi worker membaca vektor
+    kontribusi dan jumlah parsial iterasi sebelumnya dari shared memory, lalu menulis sendiri
+    skor baru bloknya, kontribusi blok untuk iterasi berikutnya, dan jumlah parsialnya.
+    Buffer rank, kontribusi, dan parsial dipakai bergantian (ganjil/genap), sehingga cukup
+    satu barrier per iterasi. Semua worker membaca parsial yang sama, jadi keputusan
+    konvergensi mereka selalu sama tanpa koordinasi tambahan.
+    """
+    start, end, lo, hi = block
+    sources = a['sources'][lo:hi]
+    targets = a['targets'][lo:hi] - start
+    teleport = a['teleport'][start:end]
+    inv_out = a['inv_out'][start:end]
+    dangling = a['dangling'][start:end]
+    iteration_start = time.perf_counter()
+    for i in range(max_iterations):
+        current, following = i % 2, (i + 1) % 2
+        partials = a['partials'][current]
+        base_coef = damping * partials[:, _DANGLING].sum() + (1 - damping) * partials[:, _TOTAL].sum()
+
+        pr_new = damping * np.bincount(targets, weights=a['contrib'][current][sources], minlength=end - start)
+        pr_new += base_coef * teleport
+        a['pr'][following][start:end] = pr_new
+        a['contrib'][following][start:end] = pr_new * inv_out
+        a['partials'][following][worker] = (pr_new[dangling].sum(), pr_new.sum(),
+                                            np.abs(pr_new - a['pr'][current][start:end]).sum())
+        try:
+            barrier.wait()
+        except BrokenBarrierError:
+            # Worker lain gagal; proses utama yang melaporkan error
+            return
+
+        if worker == 0:
+            now = time.perf_counter()
+            a['iteration_times'][i] = now - iteration_start
+            iteration_start = now
+        if a['partials'][following][:, _CHANGE].sum() < tolerance:
+            return
+
+def _worker(worker, block, specs, barrier, damping, max_iterations, tolerance):
+    """Proses worker persisten: memiliki satu blok halaman target selama seluruh iterasi."""
+    segments, arrays = _attach(specs)
+    try:
+        _run_block(worker, block, arrays, barrier, damping, max_iterations, tolerance)
+    finally:
+        # View numpy ke shared memory harus dilepas sebelum segmen ditutup
+        arrays.clear()
+        for shm in segments:
+            shm.close()
+
+def partition_blocks(indptr, num_blocks):
+    """
+    Membagi halaman target menjadi blok-blok berurutan dengan jumlah edge yang kurang lebih sama.
+    Mengembalikan list tuple (start, end, lo, hi).
+    """
+    N = len(indptr) - 1
+    num_blocks = max(1, min(num_blocks, N))
+    # Bobot setiap blok = jumlah edge + jumlah node, agar blok tanpa edge tetap terbagi rata
+    work = indptr + np.arange(N + 1)
+    cut_points = np.searchsorted(work, np.linspace(0, work[-1], num_blocks + 1))
+    boundaries = np.unique(np.concatenate(([0], np.clip(cut_points, 0, N), [N])))
+    return [(int(start), int(end), int(indptr[start]), int(indptr[end]))
+            for start, end in zip(boundaries[:-1], boundaries[1:])]
+
+def parallel_power_iteration(graph, damping, max_iterations, tolerance, num_workers, teleport=None):
+    """
+    Menjalankan power iteration PageRank secara paralel dengan worker proses yang persisten.
+
+    Graf dipartisi berdasarkan blok halaman target dan setiap worker memiliki satu blok selama
+    seluruh iterasi (lihat _worker). Graf, vektor teleport, vektor rank, vektor kontribusi,
+    dan jumlah parsial disimpan di multiprocessing.shared_memory; proses utama hanya menunggu
+    worker selesai, sehingga tidak ada bagian serial maupun IPC per iterasi selain barrier.
+    teleport=None berarti teleport seragam (PageRank biasa).
+
+    Returns:
+        tuple: (vektor PageRank, jumlah iterasi, list waktu per iterasi dalam detik)
+    """
+    N = graph['N']
+    out_degrees = graph['out_degrees']
+    blocks = partition_blocks(graph['indptr'], num_workers)
+    if teleport is None:
+        teleport = np.full(N, 1.0 / N)
+
+    inv_out = np.zeros(N, dtype=np.float64)
+    np.divide(1.0, out_degrees, out=inv_out, where=out_degrees > 0)
+    dangling = out_degrees == 0
+
+    pr = np.zeros((2, N), dtype=np.float64)
+    pr[0] = teleport
+    contrib = np.zeros((2, N), dtype=np.float64)
+    contrib[0] = teleport * inv_out
+    partials = np.zeros((2, len(blocks), 3), dtype=np.float64)
+    for worker, (start, end, _, _) in enumerate(blocks):
+        partials[0, worker] = (teleport[start:end][dangling[start:end]].sum(), teleport[start:end].sum(), 0.0)
+
+    segments = []
+    processes = []
+    try:
+        arrays = {}
+        for key, source in (('sources', graph['sources']),
+                            ('targets', graph['targets']),
+                            ('teleport', teleport),
+                            ('inv_out', inv_out),
+                            ('dangling', dangling),
+                            ('pr', pr),
+                            ('contrib', contrib),
+                            ('partials', partials),
+                            ('iteration_times', np.full(max_iterations, np.nan))):
+            shm, arrays[key] = _create_shared_array(source)
+            segments.append(shm)
+        specs = {key: (shm.name, arrays[key].shape, arrays[key].dtype)
+                 for key, shm in zip(arrays.keys(), segments)}
+
+        print(f"Memulai iterasi PageRank paralel dengan {N} halaman, {len(blocks)} blok, {len(blocks)} worker...")
+        barrier = multiprocessing.Barrier(len(blocks))
+        for worker, block in enumerate(blocks):
+            process = multiprocessing.Process(target=_worker, args=(worker, block, specs, barrier, damping,
+                                                                   max_iterations, tolerance))
+            process.start()
+            processes.append(process)
+        for process in processes:
+            # Jika satu worker mati, worker lain akan menunggu di barrier selamanya: batalkan barrier
+            while process.is_alive():
+                process.join(0.1)
+                if any(other.exitcode not in (None, 0) for other in processes):
+                    barrier.abort()
+        if any(process.exitcode != 0 for process in processes):
+            raise RuntimeError("Worker PageRank paralel berhenti dengan error.")
+
+        iteration_times = [float(t) for t in arrays['iteration_times'] if not np.isnan(t)]
+        iterations = len(iteration_times)
+        result = arrays['pr'][iterations % 2].copy()
+        if arrays['partials'][iterations % 2][:, _CHANGE].sum() < tolerance:
+            print(f"Konvergen pada iterasi {iterations}.")
+        else:
+            print(f"Mencapai maksimum iterasi ({max_iterations}) tanpa konvergensi penuh.")
+        return result, iterations, iteration_times
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        arrays = None
+        for shm in segments:
+            shm.close()
+            shm.unlink()
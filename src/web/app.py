@@ -1,31 +1,97 @@
-from flask import Flask, render_template, request, g # Import 'g' untuk manajemen koneksi
+from flask import Flask, render_template, request, g, Response, jsonify # Import 'g' untuk manajemen koneksi
 import os
 import sys
+import glob
 import traceback
 import re
 import difflib # Diperlukan untuk perbaikan typo
+from collections import Counter
+import logging
+import threading
+import time
+from hashlib import sha1
+import numpy as np
 
 # Tambahkan path ke folder src agar modul-modul di dalamnya bisa diimpor
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'database')))
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'utils')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'index')))
 
 
-from db_manager import DBManager # Import DBManager yang sudah kita buat
+from db_manager import DBManager, content_hash # Import DBManager yang sudah kita buat
+from config import (PAGERANK_TOPICS, TOPIC_PAGERANK_CACHE_SECONDS, LOG_LEVEL, METRICS_DIR, INDEX_DIR,
+                    INDEX_RELOAD_CHECK_SECONDS, WEB_PROCESSES, HTTP_CACHE_MAX_AGE, RENDERED_PAGE_CACHE_SIZE,
+                    CORPUS_VERSION_CHECK_SECONDS, SUGGEST_LIMIT, SUGGEST_MAX_LIMIT, WEB_METRICS_DIR,
+                    METRICS_FLUSH_SECONDS, SEARCH_SCAN_BATCH_SIZE)
+from text import STOPWORDS, tokenize, split_title
+from search_index import open_current, current_generation
+from lru_cache import LRUCache
+import metrics
+
+logger = logging.getLogger(__name__)
 
 # Konfigurasi Flask agar tahu di mana mencari template dan file statis
 app = Flask(__name__,
             template_folder=os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'templates')),
             static_folder=os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', 'static')))
 
-# Stopwords dasar Bahasa Indonesia (bisa kamu tambahkan)
-stopwords = {
-    "yang", "dan", "di", "ke", "untuk", "dengan", "adalah", "pada",
-    "dari", "sebagai", "oleh", "dalam", "itu", "ini", "atau", "sudah",
-    "akan", "karena", "juga", "bahwa", "oleh", "maka", "dapat", "lebih",
-    "saya", "kami", "mereka", "dia", "anda", "kita", "nya", "hal", "pun",
-    "begitu", "saja", "masih", "tapi", "tetapi", "tidak", "belum", "serta",
-    "guna", "bagi", "setiap", "seluruh", "semua", "lain", "bahkan"
-}
+# Stopwords dasar Bahasa Indonesia, dipakai bersama dengan indexer (lihat src/index/text.py)
+stopwords = STOPWORDS
+
+# Indeks pencarian hasil src/index/indexer.py (read-only, di-mmap, dipakai bersama oleh semua
+# thread di proses ini). Setiap INDEX_RELOAD_CHECK_SECONDS file CURRENT diperiksa; jika
+# generasinya berganti, indeks baru dibuka dan referensinya ditukar tanpa restart.
+_search_index = {'index_dir': INDEX_DIR, 'index': None, 'generation': None, 'checked_at': None}
+_search_index_lock = threading.Lock()
+
+# Metrik aplikasi web, ditampilkan di endpoint /metrics
+REQUESTS_TOTAL = metrics.counter('search_requests_total', 'Jumlah request per endpoint dan status HTTP.')
+REQUEST_DURATION = metrics.histogram('search_request_duration_seconds', 'Durasi request per endpoint.')
+STAGE_DURATION = metrics.histogram('search_stage_duration_seconds', 'Durasi setiap tahap pipeline per endpoint.')
+DOCUMENTS_SCANNED = metrics.counter('search_documents_scanned_total', 'Jumlah dokumen yang diperiksa oleh /search.')
+CANDIDATES_TOTAL = metrics.counter('search_candidates_total', 'Jumlah dokumen kandidat yang lolos filter /search.')
+INDEX_RELOADS = metrics.counter('search_index_reloads_total', 'Jumlah pergantian generasi indeks pencarian.')
+VIEW_PAGE_CACHE = metrics.counter('view_page_cache_total', 'Hasil pemeriksaan cache render /view_page (hit, revalidated, miss).')
+NOT_MODIFIED = metrics.counter('http_not_modified_total', 'Jumlah respons 304 Not Modified per endpoint.')
+
+# Metrik disimpan per proses; dengan beberapa worker gunicorn setiap worker menulis snapshot-nya
+# sendiri ke WEB_METRICS_DIR dari thread latar setiap METRICS_FLUSH_SECONDS, dan /metrics menggabungkannya
+_metrics_flusher = {'pid': None}
+_metrics_flusher_lock = threading.Lock()
+
+def write_worker_metrics():
+    """Menulis snapshot metrik proses ini ke WEB_METRICS_DIR/web-<pid>.prom."""
+    try:
+        metrics.write_textfile(WEB_METRICS_DIR, f"web-{os.getpid()}")
+    except OSError as e:
+        logger.warning("Gagal menulis snapshot metrik worker: %s", e)
+
+def _flush_worker_metrics_loop():
+    while True:
+        time.sleep(METRICS_FLUSH_SECONDS)
+        write_worker_metrics()
+
+def start_metrics_flusher():
+    """Menyalakan thread penulis snapshot sekali per proses (thread tidak ikut tersalin saat fork)."""
+    if _metrics_flusher['pid'] == os.getpid():
+        return
+    with _metrics_flusher_lock:
+        if _metrics_flusher['pid'] != os.getpid():
+            _metrics_flusher['pid'] = os.getpid()
+            threading.Thread(target=_flush_worker_metrics_loop, name='metrics-flusher', daemon=True).start()
+
+# Cache HTML /view_page yang sudah dirender, per proses: page_id -> etag, last_modified, versi korpus, html
+_rendered_pages = LRUCache(RENDERED_PAGE_CACHE_SIZE)
+# Versi korpus untuk cache HTTP; berubah setelah crawl, perhitungan PageRank, atau build indeks baru.
+# Isi engine_state dibaca thread latar setiap CORPUS_VERSION_CHECK_SECONDS (dengan koneksi database
+# sendiri), sehingga request hanya membandingkan ETag dengan nilai di memori tanpa menyentuh MySQL.
+_corpus_version = {'version': None, 'token': None}
+_corpus_state = {'state': None, 'pid': None}
+_corpus_state_lock = threading.Lock()
+
+# Cache vektor basis PageRank per topik, dimuat dari tabel topic_pagerank.
+# matrix berukuran [jumlah_halaman x jumlah_topik] (float32), row_of memetakan page_id ke baris.
+_topic_basis = {'topics': [], 'row_of': {}, 'matrix': None, 'loaded_at': 0.0}
 
 # Variabel global untuk IDF tidak lagi dibutuhkan, jadi dihapus
 # document_frequencies = {}
@@ -46,6 +112,136 @@ def get_db():
             raise ConnectionError("Gagal terhubung ke database.")
     return g.db_manager
 
+# Pencatat waktu per tahap pipeline pencarian (load, typo, filter, scoring, render).
+# Hasilnya disimpan di g.stage_times untuk permintaan saat ini.
+def start_stage_timer():
+    """Memulai pencatatan waktu tahap untuk permintaan saat ini."""
+    g.stage_times = {}
+    g.stage_started = time.perf_counter()
+    g.request_started = g.stage_started
+
+def end_stage(name):
+    """Mencatat lama tahap 'name' sejak tahap sebelumnya selesai (dalam detik)."""
+    now = time.perf_counter()
+    g.stage_times[name] = g.stage_times.get(name, 0.0) + now - g.stage_started
+    STAGE_DURATION.observe(now - g.stage_started, endpoint=request.endpoint, stage=name)
+    g.stage_started = now
+
+@app.after_request
+def record_request_metrics(response):
+    """Mencatat jumlah dan durasi request untuk endpoint yang memakai pencatat tahap."""
+    if 'request_started' in g:
+        REQUESTS_TOTAL.inc(endpoint=request.endpoint, status=response.status_code)
+        REQUEST_DURATION.observe(time.perf_counter() - g.request_started, endpoint=request.endpoint)
+        start_metrics_flusher()
+    return response
+
+def get_search_index():
+    """
+    Mengembalikan SearchIndex generasi aktif, atau None jika indeks belum dibangun
+    (pencarian lalu memakai pemindaian database seperti sebelumnya).
+
+    Indeks lama tidak ditutup saat diganti: request yang masih memakainya tetap memegang
+    referensinya, dan mmap-nya dilepas otomatis setelah tidak direferensikan lagi.
+    """
+    now = time.monotonic()
+    checked_at = _search_index['checked_at']
+    if checked_at is not None and now - checked_at < INDEX_RELOAD_CHECK_SECONDS:
+        return _search_index['index']
+
+    with _search_index_lock:
+        if _search_index['checked_at'] != checked_at:
+            # Thread lain sudah memeriksa lebih dulu
+            return _search_index['index']
+        index_dir = _search_index['index_dir']
+        generation = current_generation(index_dir) if index_dir else None
+        if generation != _search_index['generation']:
+            search_index = open_current(index_dir) if generation else None
+            if search_index is not None:
+                print(f"Indeks pencarian generasi '{search_index.generation}' dimuat.")
+                INDEX_RELOADS.inc()
+            else:
+                print("Indeks pencarian belum dibangun (jalankan src/index/indexer.py). Pencarian memindai database.")
+            # Jika generasi baru gagal dibuka, coba lagi pada pemeriksaan berikutnya
+            _search_index.update(index=search_index,
+                                 generation=search_index.generation if search_index else None)
+        _search_index['checked_at'] = time.monotonic()
+    return _search_index['index']
+
+def load_corpus_state():
+    """
+    Membaca isi tabel engine_state (versi crawl dan versi skor PageRank) ke cache proses,
+    dengan koneksi database sendiri di luar request. Mengembalikan False jika database tidak
+    bisa dihubungi; nilai lama tetap dipakai.
+    """
+    db_manager = DBManager()
+    db_manager.connect()
+    if not db_manager.connection:
+        return False
+    try:
+        _corpus_state['state'] = db_manager.get_all_state()
+        return True
+    finally:
+        db_manager.close_connection()
+
+def _refresh_corpus_state_loop():
+    while True:
+        time.sleep(CORPUS_VERSION_CHECK_SECONDS)
+        try:
+            load_corpus_state()
+        except Exception as e:
+            logger.warning("Gagal memperbarui versi korpus: %s", e)
+
+def get_corpus_version():
+    """
+    Token versi korpus, dihitung dari isi engine_state (diperbarui thread latar setiap
+    CORPUS_VERSION_CHECK_SECONDS) ditambah generasi indeks pencarian (dari file CURRENT).
+    Hanya request pertama di setiap proses yang membaca engine_state langsung dari database.
+    """
+    if _corpus_state['pid'] != os.getpid():
+        with _corpus_state_lock:
+            if _corpus_state['pid'] != os.getpid():
+                _corpus_state['pid'] = os.getpid()
+                threading.Thread(target=_refresh_corpus_state_loop, name='corpus-version', daemon=True).start()
+    if _corpus_state['state'] is None and not load_corpus_state():
+        # Pencarian berbasis indeks tetap bisa berjalan tanpa database; versi korpus
+        # lalu hanya ditentukan oleh generasi indeks sampai database bisa dibaca
+        _corpus_state['state'] = {}
+    search_index = get_search_index()
+    token = repr(sorted(_corpus_state['state'].items())) + '|' + (search_index.generation if search_index else '')
+    if token != _corpus_version['token']:
+        _corpus_version.update(version=sha1(token.encode('utf-8')).hexdigest()[:16], token=token)
+    return _corpus_version['version']
+
+def page_etag(corpus_version, page_content_hash):
+    """
+    ETag /view_page: versi korpus + hash konten. Selama versi korpus sama, konten halaman pasti
+    tidak berubah, sehingga ETag dari klien bisa dicocokkan tanpa membaca database.
+    """
+    return f"{corpus_version}-{page_content_hash}"
+
+def cacheable_response(body, etag, last_modified=None, not_modified=False):
+    """
+    Membuat respons HTML dengan ETag, Last-Modified, dan Cache-Control.
+    Jika header If-None-Match/If-Modified-Since dari klien cocok, respons diubah menjadi 304 tanpa isi.
+    not_modified=True langsung menjawab 304 dengan ETag baru, untuk klien yang ETag lamanya
+    sudah diketahui menunjuk ke isi yang sama.
+    """
+    response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = HTTP_CACHE_MAX_AGE
+    if not_modified:
+        response.status_code = 304
+        response.set_data(b'')
+    else:
+        response.make_conditional(request)
+    if response.status_code == 304:
+        NOT_MODIFIED.inc(endpoint=request.endpoint)
+    return response
+
 # Fungsi untuk menutup koneksi database setelah setiap permintaan
 @app.teardown_appcontext
 def close_db(e=None):
@@ -80,6 +276,61 @@ def highlight(text, query):
         text = re.sub(r'\b(' + re.escape(word) + r')\b', r'<mark>\1</mark>', text, flags=re.IGNORECASE)
     return text
 
+def get_topic_basis():
+    """
+    Mengembalikan cache vektor basis PageRank per topik.
+    Dimuat ulang dari database jika umur cache melebihi TOPIC_PAGERANK_CACHE_SECONDS.
+    """
+    if _topic_basis['matrix'] is None or time.time() - _topic_basis['loaded_at'] > TOPIC_PAGERANK_CACHE_SECONDS:
+        topic_scores = get_db().get_topic_pagerank_scores()
+        topics = sorted(topic_scores.keys())
+        page_ids = sorted({page_id for scores in topic_scores.values() for page_id in scores})
+        row_of = {page_id: row for row, page_id in enumerate(page_ids)}
+        matrix = np.zeros((len(page_ids), len(topics)), dtype=np.float32)
+        for col, topic in enumerate(topics):
+            for page_id, score in topic_scores[topic].items():
+                matrix[row_of[page_id], col] = score
+        _topic_basis.update(topics=topics, row_of=row_of, matrix=matrix, loaded_at=time.time())
+    return _topic_basis
+
+def query_topic_weights(query_words, requested_topics=None):
+    """
+    Menentukan bobot setiap topik untuk sebuah query.
+    Topik yang diminta eksplisit (parameter 'topic') mendapat bobot sama rata;
+    jika tidak ada, bobot sebanding dengan jumlah kata query yang cocok dengan keywords topik.
+    Mengembalikan dictionary kosong jika query tidak terkait topik mana pun.
+    """
+    if requested_topics:
+        topics = [topic for topic in requested_topics if topic in PAGERANK_TOPICS]
+        return {topic: 1.0 / len(topics) for topic in topics}
+
+    counts = {}
+    for topic, topic_config in PAGERANK_TOPICS.items():
+        keywords = set(topic_config.get('keywords', []))
+        count = sum(1 for word in query_words if word.lower() in keywords)
+        if count:
+            counts[topic] = count
+    total = sum(counts.values())
+    return {topic: count / total for topic, count in counts.items()}
+
+def personalized_pagerank_scores(doc_ids, topic_weights, search_index=None):
+    """
+    Mengombinasikan vektor basis PageRank per topik secara linear untuk dokumen kandidat.
+    Dokumen yang tidak ada di basis tidak dimasukkan ke hasil (tetap memakai PageRank global).
+    Jika indeks pencarian menyimpan PageRank per topik, basis dibaca dari indeks (mmap)
+    dan tidak dimuat dari database ke memori proses.
+    """
+    if search_index is not None and search_index.topics:
+        return search_index.topic_scores(doc_ids, topic_weights)
+    basis = get_topic_basis()
+    weights = np.array([topic_weights.get(topic, 0.0) for topic in basis['topics']], dtype=np.float32)
+    if not weights.any():
+        return {}
+    known_ids = [doc_id for doc_id in doc_ids if doc_id in basis['row_of']]
+    rows = [basis['row_of'][doc_id] for doc_id in known_ids]
+    combined = basis['matrix'][rows] @ weights
+    return {doc_id: float(score) for doc_id, score in zip(known_ids, combined)}
+
 # Fungsi baru untuk menghitung skor relevansi sederhana dengan boost judul
 def calculate_simple_relevance_score(doc, query_words_filtered, original_query_text):
     """
@@ -87,9 +338,7 @@ def calculate_simple_relevance_score(doc, query_words_filtered, original_query_t
     Memberikan boost signifikan untuk kecocokan judul dan mempertimbangkan frekuensi kata.
     """
     # Ekstrak judul dari konten (asumsi judul adalah baris pertama)
-    doc_content_lines = doc['content'].split('\n', 1)
-    doc_title_extracted = doc_content_lines[0].strip() if doc_content_lines else ''
-    main_doc_content = doc_content_lines[1].strip() if len(doc_content_lines) > 1 else doc['content'].strip() # Gunakan full content jika tidak ada baris kedua
+    doc_title_extracted, main_doc_content = split_title(doc['content'])
 
     score = 0
     
@@ -102,17 +351,200 @@ def calculate_simple_relevance_score(doc, query_words_filtered, original_query_t
     for word in query_words_filtered:
         score += doc_title_extracted.lower().count(word) * 10 # Bobot 10x untuk judul
 
+    return score + title_and_url_boost(doc_title_extracted, doc['url'], original_query_text)
+
+def calculate_index_relevance_score(doc, term_frequencies, original_query_text):
+    """
+    Versi calculate_simple_relevance_score untuk pencarian berbasis indeks.
+    term_frequencies adalah {kata: frekuensi di seluruh konten} dari postings; frekuensi di judul
+    dihitung dari judul yang tersimpan di metadata dokumen, sisanya dianggap frekuensi di isi.
+    """
+    title_counts = Counter(tokenize(doc['title']))
+
+    score = 0
+    for word, frequency in term_frequencies.items():
+        title_count = title_counts.get(word, 0)
+        score += frequency - title_count # Frekuensi di konten utama
+        score += title_count * 10 # Bobot 10x untuk judul
+
+    return score + title_and_url_boost(doc['title'], doc['url'], original_query_text)
+
+def title_and_url_boost(doc_title, doc_url, original_query_text):
+    """Boost untuk kecocokan query asli dengan judul atau URL dokumen."""
+    boost = 0
     # BERIKAN BOOST SANGAT TINGGI UNTUK KECOCOKAN JUDUL EKSPLISIT DENGAN QUERY ASLI
-    if original_query_text.lower() == doc_title_extracted.lower():
-        score += 100000000 # Boost sangat tinggi
-    elif original_query_text.lower() in doc_title_extracted.lower() and len(original_query_text) > 3:
-        score += 10000000 # Boost tinggi jika substring judul
+    if original_query_text.lower() == doc_title.lower():
+        boost += 100000000 # Boost sangat tinggi
+    elif original_query_text.lower() in doc_title.lower() and len(original_query_text) > 3:
+        boost += 10000000 # Boost tinggi jika substring judul
     
     # Boost jika query ada di URL
-    if original_query_text.lower() in doc['url'].lower():
-        score += 1000000
+    if original_query_text.lower() in doc_url.lower():
+        boost += 1000000
 
-    return score
+    return boost
+
+def rank_documents(candidate_docs, simple_relevance_scores, pagerank_scores, corrected_words, search_index=None):
+    """
+    Menggabungkan skor relevansi (dinormalisasi) dengan PageRank dan mengurutkan dokumen kandidat.
+    Jika query terkait topik tertentu, PageRank global diganti kombinasi PageRank per topik.
+    """
+    # Jika query terkait topik tertentu, ganti PageRank global dengan kombinasi
+    # linear PageRank per topik (vektor basis sudah dihitung offline)
+    topic_weights = query_topic_weights(corrected_words, request.args.getlist('topic'))
+    if topic_weights:
+        pagerank_scores.update(personalized_pagerank_scores(
+            [doc['id'] for doc in candidate_docs], topic_weights, search_index))
+
+    # Normalisasi skor relevansi sederhana
+    max_simple_relevance_score = max(simple_relevance_scores.values(), default=0)
+    if max_simple_relevance_score == 0:
+        normalized_simple_relevance_scores = {doc_id: 0.0 for doc_id in simple_relevance_scores.keys()}
+    else:
+        normalized_simple_relevance_scores = {
+            doc_id: score / max_simple_relevance_score for doc_id, score in simple_relevance_scores.items()
+        }
+
+    # Gabungkan dengan PageRank
+    # Alpha sangat kecil agar relevansi keyword sederhana dominan
+    alpha = 0.0001 # Misalnya, 0.01% PageRank, 99.99% relevansi sederhana
+    
+    combined_scores = {}
+    for doc in candidate_docs:
+        doc_id = doc['id']
+        pr_score = pagerank_scores.get(doc_id, 0.0) 
+        simple_kw_score = normalized_simple_relevance_scores.get(doc_id, 0.0) 
+
+        combined_scores[doc_id] = (alpha * pr_score) + ((1 - alpha) * simple_kw_score)
+        # Tambahkan skor gabungan ke objek dokumen agar bisa diakses di template
+        doc['final_score'] = combined_scores[doc_id]
+
+    # Debugging untuk melihat skor (hanya jika LOG_LEVEL=DEBUG)
+    if logger.isEnabledFor(logging.DEBUG):
+        for doc in candidate_docs:
+            doc_id = doc['id']
+            # Asumsi judul ada di baris pertama konten
+            title_for_debug = split_title(doc['content'])[0] if doc['content'] else 'No Title'
+            logger.debug("Doc ID %s, Title: '%s', Keyword Score (Simple, norm): %.4f, PageRank Score: %.4f, Combined Score: %.4f",
+                         doc_id, title_for_debug, normalized_simple_relevance_scores.get(doc_id, 0),
+                         pagerank_scores.get(doc_id, 0), combined_scores.get(doc_id, 0))
+
+    # Urutkan berdasarkan skor akhir
+    return sorted(
+        candidate_docs,
+        key=lambda doc: doc.get('final_score', 0), # Urutkan berdasarkan final_score
+        reverse=True
+    )
+
+def search_with_index(search_index, query):
+    """
+    Pencarian memakai artefak hasil indexer (src/index/indexer.py): kosakata dan postings
+    untuk koreksi typo dan filter, metadata dokumen untuk skoring dan cuplikan.
+    Tidak ada tokenisasi korpus per request. Mengembalikan (hasil, kata koreksi atau None).
+    """
+    end_stage('load')
+
+    # Preprocessing query: tokenisasi dan filter stopwords
+    filtered_query_words = tokenize(query)
+
+    # Koreksi typo dengan kosakata indeks
+    corrected_words = [search_index.correct(word) for word in filtered_query_words]
+    end_stage('typo')
+
+    # Filter dokumen: gabungan postings dari kata-kata yang sudah dikoreksi
+    # (pada indeks yang di-shard, setiap shard dicari lalu kandidatnya digabung)
+    candidates = search_index.candidates(corrected_words)
+    DOCUMENTS_SCANNED.inc(sum(search_index.doc_freq(word) for word in set(corrected_words)))
+    CANDIDATES_TOTAL.inc(len(candidates))
+    end_stage('filter')
+
+    # Jika tidak ada dokumen yang relevan, hasilnya kosong
+    if not candidates:
+        return [], None
+
+    candidate_docs = []
+    simple_relevance_scores = {}
+    for doc, term_frequencies in candidates:
+        # Template hasil menampilkan result.content[:300], jadi cuplikan dipakai sebagai content
+        doc['content'] = doc['snippet']
+        candidate_docs.append(doc)
+        simple_relevance_scores[doc['id']] = calculate_index_relevance_score(doc, term_frequencies, query)
+
+    # Normalisasi skor di rank_documents memakai skor maksimum dari semua shard sekaligus
+    pagerank_scores = {doc['id']: doc['pagerank_score'] for doc in candidate_docs}
+    results = rank_documents(candidate_docs, simple_relevance_scores, pagerank_scores, corrected_words, search_index)
+    end_stage('scoring')
+
+    return results, ' '.join(corrected_words) if corrected_words != filtered_query_words else None
+
+def scan_documents(db_manager, words, vocabulary=None):
+    """
+    Membaca seluruh dokumen per batch (streaming, konten didekompresi per batch) dan hanya
+    menyimpan dokumen yang mengandung minimal satu kata sebagai kata utuh. Jika vocabulary
+    diisi (set), semua token dokumen ikut dimasukkan untuk koreksi typo.
+    Mengembalikan (dokumen yang cocok, jumlah dokumen yang dibaca).
+    """
+    patterns = [re.compile(rf'\b{re.escape(word)}\b', re.IGNORECASE) for word in words]
+    matches = []
+    scanned = 0
+    for batch in db_manager.iter_document_batches(SEARCH_SCAN_BATCH_SIZE):
+        scanned += len(batch)
+        for doc in batch:
+            content = doc['content'] or ''
+            if vocabulary is not None:
+                vocabulary.update(tokenize(content))
+            if any(p.search(content) for p in patterns):
+                doc['content'] = content
+                matches.append(doc)
+    return matches, scanned
+
+def search_with_scan(db_manager, query):
+    """
+    Pencarian tanpa indeks: memindai seluruh dokumen di database untuk setiap query.
+    Dipakai jika indeks belum dibangun. Dokumen dibaca per batch dan hanya dokumen yang cocok
+    yang disimpan di memori; pemindaian kedua hanya terjadi jika koreksi typo mengubah query.
+    Mengembalikan (hasil, kata koreksi atau None).
+    """
+    # Preprocessing query: tokenisasi dan filter stopwords
+    query_words = re.findall(r'\w+', query)
+    filtered_query_words = [word for word in query_words if word not in stopwords]
+
+    # Pemindaian pertama: kosakata untuk koreksi typo sekaligus dokumen yang cocok dengan query asli
+    all_words_for_typo = set()
+    filtered_docs, scanned = scan_documents(db_manager, filtered_query_words, all_words_for_typo)
+    DOCUMENTS_SCANNED.inc(scanned)
+    end_stage('load')
+
+    # Koreksi typo untuk kata kunci pencarian
+    corrected_words = []
+    for word in filtered_query_words:
+        match = []
+        if word: 
+            match = difflib.get_close_matches(word, list(all_words_for_typo), n=1, cutoff=0.7)
+        corrected_words.append(match[0] if match else word)
+    end_stage('typo')
+
+    # Filter dokumen yang relevan berdasarkan pola pencarian yang sudah dikoreksi
+    # (kata yang ada di kosakata tidak berubah, jadi hasil pemindaian pertama sudah benar)
+    if corrected_words != filtered_query_words:
+        filtered_docs, scanned = scan_documents(db_manager, corrected_words)
+        DOCUMENTS_SCANNED.inc(scanned)
+    CANDIDATES_TOTAL.inc(len(filtered_docs))
+    end_stage('filter')
+    
+    # Jika tidak ada dokumen yang relevan, hasilnya kosong
+    if not filtered_docs:
+        return [], None
+
+    # PageRank scores (ambil dari database)
+    pagerank_scores = {doc['id']: doc['pagerank_score'] for doc in filtered_docs}
+
+    # Skoring relevansi berdasarkan keyword (menggunakan simple relevance score)
+    simple_relevance_scores = {doc['id']: calculate_simple_relevance_score(doc, filtered_query_words, query) for doc in filtered_docs}
+    results = rank_documents(filtered_docs, simple_relevance_scores, pagerank_scores, corrected_words)
+    end_stage('scoring')
+
+    return results, ' '.join(corrected_words) if corrected_words != filtered_query_words else None
 
 
 @app.route('/search', methods=['GET'])
@@ -124,98 +556,24 @@ def search():
     """
     query = request.args.get('q', '').strip()
     results = []
+    corrected = None # corrected akan tetap None jika query kosong
+    start_stage_timer()
     
     try:
-        db_manager = get_db() 
+        # Hasil pencarian hanya berubah jika korpus berubah, jadi ETag = versi korpus + query lengkap.
+        # Jika klien sudah punya versi yang sama, jawab 304 tanpa menjalankan pencarian.
+        etag = sha1(f"{get_corpus_version()}|{request.full_path}".encode('utf-8')).hexdigest()
+        if request.if_none_match.contains(etag):
+            return cacheable_response('', etag)
+
         if query:
-            all_raw_docs = db_manager.get_all_documents() # Ambil semua dokumen untuk pemrosesan
-            
-            # Preprocessing query: tokenisasi dan filter stopwords
-            query_words = re.findall(r'\w+', query)
-            filtered_query_words = [word for word in query_words if word not in stopwords]
-
-            # Mengambil semua kata dari semua dokumen untuk koreksi typo
-            all_words_for_typo = set()
-            for doc in all_raw_docs:
-                text_to_tokenize = f"{doc.get('judul', '')} {doc.get('content', '')}".lower() # Asumsi judul ada di sini
-                words = re.findall(r'\w+', text_to_tokenize)
-                filtered_words = [word for word in words if word not in stopwords]
-                all_words_for_typo.update(filtered_words)
-
-            # Koreksi typo untuk kata kunci pencarian
-            corrected_words = []
-            for word in filtered_query_words:
-                match = []
-                if word: 
-                    match = difflib.get_close_matches(word, list(all_words_for_typo), n=1, cutoff=0.7)
-                corrected_words.append(match[0] if match else word)
-
-            # Filter dokumen yang relevan berdasarkan pola pencarian yang sudah dikoreksi
-            patterns = [re.compile(rf'\b{re.escape(word)}\b', re.IGNORECASE) for word in corrected_words]
-            filtered_docs = []
-            for doc in all_raw_docs: 
-                text_to_search = f"{doc.get('judul', '')} {doc.get('content', '')}" # Asumsi judul ada di sini
-                if any(p.search(text_to_search) for p in patterns):
-                    filtered_docs.append(doc)
-            
-            # Jika tidak ada dokumen yang relevan, hasilnya kosong
-            if not filtered_docs:
-                return render_template('results.html', results=[], query=query, corrected=None)
-
-            # PageRank scores (ambil dari database)
-            pagerank_scores = {doc['id']: doc['pagerank_score'] for doc in all_raw_docs}
-
-            # Skoring relevansi berdasarkan keyword (menggunakan simple relevance score)
-            simple_relevance_scores = {doc['id']: calculate_simple_relevance_score(doc, filtered_query_words, query) for doc in filtered_docs}
-
-            # Normalisasi skor relevansi sederhana
-            max_simple_relevance_score = max(simple_relevance_scores.values(), default=0)
-            if max_simple_relevance_score == 0:
-                normalized_simple_relevance_scores = {doc_id: 0.0 for doc_id in simple_relevance_scores.keys()}
+            search_index = get_search_index()
+            if search_index is not None:
+                results, corrected = search_with_index(search_index, query)
             else:
-                normalized_simple_relevance_scores = {
-                    doc_id: score / max_simple_relevance_score for doc_id, score in simple_relevance_scores.items()
-                }
-
-            # Gabungkan dengan PageRank
-            # Alpha sangat kecil agar relevansi keyword sederhana dominan
-            alpha = 0.0001 # Misalnya, 0.01% PageRank, 99.99% relevansi sederhana
-            
-            combined_scores = {}
-            for doc in filtered_docs:
-                doc_id = doc['id']
-                pr_score = pagerank_scores.get(doc_id, 0.0) 
-                simple_kw_score = normalized_simple_relevance_scores.get(doc_id, 0.0) 
-
-                combined_scores[doc_id] = (alpha * pr_score) + ((1 - alpha) * simple_kw_score)
-                # Tambahkan skor gabungan ke objek dokumen agar bisa diakses di template
-                doc['final_score'] = combined_scores[doc_id]
-
-            # Debugging untuk melihat skor
-            print("\n--- DEBUG SCORES ---")
-            for doc in filtered_docs:
-                doc_id = doc['id']
-                # Asumsi judul ada di baris pertama konten
-                title_for_debug = doc['content'].split('\n', 1)[0].strip() if doc['content'] else 'No Title'
-                print(f"Doc ID {doc_id}, Title: '{title_for_debug}'")
-                print(f"  Keyword Score (Simple, norm): {normalized_simple_relevance_scores.get(doc_id, 0):.4f}")
-                print(f"  PageRank Score: {pagerank_scores.get(doc_id, 0):.4f}")
-                print(f"  Combined Score: {combined_scores.get(doc_id, 0):.4f}")
-            print("--- END DEBUG ---")
-
-
-            # Urutkan berdasarkan skor akhir
-            sorted_docs = sorted(
-                filtered_docs,
-                key=lambda doc: doc.get('final_score', 0), # Urutkan berdasarkan final_score
-                reverse=True
-            )
-            results = sorted_docs
-
+                results, corrected = search_with_scan(get_db(), query)
         else:
             print("Pencarian kosong.")
-            # corrected akan tetap None jika query kosong
-            corrected_words = [] # Inisialisasi agar tidak error jika query kosong
     except ConnectionError as e:
         print(f"ERROR KONEKSI DATABASE DI /search: {e}")
         traceback.print_exc()
@@ -225,19 +583,66 @@ def search():
         traceback.print_exc()
         return "Terjadi kesalahan server.", 500
     
-    return render_template(
+    rendered = render_template(
         'results.html', 
         query=query, 
         results=results, 
-        corrected=' '.join(corrected_words) if corrected_words != filtered_query_words else None
+        corrected=corrected
     )
+    end_stage('render')
+    return cacheable_response(rendered, etag)
+
+def cached_page_response(page_id):
+    """
+    Mencoba menjawab /view_page/<id> tanpa memuat konten dan tanpa render ulang.
+    ETag halaman berisi versi korpus dan hash kontennya (lihat page_etag), jadi ETag klien dari
+    versi korpus yang sama dijawab 304 tanpa database. Jika versi korpus berubah, hanya hash
+    konten yang dicek ke database (tanpa konten). Mengembalikan None jika halaman tetap harus
+    dimuat dan dirender.
+    """
+    corpus_version = get_corpus_version()
+    cached = _rendered_pages.get(page_id)
+    if cached is not None and cached['corpus_version'] == corpus_version:
+        VIEW_PAGE_CACHE.inc(result='hit')
+        return cacheable_response(cached['html'], page_etag(corpus_version, cached['content_hash']),
+                                  cached['last_modified'])
+
+    client_etags = request.if_none_match.as_set()
+    current_etags = [etag for etag in client_etags if etag.startswith(f"{corpus_version}-")]
+    if current_etags:
+        # Klien punya halaman dari versi korpus ini (mungkin dirender proses lain)
+        return cacheable_response('', current_etags[0])
+
+    if cached is None and not client_etags:
+        return None
+
+    version = get_db().get_page_version(page_id)
+    if version is None or not version['content_hash']:
+        return None
+    etag = page_etag(corpus_version, version['content_hash'])
+    if cached is not None and cached['content_hash'] == version['content_hash']:
+        # Konten halaman ini tidak berubah, HTML lama masih berlaku untuk versi korpus baru
+        _rendered_pages.put(page_id, dict(cached, corpus_version=corpus_version))
+        VIEW_PAGE_CACHE.inc(result='revalidated')
+        return cacheable_response(cached['html'], etag, cached['last_modified'])
+    if any(client_etag.endswith(f"-{version['content_hash']}") for client_etag in client_etags):
+        # Klien masih punya konten terbaru dari versi korpus sebelumnya
+        return cacheable_response('', etag, version['crawled_at'], not_modified=True)
+    return None
 
 @app.route('/view_page/<int:page_id>')
 def view_page_content(page_id):
     page_data = None
+    start_stage_timer()
     try:
+        response = cached_page_response(page_id)
+        if response is not None:
+            end_stage('load')
+            return response
+        VIEW_PAGE_CACHE.inc(result='miss')
         db_manager = get_db()
         page_data = db_manager.get_document_by_id(page_id)
+        end_stage('load')
     except ConnectionError as e:
         print(f"ERROR KONEKSI DATABASE DI /view_page/{page_id}: {e}")
         traceback.print_exc()
@@ -254,14 +659,96 @@ def view_page_content(page_id):
         display_title = content_lines[0].strip() if content_lines else 'Tidak Ada Judul'
         display_content = content_lines[1].strip() if len(content_lines) > 1 else full_content_from_db.strip()
 
-        return render_template('page_viewer.html', 
-                               judul=display_title, 
-                               content=display_content)
+        rendered = render_template('page_viewer.html', 
+                                   judul=display_title, 
+                                   content=display_content)
+        end_stage('render')
+        page_content_hash = page_data.get('content_hash') or content_hash(full_content_from_db)
+        corpus_version = get_corpus_version()
+        _rendered_pages.put(page_id, {'content_hash': page_content_hash, 'last_modified': page_data.get('crawled_at'),
+                                      'corpus_version': corpus_version, 'html': rendered})
+        return cacheable_response(rendered, page_etag(corpus_version, page_content_hash), page_data.get('crawled_at'))
     else:
         print(f"Halaman dengan ID {page_id} tidak ditemukan di database.")
         return "Halaman tidak ditemukan.", 404
 
+@app.route('/api/suggest')
+def suggest():
+    """
+    Autocomplete: melengkapi kata terakhir dari parameter 'q' dengan term di kosakata indeks,
+    diurutkan berdasarkan df dan PageRank halaman yang mengandungnya (lihat SearchIndex.suggest_terms).
+    Kata-kata sebelumnya dipertahankan. Jika indeks belum dibangun, respons 503 dengan daftar
+    saran kosong dan pesan 'error' (tanpa cache), agar tidak tertukar dengan prefix tanpa saran.
+    """
+    start_stage_timer()
+    query = request.args.get('q', '')
+    limit = max(1, min(request.args.get('limit', SUGGEST_LIMIT, type=int), SUGGEST_MAX_LIMIT))
+    words = re.findall(r'\w+', query.lower())
+    suggestions = []
+
+    search_index = get_search_index()
+    if search_index is None:
+        end_stage('suggest')
+        response = jsonify({'query': query, 'suggestions': suggestions,
+                            'error': "Indeks pencarian belum dibangun; saran tidak tersedia."})
+        response.status_code = 503
+        response.cache_control.no_store = True
+        return response
+
+    # Tidak ada kata yang sedang diketik jika query kosong atau diakhiri spasi
+    if words and not query[-1:].isspace():
+        head = ' '.join(words[:-1])
+        suggestions = [f"{head} {term}".strip() for _, term in search_index.suggest_terms(words[-1], limit)]
+    end_stage('suggest')
+
+    response = jsonify({'query': query, 'suggestions': suggestions})
+    response.cache_control.public = True
+    response.cache_control.max_age = HTTP_CACHE_MAX_AGE
+    return response
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """
+    Rute metrik dalam format teks Prometheus: metrik aplikasi web (dijumlahkan dari snapshot
+    semua worker) ditambah snapshot terakhir dari crawler dan perhitungan PageRank (METRICS_DIR).
+    """
+    write_worker_metrics()
+    web_metrics = metrics.merge_textfiles(WEB_METRICS_DIR)
+    # Family metrik web tidak diambil lagi dari snapshot proses batch
+    web_families = {line.split()[2] for line in web_metrics.splitlines() if line.startswith('# TYPE ')}
+    body = web_metrics + metrics.read_textfiles(METRICS_DIR, exclude=web_families | metrics.active_families())
+    return Response(body, mimetype='text/plain; version=0.0.4')
+
+def serve_prefork(num_workers, bind='127.0.0.1:8080'):
+    """
+    Menjalankan aplikasi dengan gunicorn: num_workers proses worker tetap (pre-fork), masing-masing
+    melayani banyak request, sehingga cache di memori proses (render halaman, versi korpus, basis
+    PageRank per topik) dan counter /metrics milik worker bertahan antar request. Indeks dibuka sekali
+    di proses master sebelum fork, jadi semua worker mewarisi mmap yang sama.
+
+    Setara dengan menjalankan dari folder src/web:
+        gunicorn --preload -w <WEB_PROCESSES> -b 127.0.0.1:8080 app:app
+    (tanpa pemanggilan get_search_index() di master; worker membuka indeks saat request pertama).
+    """
+    from gunicorn.app.base import BaseApplication
+
+    class PreforkApplication(BaseApplication):
+        def load_config(self):
+            self.cfg.set('bind', bind)
+            self.cfg.set('workers', num_workers)
+            self.cfg.set('preload_app', True)
+
+        def load(self):
+            return app
+
+    # Snapshot metrik worker dari server sebelumnya tidak ikut dijumlahkan
+    for path in glob.glob(os.path.join(WEB_METRICS_DIR, '*.prom')):
+        os.remove(path)
+    get_search_index()
+    PreforkApplication().run()
+
 if __name__ == '__main__':
+    logging.basicConfig(level=LOG_LEVEL)
     print("-----------------------------------------------------")
     print("           Memulai Aplikasi Web Search Engine          ")
     print("-----------------------------------------------------")
@@ -269,4 +756,13 @@ if __name__ == '__main__':
     print(f"Aplikasi Flask akan berjalan di: http://127.0.0.1:8080/")
     print("Tekan CTRL+C untuk menghentikan server.")
     print("-----------------------------------------------------")
-    app.run(debug=True, port=8080)
+    if WEB_PROCESSES > 1:
+        # Mode processes=N milik server bawaan Flask (werkzeug) mem-fork satu proses baru per request,
+        # sehingga cache dan metrik di memori selalu hilang; karena itu dipakai gunicorn
+        try:
+            serve_prefork(WEB_PROCESSES)
+        except ImportError:
+            print("gunicorn tidak terpasang (pip install gunicorn, hanya Linux/macOS). Berjalan dengan satu proses.")
+            app.run(port=8080, threaded=True)
+    else:
+        app.run(debug=True, port=8080)
@@ -1,4 +1,81 @@
 // search_engine_project/static/js/script.js
-// Untuk proyek sederhana ini, tidak ada kode JavaScript yang diperlukan secara default.
-// Kamu bisa menambahkan fungsionalitas JavaScript di sini nanti jika ingin,
-// misalnya validasi form atau efek UI.
\ No newline at end of file
+// Autocomplete kotak pencarian: input dengan atribut data-suggest-url meminta saran ke
+// /api/suggest setiap kali diketik, lalu saran ditampilkan di elemen .suggestions pada form yang sama.
+
+document.querySelectorAll('input[data-suggest-url]').forEach(function (input) {
+    const list = input.form && input.form.querySelector('.suggestions');
+    if (!list) {
+        return;
+    }
+    let controller = null;
+    let activeIndex = -1;
+
+    function clearSuggestions() {
+        list.innerHTML = '';
+        activeIndex = -1;
+    }
+
+    function choose(text) {
+        input.value = text;
+        clearSuggestions();
+        input.form.requestSubmit();
+    }
+
+    function setActive(index) {
+        const items = list.querySelectorAll('.list-group-item');
+        activeIndex = (index + items.length) % items.length;
+        items.forEach(function (item, i) {
+            item.classList.toggle('active', i === activeIndex);
+        });
+    }
+
+    function showSuggestions(suggestions) {
+        clearSuggestions();
+        suggestions.forEach(function (text) {
+            const item = document.createElement('button');
+            item.type = 'button';
+            item.className = 'list-group-item list-group-item-action';
+            item.textContent = text;
+            // mousedown agar saran terpilih sebelum input kehilangan fokus (blur)
+            item.addEventListener('mousedown', function (event) {
+                event.preventDefault();
+                choose(text);
+            });
+            list.appendChild(item);
+        });
+    }
+
+    input.addEventListener('input', function () {
+        // Request sebelumnya dibatalkan, hanya saran untuk ketikan terakhir yang ditampilkan
+        if (controller) {
+            controller.abort();
+        }
+        if (!input.value.trim()) {
+            clearSuggestions();
+            return;
+        }
+        controller = new AbortController();
+        fetch(input.dataset.suggestUrl + '?q=' + encodeURIComponent(input.value), { signal: controller.signal })
+            .then(function (response) { return response.json(); })
+            .then(function (data) { showSuggestions(data.suggestions); })
+            .catch(function () { /* dibatalkan atau gagal: saran lama dibiarkan */ });
+    });
+
+    input.addEventListener('keydown', function (event) {
+        const items = list.querySelectorAll('.list-group-item');
+        if (event.key === 'ArrowDown' && items.length) {
+            event.preventDefault();
+            setActive(activeIndex + 1);
+        } else if (event.key === 'ArrowUp' && items.length) {
+            event.preventDefault();
+            setActive(activeIndex - 1);
+        } else if (event.key === 'Enter' && activeIndex >= 0) {
+            event.preventDefault();
+            choose(items[activeIndex].textContent);
+        } else if (event.key === 'Escape') {
+            clearSuggestions();
+        }
+    });
+
+    input.addEventListener('blur', clearSuggestions);
+});
@@ -0,0 +1,77 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'database')))
+
+from db_manager import (DBManager, compress_content, content_hash, decompress_content,
+                        decode_outlinks, encode_outlinks)
+
+class FakeConnection:
+    """Koneksi MySQL tiruan yang hanya memahami query yang dipakai migrate_content."""
+    def __init__(self, rows):
+        # id -> [content_compressed, content, content_hash]
+        self.rows = rows
+        self.commits = 0
+
+    def is_connected(self):
+        return True
+
+    def commit(self):
+        self.commits += 1
+
+class FakeCursor:
+    def __init__(self, connection):
+        self.connection = connection
+        self.result = []
+
+    def execute(self, query, params=()):
+        assert query.startswith("SELECT id, content_compressed, content FROM pages WHERE content_hash IS NULL")
+        pending = [(page_id, row[0], row[1]) for page_id, row in sorted(self.connection.rows.items()) if row[2] is None]
+        self.result = pending[:params[0]]
+
+    def fetchall(self):
+        return self.result
+
+    def executemany(self, query, updates):
+        assert query.startswith("UPDATE pages SET content_compressed = %s, content = NULL, content_hash = %s")
+        for compressed, digest, page_id in updates:
+            self.connection.rows[page_id] = [compressed, None, digest]
+
+def test_compress_round_trip():
+    text = "Jurusan Teknik Elektro\n\nKurikulum, laboratorium, dan dosen. Ümlaut é 日本"
+    compressed = compress_content(text)
+    assert isinstance(compressed, bytes)
+    assert decompress_content(compressed) == text
+    assert compress_content(None) is None
+    # Baris lama yang belum dimigrasi dibaca dari kolom TEXT
+    assert decompress_content(None, "konten lama") == "konten lama"
+    assert decompress_content(None) is None
+
+def test_outlinks_round_trip():
+    urls = ['https://elektro.um.ac.id/', 'https://elektro.um.ac.id/akademik/']
+    assert decode_outlinks(encode_outlinks(urls)) == urls
+    assert decode_outlinks(encode_outlinks([])) == []
+    assert decode_outlinks(None) == []
+
+def test_migrate_content_moves_legacy_rows_in_batches():
+    already = "sudah terkompresi"
+    rows = {page_id: [None, f"halaman lama {page_id}", None] for page_id in range(1, 8)}
+    rows[8] = [compress_content(already), None, None]  # terkompresi tetapi belum punya hash
+    rows[9] = [compress_content(already), None, content_hash(already)]
+    connection = FakeConnection(rows)
+    db_manager = DBManager()
+    db_manager.connection = connection
+    db_manager.cursor = FakeCursor(connection)
+
+    assert db_manager.migrate_content(batch_size=3)
+    assert connection.commits == 3
+    for page_id in range(1, 8):
+        compressed, legacy, digest = rows[page_id]
+        assert legacy is None
+        assert decompress_content(compressed) == f"halaman lama {page_id}"
+        assert digest == content_hash(f"halaman lama {page_id}")
+    assert decompress_content(rows[8][0]) == already and rows[8][2] == content_hash(already)
+
+    # Dijalankan ulang tidak mengubah apa pun
+    assert db_manager.migrate_content(batch_size=3)
+    assert connection.commits == 3
@@ -0,0 +1,82 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'crawler')))
+
+from frontier import CrawlFrontier
+
+def _drain(frontier):
+    urls = []
+    while True:
+        url = frontier.pop()
+        if url is None:
+            return urls
+        urls.append(url)
+
+def _crawl_start(frontier):
+    """Seed 'a' diambil, lalu link keluarnya a -> b, c, d dicatat."""
+    frontier.add_seed('a')
+    assert frontier.pop() == 'a'
+    frontier.record_links('a', ['b', 'c', 'd'])
+
+def test_bfs_pops_in_discovery_order():
+    frontier = CrawlFrontier('bfs')
+    _crawl_start(frontier)
+    frontier.record_links('x', ['d', 'd', 'e'])
+    assert _drain(frontier) == ['b', 'c', 'd', 'e']
+
+def test_indegree_prefers_most_linked_page():
+    frontier = CrawlFrontier('indegree')
+    _crawl_start(frontier)
+    frontier.record_links('x', ['d', 'c'])
+    frontier.record_links('y', ['d'])
+    # d: 3 in-link, c: 2, b: 1
+    assert _drain(frontier) == ['d', 'c', 'b']
+
+def test_opic_splits_cash_over_outlinks():
+    frontier = CrawlFrontier('opic')
+    frontier.add_seed('a')
+    frontier.add_seed('z', cash=0.5)
+    assert frontier.pop() == 'a'
+    frontier.record_links('a', ['b', 'c'])
+    assert frontier.cash['b'] == pytest.approx(0.5)
+    # z (0.5) dan b (0.5) sama: urutan ditemukan menentukan, z lebih dulu
+    assert frontier.pop() == 'z'
+    frontier.record_links('z', ['c'])
+    # c menerima 0.5 dari a dan 0.5 dari z
+    assert frontier.cash['c'] == pytest.approx(1.0)
+    assert _drain(frontier) == ['c', 'b']
+
+def test_pagerank_uses_previous_scores_then_cash():
+    frontier = CrawlFrontier('pagerank', previous_pagerank={'d': 0.4, 'b': 0.1})
+    frontier.add_seed('a')
+    assert frontier.pop() == 'a'
+    frontier.record_links('a', ['b', 'c', 'd', 'e'])
+    # e menerima cash tambahan, sehingga di antara halaman tanpa PageRank lama (c, e) ia lebih dulu
+    frontier.add_seed('e', cash=0.35)
+    # Halaman yang dikenal urut berdasarkan PageRank lama, lalu sisanya berdasarkan cash OPIC
+    assert _drain(frontier) == ['d', 'b', 'e', 'c']
+
+def test_repushed_priority_invalidates_old_entry():
+    frontier = CrawlFrontier('indegree')
+    frontier.record_links('x', ['b', 'c'])
+    frontier.record_links('y', ['c'])
+    frontier.record_links('z', ['c'])
+    # c punya tiga entri di heap (prioritas 1, 2, 3); hanya yang terbaru berlaku
+    assert len(frontier._heap) == 4
+    assert len(frontier) == 2
+    assert _drain(frontier) == ['c', 'b']
+    assert len(frontier) == 0
+
+def test_popped_url_is_not_queued_again():
+    frontier = CrawlFrontier('opic')
+    _crawl_start(frontier)
+    assert frontier.pop() == 'b'
+    frontier.record_links('c', ['a', 'b', 'e'])
+    assert sorted(_drain(frontier)) == ['c', 'd', 'e']
+
+def test_unknown_strategy_is_rejected():
+    with pytest.raises(ValueError):
+        CrawlFrontier('acak')
@@ -0,0 +1,91 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from search_benchmark import seed_database, web_app
+from memory_db import InMemoryDBManager
+from lru_cache import LRUCache
+
+class UnavailableDBManager(InMemoryDBManager):
+    """Dipakai setelah cache terisi: setiap akses database dianggap gagal."""
+    def connect(self):
+        raise AssertionError("database tidak boleh diakses")
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    monkeypatch.setattr(web_app, 'DBManager', InMemoryDBManager)
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database(100, seed=0, index_dir=str(tmp_path))
+    return web_app.app.test_client()
+
+def test_search_matching_etag_is_not_modified_without_database(client, monkeypatch):
+    first = client.get('/search?q=kurikulum')
+    assert first.status_code == 200 and first.headers['ETag']
+    monkeypatch.setattr(web_app, 'DBManager', UnavailableDBManager)
+    second = client.get('/search?q=kurikulum', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+    assert second.headers['ETag'] == first.headers['ETag']
+
+def test_search_changes_etag_after_corpus_change(client):
+    first = client.get('/search?q=kurikulum')
+    db_manager = InMemoryDBManager()
+    db_manager.set_state('corpus_version', 'crawl-baru')
+    # Setara dengan satu putaran thread latar versi korpus
+    assert web_app.load_corpus_state()
+    second = client.get('/search?q=kurikulum', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert second.headers['ETag'] != first.headers['ETag']
+
+def test_view_page_etag_from_other_process_is_not_modified_without_database(client, monkeypatch):
+    first = client.get('/view_page/1')
+    assert first.status_code == 200
+    # Cache render proses ini kosong, seolah-olah request dilayani worker lain
+    web_app._rendered_pages.clear()
+    monkeypatch.setattr(web_app, 'DBManager', UnavailableDBManager)
+    second = client.get('/view_page/1', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 304
+
+def test_view_page_after_content_change(client):
+    first = client.get('/view_page/1')
+    db_manager = InMemoryDBManager()
+    db_manager.upsert_page(InMemoryDBManager.store['pages'][1]['url'], "Judul Baru\n\nIsi halaman yang berubah")
+    db_manager.set_state('corpus_version', 'crawl-baru')
+    assert web_app.load_corpus_state()
+    second = client.get('/view_page/1', headers={'If-None-Match': first.headers['ETag']})
+    assert second.status_code == 200
+    assert b'Isi halaman yang berubah' in second.data
+    assert second.headers['ETag'] != first.headers['ETag']
+
+def test_view_page_unchanged_content_revalidates_after_corpus_change(client):
+    first = client.get('/view_page/2')
+    InMemoryDBManager().set_state('corpus_version', 'crawl-baru')
+    assert web_app.load_corpus_state()
+    web_app._rendered_pages.clear()
+    second = client.get('/view_page/2', headers={'If-None-Match': first.headers['ETag']})
+    # Hash konten sama, jadi klien tetap boleh memakai salinannya (dengan ETag versi baru)
+    assert second.status_code == 304
+    assert second.headers['ETag'] != first.headers['ETag']
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'a' baru dipakai, jadi 'b' yang paling lama
+    cache.put('c', 3)
+    assert cache.get('b') is None
+    assert cache.get('a') == 1 and cache.get('c') == 3
+    assert len(cache) == 2
+    cache.put('a', 10)
+    assert cache.get('a') == 10 and len(cache) == 2
+
+def test_lru_cache_disabled():
+    cache = LRUCache(0)
+    cache.put('a', 1)
+    assert cache.get('a', 'kosong') == 'kosong'
+    assert len(cache) == 0
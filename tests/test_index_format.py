@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'index')))
+
+from postings import IndexReader, SKIP_INTERVAL, decode_varbyte, encode_varbyte, write_index
+from docstore import DocStore, write_docstore
+
+def test_varbyte_round_trip():
+    numbers = [0, 1, 127, 128, 16383, 16384, 2 ** 32 - 1]
+    buffer = bytearray()
+    encode_varbyte(numbers, buffer)
+    decoded, position = decode_varbyte(buffer, 0, len(numbers))
+    assert decoded == numbers
+    assert position == len(buffer)
+
+def test_index_round_trip(tmp_path):
+    rnd = random.Random(0)
+    postings_by_term = {
+        'a': [(1, 3)],
+        # Lebih dari satu blok, agar tabel skip ikut diuji
+        'banyak': [(doc_id, rnd.randint(1, 9)) for doc_id in sorted(rnd.sample(range(1, 5000), SKIP_INTERVAL * 3 + 5))],
+        'ekonomi': [(2, 1), (40, 2)],
+        'elektro': [(2, 5), (7, 1), (300, 2)],
+        'teknik': [(1, 1), (2, 2), (3, 3)],
+        'ümlaut': [(9, 1)],
+    }
+    path = str(tmp_path / 'postings.bin')
+    write_index(path, postings_by_term, 5000)
+
+    with IndexReader(path) as reader:
+        assert reader.num_terms == len(postings_by_term)
+        assert reader.num_documents == 5000
+        assert [reader.term_at(i) for i in range(reader.num_terms)] == sorted(postings_by_term)
+        for term, postings in postings_by_term.items():
+            assert reader.doc_freq(term) == len(postings)
+            assert list(reader.postings(term)) == postings
+        assert reader.postings('tidakada') is None
+        assert reader.doc_freq('tidakada') == 0
+        assert [term for _, term in reader.terms_with_prefix('e')] == ['ekonomi', 'elektro']
+        assert reader.prefix_range('e') == (2, 4)
+        assert reader.prefix_range('x') == (5, 5)
+
+def test_advance_to_skips_blocks(tmp_path):
+    postings = [(doc_id, 1) for doc_id in range(2, 2000, 2)]
+    path = str(tmp_path / 'postings.bin')
+    write_index(path, {'genap': postings}, 2000)
+    with IndexReader(path) as reader:
+        cursor = reader.postings('genap')
+        assert cursor.advance_to(3) == (4, 1)
+        assert cursor.advance_to(1001) == (1002, 1)
+        assert cursor.next() == (1004, 1)
+        assert cursor.advance_to(1998) == (1998, 1)
+        assert cursor.advance_to(1999) is None
+
+def test_docstore_round_trip(tmp_path):
+    documents = [
+        {'id': 3, 'url': 'https://a/1', 'title': 'Beranda', 'snippet': 'halo', 'length': 10,
+         'title_length': 1, 'pagerank_score': 0.25},
+        {'id': 8, 'url': 'https://a/2', 'title': None, 'snippet': 'ünïcode', 'length': 0,
+         'title_length': 0, 'pagerank_score': None},
+    ]
+    path = str(tmp_path / 'documents.bin')
+    write_docstore(path, documents)
+    store = DocStore(path)
+    try:
+        assert len(store) == 2
+        assert store.get(3) == documents[0]
+        assert store.get(8) == dict(documents[1], title='', pagerank_score=0.0)
+        assert store.get(5) is None
+        assert store.get(9) is None
+    finally:
+        store.close()
@@ -0,0 +1,103 @@
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from search_benchmark import build_synthetic_corpus, seed_database, web_app
+from memory_db import InMemoryDBManager
+from indexer import build_index
+from postings import IndexReader, iter_run, write_run
+import search_index
+from search_index import open_current, publish_generation
+
+def test_run_round_trip(tmp_path):
+    postings_by_term = {'teknik': [(1, 2), (300, 1), (70000, 4)], 'elektro': [(5, 1)]}
+    path = str(tmp_path / '00-00000.run')
+    write_run(path, postings_by_term)
+    assert list(iter_run(path)) == sorted(postings_by_term.items())
+
+def _postings(index_dir):
+    """Semua term dan postings dari generasi aktif di index_dir."""
+    index = open_current(index_dir)
+    reader = index.postings
+    return {reader.term_at(i): list(reader.postings(reader.term_at(i))) for i in range(reader.num_terms)}
+
+def test_spilled_runs_match_in_memory_build(tmp_path):
+    InMemoryDBManager.load(build_synthetic_corpus(300, seed=2), [])
+    db_manager = InMemoryDBManager()
+    db_manager.connect()
+    with contextlib.redirect_stdout(io.StringIO()):
+        build_index(db_manager, str(tmp_path / 'memori'), batch_size=50)
+        build_index(db_manager, str(tmp_path / 'run'), batch_size=50, run_postings=100)
+    assert _postings(str(tmp_path / 'memori')) == _postings(str(tmp_path / 'run'))
+    # Folder run sementara sudah dihapus, hanya generasi dan CURRENT yang tersisa
+    assert not [name for name in os.listdir(tmp_path / 'run') if name.startswith('.')]
+
+def _search(search, source, query):
+    with web_app.app.test_request_context(f"/search?q={query}"):
+        web_app.start_stage_timer()
+        results, _ = search(source, query)
+    return [doc['id'] for doc in results]
+
+def test_index_search_matches_scan(monkeypatch, tmp_path):
+    monkeypatch.setattr(web_app, 'DBManager', InMemoryDBManager)
+    queries = ['jurusan', 'kurikulum', 'laboratorium', 'mahasiswa', 'dosen']
+    # Pemindaian menghitung frekuensi sebagai substring ('elektro' juga terhitung di 'elektronika')
+    # dan dari kata query sebelum koreksi typo, sedangkan indeks menghitung token utuh dari kata
+    # yang sudah dikoreksi; untuk query ini hanya himpunan hasilnya yang dibandingkan
+    substring_queries = ['teknik elektro', 'istilah7', 'kurikulm']
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database(200, seed=1)
+    db_manager = InMemoryDBManager()
+    db_manager.connect()
+    scan_results = {query: _search(web_app.search_with_scan, db_manager, query)
+                    for query in queries + substring_queries}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database(200, seed=1, index_dir=str(tmp_path), num_shards=1)
+    search_index = open_current(str(tmp_path))
+    for query in queries:
+        assert scan_results[query], query
+        assert _search(web_app.search_with_index, search_index, query) == scan_results[query], query
+    for query in substring_queries:
+        assert scan_results[query], query
+        assert sorted(_search(web_app.search_with_index, search_index, query)) == sorted(scan_results[query]), query
+
+def test_publish_keeps_previous_generation_until_next_publish(tmp_path):
+    index_dir = str(tmp_path)
+    for generation in ('20240101000000-1', '20240102000000-1', '20240103000000-1'):
+        os.makedirs(os.path.join(index_dir, generation))
+        publish_generation(index_dir, generation, keep_generations=1)
+        if generation == '20240102000000-1':
+            # Generasi sebelumnya mungkin masih dipakai pembaca, jadi belum dihapus
+            assert os.path.isdir(os.path.join(index_dir, '20240101000000-1'))
+    assert sorted(os.listdir(index_dir)) == ['20240102000000-1', '20240103000000-1', 'CURRENT']
+
+def test_publish_logs_failed_removal(monkeypatch, tmp_path, capsys):
+    index_dir = str(tmp_path)
+    for generation in ('20240101000000-1', '20240102000000-1'):
+        os.makedirs(os.path.join(index_dir, generation))
+        publish_generation(index_dir, generation, keep_generations=1)
+    os.makedirs(os.path.join(index_dir, '20240103000000-1'))
+
+    def fail(path):
+        raise PermissionError(f"sedang dipakai: {path}")
+    monkeypatch.setattr(search_index.shutil, 'rmtree', fail)
+    publish_generation(index_dir, '20240103000000-1', keep_generations=1)
+    assert 'Gagal menghapus generasi indeks lama' in capsys.readouterr().out
+    assert os.path.isdir(os.path.join(index_dir, '20240101000000-1'))
+
+def test_sharded_search_matches_single_index(monkeypatch, tmp_path):
+    monkeypatch.setattr(web_app, 'DBManager', InMemoryDBManager)
+    queries = ['teknik elektro', 'kurikulm', 'laboratorium mahasiswa', 'istilah7']
+    results = {}
+    for num_shards in (1, 3):
+        index_dir = str(tmp_path / f"shard{num_shards}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            seed_database(200, seed=1, index_dir=index_dir, num_shards=num_shards)
+        search_index = open_current(index_dir)
+        results[num_shards] = [_search(web_app.search_with_index, search_index, query) for query in queries]
+    assert results[1] == results[3]
+    assert all(results[1])
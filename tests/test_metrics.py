@@ -0,0 +1,31 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+import metrics
+
+def test_merge_textfiles_sums_workers(tmp_path):
+    (tmp_path / 'web-1.prom').write_text(
+        '# HELP requests_total Jumlah request.\n# TYPE requests_total counter\n'
+        'requests_total{endpoint="search"} 3\n'
+        '# HELP duration_seconds Durasi.\n# TYPE duration_seconds histogram\n'
+        'duration_seconds_bucket{le="+Inf"} 3\nduration_seconds_sum 0.5\nduration_seconds_count 3\n'
+        '# HELP pages Jumlah halaman.\n# TYPE pages gauge\npages 10\n', encoding='utf-8')
+    (tmp_path / 'web-2.prom').write_text(
+        '# HELP requests_total Jumlah request.\n# TYPE requests_total counter\n'
+        'requests_total{endpoint="search"} 2\nrequests_total{endpoint="view_page"} 1\n'
+        '# HELP duration_seconds Durasi.\n# TYPE duration_seconds histogram\n'
+        'duration_seconds_bucket{le="+Inf"} 2\nduration_seconds_sum 0.25\nduration_seconds_count 2\n'
+        '# HELP pages Jumlah halaman.\n# TYPE pages gauge\npages 12\n', encoding='utf-8')
+
+    lines = metrics.merge_textfiles(str(tmp_path)).splitlines()
+    assert lines.count('# TYPE requests_total counter') == 1
+    assert 'requests_total{endpoint="search"} 5' in lines
+    assert 'requests_total{endpoint="view_page"} 1' in lines
+    assert 'duration_seconds_bucket{le="+Inf"} 5' in lines
+    assert 'duration_seconds_sum 0.75' in lines
+    assert 'pages 12' in lines
+
+def test_merge_textfiles_empty_directory(tmp_path):
+    assert metrics.merge_textfiles(str(tmp_path / 'tidak_ada')) == ''
@@ -0,0 +1,44 @@
+import contextlib
+import io
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import main
+from memory_db import InMemoryDBManager
+
+PAGES = [{'id': i, 'url': f'https://example.ac.id/halaman/{i}'} for i in range(1, 6)]
+LINKS = [(1, 2), (2, 3), (3, 1), (4, 5), (5, 1)]
+
+def _run(monkeypatch, tmp_path):
+    """Menjalankan run_pagerank_calculation dan mengembalikan True jika PageRank dihitung ulang."""
+    calls = []
+    calculate = main.calculate_pagerank
+    monkeypatch.setattr(main, 'DBManager', InMemoryDBManager)
+    monkeypatch.setattr(main, 'METRICS_DIR', str(tmp_path))
+    monkeypatch.setattr(main, 'calculate_pagerank', lambda *args, **kwargs: calls.append(1) or calculate(*args, **kwargs))
+    with contextlib.redirect_stdout(io.StringIO()):
+        assert main.run_pagerank_calculation()
+    return bool(calls)
+
+def test_unchanged_graph_skips_recompute(monkeypatch, tmp_path):
+    InMemoryDBManager.load(PAGES, LINKS)
+    assert _run(monkeypatch, tmp_path)
+    assert not _run(monkeypatch, tmp_path)
+    # Urutan dan duplikat link tidak mengubah graf yang dipakai untuk perhitungan
+    InMemoryDBManager.store['links'] = list(reversed(LINKS)) + [(1, 2)]
+    assert not _run(monkeypatch, tmp_path)
+    # Link ke halaman yang tidak ada diabaikan oleh build_link_graph, jadi juga tidak memicu hitung ulang
+    InMemoryDBManager.store['links'].append((1, 99))
+    assert not _run(monkeypatch, tmp_path)
+
+def test_changed_graph_recomputes(monkeypatch, tmp_path):
+    InMemoryDBManager.load(PAGES, LINKS)
+    assert _run(monkeypatch, tmp_path)
+    InMemoryDBManager.store['links'].append((4, 1))
+    assert _run(monkeypatch, tmp_path)
+    assert not _run(monkeypatch, tmp_path)
+    InMemoryDBManager.store['pages'][3]['url'] = 'https://example.ac.id/akademik/3'
+    assert _run(monkeypatch, tmp_path)
@@ -0,0 +1,44 @@
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'pagerank')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from link_graph import build_link_graph
+from pagerank_calculator import power_iteration
+from parallel_pagerank import parallel_power_iteration, partition_blocks
+from pagerank_benchmark import dangling_heavy_graph
+
+def _graph(n=3000, seed=1):
+    edges = dangling_heavy_graph(n, seed=seed)
+    return build_link_graph([{'id': i} for i in range(n)], [(int(source), int(target)) for source, target in edges])
+
+def test_partition_blocks_cover_all_pages():
+    graph = _graph()
+    blocks = partition_blocks(graph['indptr'], 4)
+    assert blocks[0][0] == 0 and blocks[-1][1] == graph['N']
+    for (_, end, _, hi), (start, _, lo, _) in zip(blocks, blocks[1:]):
+        assert end == start and hi == lo
+
+def test_parallel_matches_serial():
+    graph = _graph()
+    with contextlib.redirect_stdout(io.StringIO()):
+        serial, serial_iterations, _ = power_iteration(graph, 0.85, 100, 1e-10)
+        for workers in (1, 3):
+            parallel, iterations, times = parallel_power_iteration(graph, 0.85, 100, 1e-10, workers)
+            assert iterations == serial_iterations
+            assert len(times) == iterations
+            assert np.abs(parallel - serial).sum() < 1e-12
+
+def test_parallel_personalized_teleport():
+    graph = _graph()
+    teleport = np.zeros(graph['N'])
+    teleport[:50] = 1.0 / 50
+    with contextlib.redirect_stdout(io.StringIO()):
+        serial, _, _ = power_iteration(graph, 0.85, 100, 1e-10, teleport=teleport)
+        parallel, _, _ = parallel_power_iteration(graph, 0.85, 100, 1e-10, 2, teleport=teleport)
+    assert np.abs(parallel - serial).sum() < 1e-12
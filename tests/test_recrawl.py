@@ -0,0 +1,144 @@
+import contextlib
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'crawler')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+import simple_crawler
+from simple_crawler import (CORPUS_VERSION_STATE, document_response, fetch_validators, populate_database,
+                            write_crawl_delta)
+from memory_db import InMemoryDBManager
+
+BASE = 'https://contoh.ac.id'
+
+def page(path, status, content=None, links_to=(), etag=None, last_modified=None):
+    return {'url': BASE + path, 'title': None, 'content': content, 'links_to': [BASE + link for link in links_to],
+            'status': status, 'etag': etag, 'last_modified': last_modified}
+
+def populate(pages_data, db_manager):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return populate_database(pages_data, db_manager, db_manager.get_crawl_state())
+
+@pytest.fixture
+def db_manager():
+    InMemoryDBManager.reset()
+    db_manager = InMemoryDBManager()
+    db_manager.connect()
+    populate([
+        page('/', 'new', "Beranda\n\nSelamat datang", ['/profil', '/berita'], etag='"a1"'),
+        page('/profil', 'new', "Profil\n\nSejarah jurusan", ['/']),
+        page('/berita', 'new', "Berita\n\nKabar terbaru", ['/'], last_modified='Mon, 01 Jan 2024 00:00:00 GMT'),
+    ], db_manager)
+    db_manager.set_state(CORPUS_VERSION_STATE, 'awal')
+    return db_manager
+
+def ids(db_manager):
+    return {row['url']: row['id'] for row in db_manager.store['pages'].values()}
+
+def test_first_crawl_is_all_new():
+    InMemoryDBManager.reset()
+    db_manager = InMemoryDBManager()
+    delta = populate([page('/', 'new', "Beranda\n\nIsi", ['/profil']), page('/profil', 'new', "Profil\n\nIsi", ['/'])],
+                     db_manager)
+    assert [item['url'] for item in delta['new']] == [BASE + '/', BASE + '/profil']
+    assert delta['changed'] == [] and delta['removed'] == [] and delta['unchanged'] == 0
+    assert sorted(delta['links_changed']) == sorted(ids(db_manager).values())
+    assert sorted(db_manager.store['links']) == [(1, 2), (2, 1)]
+    assert delta['corpus_version'] is not None
+
+def test_unchanged_recrawl_writes_nothing(db_manager):
+    before = {page_id: dict(row) for page_id, row in db_manager.store['pages'].items()}
+    delta = populate([
+        page('/', 'unchanged', links_to=['/profil', '/berita'], etag='"a1"'),
+        page('/profil', 'unchanged', links_to=['/']),
+        page('/berita', 'unchanged', links_to=['/'], last_modified='Mon, 01 Jan 2024 00:00:00 GMT'),
+    ], db_manager)
+    assert delta['unchanged'] == 3
+    assert delta['new'] == delta['changed'] == delta['removed'] == delta['links_changed'] == []
+    assert db_manager.store['pages'] == before
+    # Tanpa perubahan, versi korpus (dan ETag aplikasi web) tetap
+    assert delta['corpus_version'] == 'awal'
+
+def test_unchanged_page_with_new_validator_only_updates_validator(db_manager):
+    delta = populate([page('/', 'unchanged', links_to=['/profil', '/berita'], etag='"a2"')], db_manager)
+    home = db_manager.store['pages'][ids(db_manager)[BASE + '/']]
+    assert home['http_etag'] == '"a2"'
+    assert delta['unchanged'] == 1 and delta['corpus_version'] == 'awal'
+
+def test_changed_new_and_removed_pages(db_manager):
+    old_ids = ids(db_manager)
+    delta = populate([
+        page('/', 'changed', "Beranda\n\nBeranda baru", ['/profil', '/kontak'], etag='"a2"'),
+        page('/profil', 'unchanged', links_to=['/']),
+        page('/berita', 'removed'),
+        page('/kontak', 'new', "Kontak\n\nAlamat", ['/']),
+    ], db_manager)
+    new_ids = ids(db_manager)
+    assert delta['changed'] == [{'id': old_ids[BASE + '/'], 'url': BASE + '/'}]
+    assert delta['new'] == [{'id': new_ids[BASE + '/kontak'], 'url': BASE + '/kontak'}]
+    assert delta['removed'] == [{'id': old_ids[BASE + '/berita'], 'url': BASE + '/berita'}]
+    assert delta['unchanged'] == 1
+    # ID halaman lama tetap; halaman yang dihapus hilang beserta link-nya
+    assert new_ids[BASE + '/'] == old_ids[BASE + '/'] and BASE + '/berita' not in new_ids
+    assert sorted(delta['links_changed']) == sorted([new_ids[BASE + '/'], new_ids[BASE + '/kontak']])
+    assert sorted(db_manager.store['links']) == sorted([
+        (new_ids[BASE + '/'], new_ids[BASE + '/profil']), (new_ids[BASE + '/'], new_ids[BASE + '/kontak']),
+        (new_ids[BASE + '/profil'], new_ids[BASE + '/']), (new_ids[BASE + '/kontak'], new_ids[BASE + '/']),
+    ])
+    assert delta['corpus_version'] != 'awal'
+
+def test_write_crawl_delta(tmp_path, db_manager):
+    delta = populate([page('/berita', 'removed')], db_manager)
+    path = str(tmp_path / 'data' / 'crawl_delta.json')
+    assert write_crawl_delta(path, delta) == path
+    with open(path, encoding='utf-8') as f:
+        assert json.load(f) == delta
+    # Ditulis ulang secara atomik, tanpa file sementara yang tertinggal
+    write_crawl_delta(path, {'new': [], 'changed': [], 'removed': [], 'links_changed': [], 'unchanged': 0,
+                             'corpus_version': 'awal'})
+    assert os.listdir(tmp_path / 'data') == ['crawl_delta.json']
+
+def test_fetch_validators_skips_request_without_stored_validators(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("request tidak boleh dikirim")
+    monkeypatch.setattr(simple_crawler.requests, 'get', fail)
+    monkeypatch.setattr(simple_crawler.requests, 'head', fail)
+    assert fetch_validators(BASE + '/') == (None, None, None)
+    assert fetch_validators(BASE + '/', {'http_etag': None, 'http_last_modified': None}) == (None, None, None)
+
+def test_fetch_validators_sends_conditional_get(monkeypatch):
+    sent = {}
+    class Response:
+        status_code = 304
+        headers = {'ETag': '"a1"'}
+        def __enter__(self):
+            return self
+        def __exit__(self, *exc):
+            return False
+    def get(url, headers, **kwargs):
+        sent.update(url=url, headers=headers)
+        return Response()
+    monkeypatch.setattr(simple_crawler.requests, 'get', get)
+    known_page = {'http_etag': '"a1"', 'http_last_modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}
+    assert fetch_validators(BASE + '/', known_page) == (304, '"a1"', None)
+    assert sent == {'url': BASE + '/', 'headers': {'If-None-Match': '"a1"',
+                                                   'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT'}}
+
+def test_document_response_reads_main_document_from_performance_log():
+    def event(method, **params):
+        return {'message': json.dumps({'message': {'method': method, 'params': params}})}
+    class Driver:
+        def get_log(self, log_type):
+            assert log_type == 'performance'
+            return [
+                event('Network.requestWillBeSent', type='Document'),
+                event('Network.responseReceived', type='Document',
+                      response={'status': 200, 'headers': {'etag': '"a1"', 'Last-Modified': 'kemarin'}}),
+                event('Network.responseReceived', type='Document', response={'status': 404, 'headers': {}}),
+            ]
+    assert document_response(Driver()) == (200, '"a1"', 'kemarin')
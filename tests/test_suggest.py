@@ -0,0 +1,87 @@
+import contextlib
+import io
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'utils')))
+
+from search_benchmark import seed_database, web_app
+from memory_db import InMemoryDBManager
+from config import SUGGEST_MAX_LIMIT
+
+def seed(monkeypatch, index_dir, num_shards=1):
+    monkeypatch.setattr(web_app, 'DBManager', InMemoryDBManager)
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database(200, seed=0, index_dir=index_dir, num_shards=num_shards)
+        return web_app.get_search_index()
+
+@pytest.fixture
+def search_index(monkeypatch, tmp_path):
+    return seed(monkeypatch, str(tmp_path))
+
+@pytest.fixture
+def client(search_index):
+    return web_app.app.test_client()
+
+def test_suggest_terms_ranked_by_df_and_pagerank(search_index):
+    suggestions = search_index.suggest_terms('pe', 10)
+    assert len(suggestions) == 10
+    assert all(term.startswith('pe') for _, term in suggestions)
+    weights = [weight for weight, _ in suggestions]
+    assert weights == sorted(weights, reverse=True)
+    # Bobot = df + N x jumlah PageRank dokumen yang mengandung term
+    for weight, term in suggestions:
+        documents = [metadata for metadata, _ in search_index.candidates([term])]
+        expected = len(documents) + search_index.num_documents * sum(doc['pagerank_score'] for doc in documents)
+        assert weight == pytest.approx(expected, rel=1e-4)
+    # Top-k adalah awalan dari peringkat semua term berawalan 'pe'
+    start, end = search_index.postings.prefix_range('pe')
+    everything = search_index.suggest_terms('pe', end - start)
+    assert len(everything) == end - start
+    assert [term for _, term in everything[:10]] == [term for _, term in suggestions]
+
+def test_suggest_terms_without_match(search_index):
+    assert search_index.suggest_terms('zzzq', 5) == []
+    assert search_index.suggest_terms('', 5) == []
+    assert search_index.suggest_terms('pe', 0) == []
+
+def test_sharded_suggestions_equal_single_index(monkeypatch, tmp_path):
+    single = seed(monkeypatch, str(tmp_path / 'single'))
+    expected = {prefix: single.suggest_terms(prefix, 8) for prefix in ('k', 'ma', 'pe', 's', 'in')}
+    sharded = seed(monkeypatch, str(tmp_path / 'sharded'), num_shards=3)
+    assert len(sharded.shards) == 3
+    for prefix, suggestions in expected.items():
+        merged = sharded.suggest_terms(prefix, 8)
+        assert [term for _, term in merged] == [term for _, term in suggestions]
+        assert [weight for weight, _ in merged] == pytest.approx([weight for weight, _ in suggestions])
+
+def test_api_suggest_completes_last_word(client, search_index):
+    response = client.get('/api/suggest?q=Kurikulum pe')
+    assert response.status_code == 200
+    data = response.get_json()
+    expected = [term for _, term in search_index.suggest_terms('pe', 8)]
+    assert data['suggestions'] == [f"kurikulum {term}" for term in expected]
+    assert response.headers['Cache-Control'].startswith('public')
+
+def test_api_suggest_without_current_word(client):
+    assert client.get('/api/suggest?q=').get_json()['suggestions'] == []
+    assert client.get('/api/suggest?q=kurikulum ').get_json()['suggestions'] == []
+
+def test_api_suggest_clamps_limit(client):
+    assert len(client.get('/api/suggest?q=s&limit=1000').get_json()['suggestions']) == SUGGEST_MAX_LIMIT
+    assert len(client.get('/api/suggest?q=s&limit=0').get_json()['suggestions']) == 1
+    assert len(client.get('/api/suggest?q=s&limit=-5').get_json()['suggestions']) == 1
+    assert len(client.get('/api/suggest?q=s&limit=3').get_json()['suggestions']) == 3
+
+def test_api_suggest_without_index_is_unavailable(monkeypatch):
+    monkeypatch.setattr(web_app, 'DBManager', InMemoryDBManager)
+    with contextlib.redirect_stdout(io.StringIO()):
+        seed_database(50, seed=0)
+        response = web_app.app.test_client().get('/api/suggest?q=kur')
+    assert response.status_code == 503
+    data = response.get_json()
+    assert data['suggestions'] == [] and data['error']
+    assert 'no-store' in response.headers['Cache-Control']
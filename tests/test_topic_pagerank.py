@@ -0,0 +1,59 @@
+import contextlib
+import io
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src', 'pagerank')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'benchmarks')))
+
+from link_graph import build_link_graph
+from pagerank_calculator import (power_iteration, batched_power_iteration, topic_teleport_vector,
+                                 calculate_topic_pagerank, load_link_graph)
+from pagerank_benchmark import dangling_heavy_graph
+from memory_db import InMemoryDBManager
+
+PAGES = [
+    {'id': 1, 'url': 'https://example.ac.id/'},
+    {'id': 2, 'url': 'https://example.ac.id/akademik/jadwal'},
+    {'id': 3, 'url': 'https://example.ac.id/akademik/kurikulum'},
+    {'id': 4, 'url': 'https://example.ac.id/profil'},
+]
+LINKS = [(1, 2), (1, 4), (2, 3), (3, 1), (4, 1)]
+
+def test_teleport_vector_is_normalised():
+    teleport = topic_teleport_vector(PAGES, ['/akademik/'])
+    assert teleport is not None
+    assert abs(teleport.sum() - 1.0) < 1e-12
+    assert np.count_nonzero(teleport) == 2
+
+def test_teleport_vector_without_match_is_none():
+    assert topic_teleport_vector(PAGES, ['/fakultas/']) is None
+
+def test_batched_matches_per_topic():
+    n = 2000
+    edges = dangling_heavy_graph(n, seed=3)
+    pages = [{'id': i, 'url': f'https://example.ac.id/{"a" if i % 3 else "b"}/{i}'} for i in range(n)]
+    graph = build_link_graph(pages, [(int(source), int(target)) for source, target in edges])
+    teleports = np.column_stack([topic_teleport_vector(pages, ['/a/']), topic_teleport_vector(pages, ['/b/'])])
+    with contextlib.redirect_stdout(io.StringIO()):
+        batched, _, _ = batched_power_iteration(graph, 0.85, 100, 1e-10, teleports)
+        for column in range(teleports.shape[1]):
+            single, _, _ = power_iteration(graph, 0.85, 100, 1e-10, teleport=teleports[:, column])
+            assert np.abs(batched[:, column] - single).sum() < 1e-9
+
+def test_topic_without_match_is_cleared():
+    InMemoryDBManager.load(PAGES, LINKS)
+    db_manager = InMemoryDBManager()
+    db_manager.connect()
+    db_manager.replace_topic_pagerank_scores('fakultas', {1: 1.0})
+    topics = {'akademik': {'url_patterns': ['/akademik/']}, 'fakultas': {'url_patterns': ['/fakultas/']}}
+    with contextlib.redirect_stdout(io.StringIO()):
+        results = calculate_topic_pagerank(db_manager, topics, num_workers=1, link_graph=load_link_graph(db_manager))
+    stored = db_manager.get_topic_pagerank_scores()
+    assert set(results) == {'akademik'}
+    assert stored['fakultas'] == {}
+    assert abs(sum(stored['akademik'].values()) - 1.0) < 1e-9
+    # Halaman dalam teleport set mendapat skor lebih tinggi daripada halaman profil
+    assert stored['akademik'][2] > stored['akademik'][4]
@@ -16,4 +16,75 @@ DB_CONFIG = {
 # Parameter PageRank (bisa diubah nanti jika diperlukan)
 PAGERANK_DAMPING_FACTOR = 0.85
 PAGERANK_MAX_ITERATIONS = 100
-PAGERANK_TOLERANCE = 1e-6
\ No newline at end of file
+PAGERANK_TOLERANCE = 1e-6
+# Jumlah proses untuk power iteration PageRank (1 = satu core, 0 = semua core)
+PAGERANK_NUM_WORKERS = 1
+# Mode paralel hanya dipakai jika jumlah halaman minimal sebesar ini. Diukur dengan
+# benchmarks/pagerank_benchmark.py --find-crossover: menyalakan worker memakan ~15-30 ms per solve dan
+# barrier ~0.1 ms per iterasi, sedangkan solve serial butuh ~30 ms baru pada ~35 ribu halaman, sehingga
+# 2 worker baru lebih cepat mulai sekitar 35-50 ribu halaman. Ukur ulang di mesin produksi.
+PAGERANK_PARALLEL_MIN_PAGES = 50000
+
+# Teleport set untuk PageRank per topik (topic-sensitive PageRank).
+# url_patterns menentukan halaman mana yang masuk teleport set topik tersebut,
+# keywords dipakai saat pencarian untuk menentukan bobot topik dari kata kunci query.
+PAGERANK_TOPICS = {
+    'akademik': {
+        'url_patterns': ['akademik', 'kurikulum', 'prodi', 'program-studi', 'perkuliahan'],
+        'keywords': ['akademik', 'kurikulum', 'prodi', 'program', 'studi', 'kuliah', 'perkuliahan',
+                     'mahasiswa', 'pendaftaran', 'skripsi', 'sarjana', 'magister', 'doktor'],
+    },
+    'profil': {
+        'url_patterns': ['profil', 'profile', 'sejarah', 'visi', 'struktur-organisasi'],
+        'keywords': ['profil', 'profile', 'sejarah', 'visi', 'misi', 'tujuan', 'struktur',
+                     'organisasi', 'pimpinan', 'dosen'],
+    },
+    'penelitian': {
+        'url_patterns': ['penelitian', 'pengabdian', 'riset', 'publikasi'],
+        'keywords': ['penelitian', 'pengabdian', 'riset', 'publikasi', 'jurnal', 'hibah'],
+    },
+}
+# Lama (detik) vektor PageRank per topik disimpan di memori aplikasi web sebelum dimuat ulang
+TOPIC_PAGERANK_CACHE_SECONDS = 300
+
+# Level log aplikasi (DEBUG menampilkan rincian skor setiap dokumen di /search)
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+# Folder snapshot metrik (*.prom) dari proses batch seperti crawler dan perhitungan PageRank
+METRICS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'metrics'))
+# Snapshot metrik setiap worker aplikasi web (digabung oleh endpoint /metrics) dan jeda
+# antar penulisan snapshot oleh thread latar setiap worker, dalam detik
+WEB_METRICS_DIR = os.path.join(METRICS_DIR, 'web')
+METRICS_FLUSH_SECONDS = 5
+
+# Folder artefak indeks pencarian (dibangun oleh src/index/indexer.py)
+INDEX_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'index'))
+# Jumlah generasi indeks terbaru yang disimpan setelah build baru (termasuk yang aktif); generasi
+# yang aktif sebelum build selalu disimpan sampai build berikutnya karena mungkin masih di-mmap
+INDEX_KEEP_GENERATIONS = 2
+# Jumlah shard indeks: dokumen dibagi berdasarkan hash URL. Hanya untuk kapasitas (file per shard lebih
+# kecil); query tidak menjadi lebih cepat, jadi biarkan 1 kecuali indeks satu bagian terlalu besar
+INDEX_SHARDS = int(os.getenv('INDEX_SHARDS', 1))
+# Jumlah postings yang ditampung di memori saat build indeks sebelum ditulis ke disk sebagai run terurut
+INDEX_RUN_POSTINGS = int(os.getenv('INDEX_RUN_POSTINGS', 2000000))
+# Jumlah dokumen per batch yang dibaca /search saat indeks belum dibangun (pemindaian database)
+SEARCH_SCAN_BATCH_SIZE = 500
+# Selang waktu (detik) aplikasi web memeriksa file CURRENT untuk memuat generasi indeks baru
+INDEX_RELOAD_CHECK_SECONDS = 2
+# Jumlah proses worker aplikasi web (lebih dari 1 = worker pre-fork gunicorn, tanpa debug reloader)
+WEB_PROCESSES = int(os.getenv('WEB_PROCESSES', 1))
+# Urutan frontier crawler: 'bfs', 'indegree', 'opic', atau 'pagerank' (lihat src/crawler/frontier.py)
+CRAWL_FRONTIER_STRATEGY = os.getenv('CRAWL_FRONTIER_STRATEGY', 'opic')
+
+# Cache HTTP: max-age (detik) untuk /search dan /view_page; setelahnya klien memvalidasi ulang dengan ETag
+HTTP_CACHE_MAX_AGE = 60
+# Jumlah halaman /view_page yang sudah dirender yang disimpan di memori setiap proses aplikasi web
+RENDERED_PAGE_CACHE_SIZE = 256
+# Selang waktu (detik) thread latar aplikasi web membaca ulang engine_state untuk versi korpus
+CORPUS_VERSION_CHECK_SECONDS = 5
+# Jumlah saran autocomplete /api/suggest (default dan batas maksimum parameter 'limit')
+SUGGEST_LIMIT = 8
+SUGGEST_MAX_LIMIT = 20
+# Batas waktu (detik) request bersyarat (If-None-Match / If-Modified-Since) crawler sebelum memuat halaman
+CRAWL_CONDITIONAL_TIMEOUT = 10
+# File delta hasil recrawl terakhir (halaman baru/berubah/dihapus dan link yang berubah)
+CRAWL_DELTA_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'data', 'crawl_delta.json'))
\ No newline at end of file
@@ -0,0 +1,36 @@
+# search_engine_project/utils/lru_cache.py
+"""
+Cache LRU sederhana yang aman dipakai beberapa thread sekaligus (satu cache per proses).
+"""
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """Menyimpan paling banyak max_entries item; item yang paling lama tidak dipakai dibuang lebih dulu."""
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,202 @@
+# search_engine_project/utils/metrics.py
+"""
+Pencatatan metrik sederhana (counter, gauge, histogram) dengan output format teks Prometheus.
+
+Metrik disimpan per proses. Aplikasi web menampilkannya di endpoint /metrics, sedangkan
+proses batch (crawler, perhitungan PageRank) menulis snapshot ke METRICS_DIR lewat
+write_textfile() agar ikut ditampilkan oleh endpoint tersebut. Worker aplikasi web yang berjalan
+sebagai beberapa proses (gunicorn) juga menulis snapshot masing-masing, lalu /metrics
+menjumlahkannya dengan merge_textfiles().
+"""
+import glob
+import os
+import threading
+
+_registry = {}
+_lock = threading.Lock()
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _label_key(labels):
+    return tuple(sorted(labels.items()))
+
+def _format_labels(label_key, extra=()):
+    pairs = list(label_key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = [(name, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+               for name, value in pairs]
+    return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+class _Metric:
+    metric_type = 'untyped'
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self.values = {}
+        with _lock:
+            _registry.setdefault(name, self)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        with _lock:
+            for label_key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(label_key)} {value}")
+        return lines
+
+class Counter(_Metric):
+    """Nilai yang hanya bertambah, misalnya jumlah request atau halaman yang diambil."""
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = _label_key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+class Gauge(_Metric):
+    """Nilai yang bisa naik turun, misalnya jumlah halaman atau kecepatan crawling terakhir."""
+    metric_type = 'gauge'
+
+    def set(self, value, **labels):
+        with _lock:
+            self.values[_label_key(labels)] = value
+
+class Histogram(_Metric):
+    """Distribusi durasi (dalam detik) dengan bucket kumulatif, beserta _sum dan _count."""
+    metric_type = 'histogram'
+
+    def __init__(self, name, help_text, buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = _label_key(labels)
+        with _lock:
+            state = self.values.setdefault(key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['buckets'][i] += 1
+            state['sum'] += value
+            state['count'] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        with _lock:
+            for label_key, state in sorted(self.values.items()):
+                for bound, count in zip(self.buckets, state['buckets']):
+                    lines.append(f"{self.name}_bucket{_format_labels(label_key, [('le', repr(float(bound)))])} {count}")
+                lines.append(f"{self.name}_bucket{_format_labels(label_key, [('le', '+Inf')])} {state['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(label_key)} {state['sum']}")
+                lines.append(f"{self.name}_count{_format_labels(label_key)} {state['count']}")
+        return lines
+
+def counter(name, help_text):
+    """Mengembalikan Counter dengan nama ini (dibuat jika belum ada)."""
+    return _registry.get(name) or Counter(name, help_text)
+
+def gauge(name, help_text):
+    """Mengembalikan Gauge dengan nama ini (dibuat jika belum ada)."""
+    return _registry.get(name) or Gauge(name, help_text)
+
+def histogram(name, help_text, buckets=DEFAULT_BUCKETS):
+    """Mengembalikan Histogram dengan nama ini (dibuat jika belum ada)."""
+    return _registry.get(name) or Histogram(name, help_text, buckets)
+
+def render_prometheus():
+    """Menghasilkan seluruh metrik proses ini dalam format teks Prometheus."""
+    with _lock:
+        metrics = list(_registry.values())
+    lines = []
+    for metric in metrics:
+        if metric.values:
+            lines.extend(metric.render())
+    return '\n'.join(lines) + '\n' if lines else ''
+
+def write_textfile(directory, job_name):
+    """
+    Menulis snapshot metrik proses ini ke <directory>/<job_name>.prom.
+    Ditulis ke file sementara lalu di-rename agar pembaca tidak melihat file setengah jadi.
+    """
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{job_name}.prom")
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(render_prometheus())
+    os.replace(temp_path, path)
+    return path
+
+def active_families():
+    """Nama metrik proses ini yang sudah punya nilai (yang ikut ditampilkan render_prometheus())."""
+    with _lock:
+        return {name for name, metric in _registry.items() if metric.values}
+
+def read_textfiles(directory, exclude=()):
+    """
+    Membaca semua file *.prom di directory (hasil write_textfile dari proses batch).
+    Setiap family metrik hanya diambil sekali (dari file pertama yang memuatnya), dan family
+    di 'exclude' dilewati, karena Prometheus menolak # HELP/# TYPE yang muncul dua kali.
+    """
+    seen = set(exclude)
+    lines = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.prom'))):
+        try:
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+        except OSError:
+            continue
+        # Di format write_textfile, baris nilai selalu berada setelah # HELP/# TYPE family-nya
+        keep = True
+        family = None
+        for line in content.splitlines():
+            if line.startswith(('# HELP ', '# TYPE ')):
+                name = line.split()[2]
+                if name != family:
+                    family = name
+                    keep = name not in seen
+                    seen.add(name)
+            if keep and line:
+                lines.append(line)
+    return '\n'.join(lines) + '\n' if lines else ''
+
+def _parse_number(text):
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def merge_textfiles(directory):
+    """
+    Menggabungkan semua file *.prom di directory yang berisi family metrik yang sama (snapshot
+    dari beberapa proses worker). Nilai seri yang sama dijumlahkan untuk counter dan histogram;
+    untuk gauge diambil nilai terbesar.
+    """
+    families = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.prom'))):
+        try:
+            with open(path, encoding='utf-8') as f:
+                content = f.read()
+        except OSError:
+            continue
+        family = None
+        for line in content.splitlines():
+            if line.startswith(('# HELP ', '# TYPE ')):
+                parts = line.split(' ', 3)
+                family = families.setdefault(parts[2], {'help': '', 'type': 'untyped', 'samples': {}})
+                family['help' if parts[1] == 'HELP' else 'type'] = parts[3] if len(parts) > 3 else ''
+            elif line and family is not None:
+                series, value = line.rsplit(' ', 1)
+                value = _parse_number(value)
+                samples = family['samples']
+                if series not in samples:
+                    samples[series] = value
+                elif family['type'] == 'gauge':
+                    samples[series] = max(samples[series], value)
+                else:
+                    samples[series] += value
+    lines = []
+    for name, family in families.items():
+        lines.append(f"# HELP {name} {family['help']}")
+        lines.append(f"# TYPE {name} {family['type']}")
+        lines.extend(f"{series} {value}" for series, value in family['samples'].items())
+    return '\n'.join(lines) + '\n' if lines else ''